@@ -0,0 +1,84 @@
+"""
+무거운 모듈 지연 로딩 (콜드 스타트 단축)
+
+pandas / numpy / xgboost / matplotlib / reportlab은 import에만 수 초가 걸리므로
+인증·거래 API만 처리하는 경우에도 시작 시간이 길어집니다.
+ML / 리포트 경로에서만 쓰는 모듈은 처음 사용할 때 import하고,
+필요하면 시작 직후 백그라운드 스레드에서 미리 로드(prewarm)합니다.
+
+- lazy_import("pandas"): 첫 속성 접근 시 import 되는 모듈 프록시
+- prewarm_modules(): PREWARM_MODULES를 순서대로 import (main.py 시작 이벤트에서 호출)
+
+측정: python scripts/bench_import_time.py
+"""
+
+import importlib
+import logging
+import time
+from typing import Any, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# 시작 직후 미리 로드할 모듈 (ML / 리포트 경로)
+PREWARM_MODULES = (
+    "numpy",
+    "pandas",
+    "xgboost",
+    "app.services.preprocessing",
+    "app.services.inference",
+    "app.services.anomaly_detection",
+    "app.services.report_service",
+    "matplotlib.pyplot",
+    "reportlab.platypus",
+)
+
+
+class LazyModule:
+    """
+    첫 속성 접근 시 실제 모듈을 import 하는 프록시
+
+    Example:
+        pd = lazy_import("pandas")   # 여기서는 import하지 않음
+        pd.DataFrame(...)            # 첫 사용 시 import
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            # import 락은 importlib이 처리하므로 여러 스레드에서 동시에 접근해도 한 번만 실행됨
+            module = self._module = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    """모듈 지연 import (반환값은 모듈처럼 사용)"""
+    return LazyModule(name)
+
+
+def prewarm_modules(modules: Iterable[str] = PREWARM_MODULES) -> Dict[str, float]:
+    """
+    모듈을 미리 import (블로킹 - 이벤트 루프에서는 asyncio.to_thread로 호출)
+
+    Returns: {모듈 이름: 소요 시간(초)} (실패한 모듈은 제외)
+    """
+    timings = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Prewarm import failed: {name} ({e})")
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
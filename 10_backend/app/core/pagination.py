@@ -0,0 +1,57 @@
+"""
+키셋(커서) 페이지네이션 / 건수 추정 유틸리티
+
+- encode_cursor / decode_cursor: (시각, id) 정렬 키를 URL-safe 커서 문자열로 변환
+  (GET /api/anomalies, GET /api/transactions)
+- estimate_row_count: 정확한 COUNT(*) 대신 PostgreSQL 플래너 예상 행 수 (EXPLAIN) 사용
+  조회 깊이·필터와 무관하게 일정한 비용으로 대략적인 전체 건수를 얻습니다.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+def encode_cursor(sort_time: datetime, row_id: int) -> str:
+    """(시각, id) 키셋 커서를 URL-safe 문자열로 인코딩"""
+    raw = f"{sort_time.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        sort_time, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(sort_time), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class _ExplainJson(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement> - 바인드 파라미터는 원래 쿼리 그대로 사용"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_row_count(db: AsyncSession, statement) -> int:
+    """
+    쿼리 결과 행 수의 플래너 추정값 (쿼리는 실행하지 않음)
+
+    통계(ANALYZE) 기준 근사값이므로 필터가 많을수록 오차가 커질 수 있습니다.
+    """
+    plan = (await db.execute(_ExplainJson(statement))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 import os
 
@@ -36,6 +37,9 @@ class Settings(BaseSettings):
     local_db_user: str = Field("postgres", alias="LOCAL_DB_USER")
     local_db_password: str = Field("caffeineapprds", alias="LOCAL_DB_PASSWORD")
 
+    # 커넥션 풀 사용 (SQLAlchemy 기본 풀 크기 5 + overflow 10)
+    db_fan_out_concurrency: int = Field(5, alias="DB_FAN_OUT_CONCURRENCY")  # fan_out() 동시 실행 세션 수 상한 (프로세스 전체, 나머지 연결은 요청 세션용)
+
     # App 설정
     app_port: int = Field(8001, alias="APP_PORT")
     app_host: str = Field("localhost", alias="APP_HOST")
@@ -46,9 +50,31 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(480, alias="ACCESS_TOKEN_EXPIRE_MINUTES")  # 8시간
     refresh_token_expire_days: int = Field(7, alias="REFRESH_TOKEN_EXPIRE_DAYS")
 
+    # ML 추론 설정 (카테고리 예측 모델)
+    ml_inference_workers: int = Field(2, alias="ML_INFERENCE_WORKERS")  # 추론 전용 스레드 수
+    ml_batch_max_size: int = Field(64, alias="ML_BATCH_MAX_SIZE")  # 마이크로 배치 최대 행 수
+    ml_batch_max_latency_ms: float = Field(5.0, alias="ML_BATCH_MAX_LATENCY_MS")  # 배치 대기 최대 시간
+
+    # 거래 일괄 등록 (POST /api/transactions/bulk)
+    transaction_bulk_batch_size: int = Field(1000, alias="TRANSACTION_BULK_BATCH_SIZE")  # multi-row INSERT 1회당 행 수
+    transaction_copy_min_rows: int = Field(5000, alias="TRANSACTION_COPY_MIN_ROWS")  # 이 행 수 이상이면 COPY FROM STDIN 사용
+    category_cache_ttl_seconds: int = Field(300, alias="CATEGORY_CACHE_TTL_SECONDS")  # 카테고리 레지스트리 재로드 간격
+
+    # 모델 레지스트리 (버전별 모델 디렉토리, 비우면 app/models/registry)
+    model_registry_dir: Optional[str] = Field(None, alias="MODEL_REGISTRY_DIR")
+    model_registry_refresh_seconds: int = Field(60, alias="MODEL_REGISTRY_REFRESH_SECONDS")  # 새 버전 확인 간격
+    # 시작 직후 백그라운드에서 ML/리포트 모듈 import + 모델 로드 (인증/거래 전용 서버는 false)
+    ml_prewarm: bool = Field(True, alias="ML_PREWARM")
+
+    # 이상거래 탐지 워커 설정
+    anomaly_detection_interval_seconds: int = Field(60, alias="ANOMALY_DETECTION_INTERVAL_SECONDS")  # 주기 실행 간격
+    anomaly_detection_batch_size: int = Field(2000, alias="ANOMALY_DETECTION_BATCH_SIZE")  # 한 번에 검사할 거래 수
+    anomaly_history_mode: str = Field("cached", alias="ANOMALY_HISTORY_MODE")  # 최근 거래 조회: cached(캐시 테이블) / window(매번 LATERAL 쿼리)
+
     class Config:
         env_file = (ENV_PATH, ROOT_ENV_PATH)
         extra = "allow"
+        protected_namespaces = ("settings_",)  # model_registry_* 필드 허용
         populate_by_name = True
         case_sensitive = True
 
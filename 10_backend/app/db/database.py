@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy import text
+from typing import Any, Awaitable, Callable, List, Optional
 import asyncio
 import logging
 
@@ -120,6 +121,45 @@ async def get_db():
             raise
 
 
+# fan_out() 동시 실행 세션 수 상한 (프로세스 전체 공유)
+_fan_out_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_fan_out_semaphore() -> asyncio.Semaphore:
+    global _fan_out_semaphore
+    if _fan_out_semaphore is None:
+        _fan_out_semaphore = asyncio.Semaphore(settings.db_fan_out_concurrency)
+    return _fan_out_semaphore
+
+
+async def fan_out(db: AsyncSession, *jobs: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+    """
+    서로 독립적인 조회 작업을 별도 세션(풀의 다른 커넥션)에서 동시에 실행
+
+    하나의 AsyncSession은 쿼리를 동시에 실행할 수 없으므로, 작업마다 db와 같은 엔진에
+    묶인 새 세션을 열어 asyncio.gather로 실행합니다. 응답 시간이 각 쿼리 합이 아니라
+    가장 느린 쿼리에 가까워집니다. 결과는 jobs 순서대로 반환합니다.
+    읽기 전용 조회에만 사용합니다 (각 세션은 커밋하지 않고 닫힘).
+    db가 엔진에 묶여 있지 않으면 db 하나로 순차 실행합니다.
+
+    동시에 열리는 세션 수는 프로세스 전체에서 DB_FAN_OUT_CONCURRENCY개로 제한되어
+    동시 요청이 몰려도 커넥션 풀을 다 쓰지 않습니다 (초과분은 대기).
+    작업 안에서 다시 fan_out()을 호출하지 마세요 (상한에 걸려 서로 기다릴 수 있음).
+    """
+    engine = db.bind
+    if engine is None or len(jobs) < 2:
+        return [await job(db) for job in jobs]
+
+    semaphore = get_fan_out_semaphore()
+
+    async def run(job):
+        async with semaphore:
+            async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+                return await job(session)
+
+    return list(await asyncio.gather(*(run(job) for job in jobs)))
+
+
 # DB 연결 정보 출력 (개발용)
 print(f"Primary DB (AWS RDS): {settings.db_host}")
 print(f"Fallback DB (Local): {settings.local_db_host}")
@@ -2,3 +2,5 @@ from .user import User, LoginHistory
 from .transaction import Category, Transaction, CouponTemplate, UserCoupon, Anomaly
 from .admin_settings import AdminSettings
 from .group import UserGroup
+from .user_feature_stats import UserFeatureStats, UserCategoryRecentAmounts
+from .spend_rollup import DailySpendRollup
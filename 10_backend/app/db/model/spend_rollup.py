@@ -0,0 +1,41 @@
+"""
+일별 소비 집계(rollup) 모델
+
+- DailySpendRollup: 사용자/일/카테고리별 합계·건수. 대시보드/리포트/챗봇 집계가
+  transactions 전체를 SUM/COUNT 하지 않고 기간 내 집계 행(일 x 카테고리)만 읽도록 합니다.
+"""
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Numeric
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class DailySpendRollup(Base):
+    """
+    일별 소비 집계 테이블
+
+    거래 등록/일괄 등록/이상거래 신고 시 증분 갱신되고, spend_rollup.rebuild_spend_rollup()으로
+    기간·사용자 단위 재계산(backfill)할 수 있습니다.
+    day는 transaction_time을 DB 세션 타임존 기준 날짜로 변환한 값이고,
+    category_key는 COALESCE(category_id, 0) 입니다 (카테고리 없는 거래 = 0).
+    total/count는 정상 거래, fraud_total/fraud_count는 이상거래(is_fraudulent = true)만 집계합니다.
+    """
+    __tablename__ = "daily_spend_rollup"
+    __table_args__ = (
+        # 관리자/리포트 기간 집계 (전체 사용자)
+        Index("idx_daily_spend_rollup_day", "day"),
+    )
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category_key = Column(BigInteger, primary_key=True)
+
+    total = Column(Numeric(14, 2), default=0, nullable=False)
+    count = Column(BigInteger, default=0, nullable=False)
+    fraud_total = Column(Numeric(14, 2), default=0, nullable=False)
+    fraud_count = Column(BigInteger, default=0, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DailySpendRollup(user_id={self.user_id}, day={self.day}, category_key={self.category_key})>"
@@ -8,10 +8,10 @@ RDS Transaction 모델 - AWS RDS PostgreSQL 스키마에 맞춤
 
 from sqlalchemy import (
     BigInteger, Boolean, Column, DateTime, ForeignKey, 
-    String, Text, Numeric, Integer
+    String, Text, Numeric, Integer, Index
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db.database import Base
 
 
@@ -38,9 +38,30 @@ class Transaction(Base):
     거래 내역 테이블 (RDS 스키마)
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        # 사용자/카테고리별 최근 N건 조회용 (이상거래 탐지 평균, LATERAL ... LIMIT)
+        # 카테고리 없는 거래도 같은 인덱스를 타도록 COALESCE(category_id, 0) 표현식 사용
+        Index(
+            "idx_transactions_user_category_time",
+            "user_id", func.coalesce(text("category_id"), 0), text("transaction_time DESC"), text("id DESC")
+        ),
+        # 사용자별 기간 조회 (버스트 판정, 최근 활동 EXISTS) + 거래 목록 키셋 페이지네이션 ((transaction_time, id) 내림차순)
+        # user_id 단독 조회/FK도 이 인덱스의 선두 컬럼으로 처리되므로 user_id 단일 인덱스는 두지 않음
+        # (기간 합계는 daily_spend_rollup에서 읽으므로 amount 등을 INCLUDE하지 않음)
+        Index("idx_transactions_user_time", "user_id", text("transaction_time DESC"), text("id DESC")),
+        # 가맹점/메모 부분 검색 (ILIKE '%...%') - pg_trgm 확장 필요 (db_init에서 생성)
+        Index(
+            "idx_transactions_merchant_trgm", "merchant_name",
+            postgresql_using="gin", postgresql_ops={"merchant_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_transactions_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     category_id = Column(BigInteger, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
     
     # 거래 정보
@@ -51,7 +72,7 @@ class Transaction(Base):
     status = Column(String(50), default="completed", nullable=False)
     
     # 시간
-    transaction_time = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    transaction_time = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)  # 전체 사용자 기간 조회 (리포트, 관리자 거래 목록)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # 이상 거래 플래그 (신고된 거래는 True)
@@ -134,6 +155,13 @@ class Anomaly(Base):
     이상 탐지 테이블 (RDS 스키마)
     """
     __tablename__ = "anomalies"
+    __table_args__ = (
+        # GET /api/anomalies 조회용 (미처리 목록 / 사용자별 목록, (created_at, id) 키셋 최신순)
+        Index("idx_anomalies_resolved_created", "is_resolved", text("created_at DESC"), text("id DESC")),
+        Index("idx_anomalies_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+        # 탐지 워커의 기존 등록 여부 확인용
+        Index("idx_anomalies_transaction_id", "transaction_id"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     transaction_id = Column(BigInteger, ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False)
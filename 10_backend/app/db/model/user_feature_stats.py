@@ -0,0 +1,76 @@
+"""
+사용자별 누적 피처 통계 모델
+
+- UserFeatureStats: 다음 소비 카테고리 예측용 누적 통계. 거래가 추가될 때마다 누적값을 갱신하여,
+  예측 시 전체 거래 이력을 다시 조회하지 않고 24개 피처를 바로 구성할 수 있게 합니다.
+- UserCategoryRecentAmounts: 이상거래 탐지용 사용자/카테고리별 최근 거래 금액 캐시
+"""
+
+from sqlalchemy import ARRAY, BigInteger, Column, DateTime, Float, ForeignKey, Numeric, String
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class UserFeatureStats(Base):
+    """
+    사용자 피처 스토어 테이블
+
+    금액 통계는 RunningStats 상태(개수/평균/편차제곱합/최소/최대)로 저장하고,
+    새 거래는 배치 통계를 Chan 병합으로 합쳐 갱신합니다 (합계/제곱합 방식의 상쇄 오차 없음).
+    카테고리 카운트 컬럼 번호는 DataPreprocessor.NEXT_CATEGORY_MAP 인코딩과 같습니다.
+    """
+    __tablename__ = "user_feature_stats"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # 금액 누적 통계 (RunningStats 상태)
+    tx_count = Column(BigInteger, default=0, nullable=False)
+    amount_mean = Column(Float, default=0, nullable=False)
+    amount_m2 = Column(Float, default=0, nullable=False)  # 평균 편차 제곱합
+    amount_min = Column(Float, nullable=True)
+    amount_max = Column(Float, nullable=True)
+
+    # 카테고리별 거래 수
+    category_0_count = Column(BigInteger, default=0, nullable=False)  # 교통
+    category_1_count = Column(BigInteger, default=0, nullable=False)  # 생활
+    category_2_count = Column(BigInteger, default=0, nullable=False)  # 쇼핑
+    category_3_count = Column(BigInteger, default=0, nullable=False)  # 식료품
+    category_4_count = Column(BigInteger, default=0, nullable=False)  # 외식
+    category_5_count = Column(BigInteger, default=0, nullable=False)  # 주유
+    category_6_count = Column(BigInteger, default=0, nullable=False)  # 기타
+
+    # 가장 최근 거래
+    last_transaction_time = Column(DateTime(timezone=True), nullable=True)
+    last_category_name = Column(String(100), nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<UserFeatureStats(user_id={self.user_id}, tx_count={self.tx_count})>"
+
+
+class UserCategoryRecentAmounts(Base):
+    """
+    사용자/카테고리별 최근 거래 캐시 (이상거래 탐지 "최근 30건 평균, Leave-One-Out"용)
+
+    최신순으로 최대 31건(자기 자신 제외 후 30건 확보)의 거래 ID/금액/시각을 배열로 저장합니다.
+    탐지 워커가 배치를 처리할 때마다 새 거래를 병합해 갱신하므로, 전체 이력을 다시 조회하지 않습니다.
+    category_key는 COALESCE(category_id, 0) 입니다 (카테고리 없는 거래 = 0).
+    """
+    __tablename__ = "user_category_recent_amounts"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category_key = Column(BigInteger, primary_key=True)
+
+    # 최신순 배열 (길이 동일)
+    recent_ids = Column(ARRAY(BigInteger), nullable=False)
+    recent_amounts = Column(ARRAY(Numeric), nullable=False)
+    recent_times = Column(ARRAY(DateTime(timezone=True)), nullable=False)
+
+    # 최근 30건 평균 (조회/대시보드용)
+    recent_avg = Column(Numeric, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<UserCategoryRecentAmounts(user_id={self.user_id}, category_key={self.category_key})>"
@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+import asyncio
 import logging
 from datetime import datetime
 import os
@@ -175,9 +176,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 키셋 페이지네이션 커서 (GET /api/anomalies)
 )
 
 
+def prewarm_ml():
+    """
+    무거운 모듈 import + 카테고리/사기 탐지 모델 로드 (블로킹, 스레드에서 실행)
+
+    요청 처리는 바로 시작되고, 프리웜이 끝나기 전에 들어온 ML 요청은 필요한 모듈만 직접 로드합니다.
+    """
+    from app.core.lazy_imports import prewarm_modules
+
+    timings = prewarm_modules()
+    ml.load_model()
+    from app.services.anomaly_detection import load_fraud_model
+    load_fraud_model()
+    logger.info(f"Prewarm finished: {sum(timings.values()):.2f}s ({len(timings)} modules)")
+
+
 # 시작 / 종료 이벤트
 @app.on_event("startup")
 async def startup_event():
@@ -190,8 +207,10 @@ async def startup_event():
     from app.services.db_init import ensure_database_and_tables
     await ensure_database_and_tables()
     
-    # ML 모델 로드
-    ml.load_model()
+    # ML/리포트 모듈과 모델은 첫 요청 시 로드 (ML_PREWARM=true면 백그라운드에서 미리 로드)
+    from app.core.settings import settings as app_settings
+    if app_settings.ml_prewarm:
+        app.state.prewarm_task = asyncio.create_task(asyncio.to_thread(prewarm_ml))
     
     # 스케줄러 시작 (reports용)
     from app.services.scheduler import start_scheduler
@@ -204,5 +223,9 @@ async def shutdown_event():
     from app.services.scheduler import shutdown_scheduler
     shutdown_scheduler()
     
+    # ML 추론 스레드 풀 종료
+    from app.services.inference import shutdown_inference_executor
+    shutdown_inference_executor()
+    
     logger.info("Caffeine API stopped")
     logger.info("=" * 60)
\ No newline at end of file
@@ -3,10 +3,9 @@ Demographics Analytics Router
 Provides age-based consumption analysis endpoints
 """
 
-from datetime import datetime, date, timedelta
 from typing import List, Dict
 from fastapi import APIRouter, Depends
-from sqlalchemy import select, func, and_
+from sqlalchemy import case, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from collections import defaultdict
 
@@ -14,6 +13,7 @@ from app.db.database import get_db
 from app.db.model.user import User
 from app.db.model.transaction import Transaction
 from app.routers.user import get_current_user
+from app.services.category_registry import get_categories, sum_by_category_name
 from pydantic import BaseModel
 from fastapi import HTTPException, status
 
@@ -58,39 +58,63 @@ async def verify_superuser(current_user: User) -> User:
     return current_user
 
 
+# Age buckets (upper bound exclusive), evaluated in SQL
+AGE_BUCKETS = [
+    (18, "18세 미만"),
+    (25, "18-24세"),
+    (35, "25-34세"),
+    (45, "35-44세"),
+    (55, "45-54세"),
+]
+OLDEST_AGE_GROUP = "55세 이상"
+UNKNOWN_AGE_GROUP = "알 수 없음"
+AGE_GROUP_ORDER = [label for _, label in AGE_BUCKETS] + [OLDEST_AGE_GROUP, UNKNOWN_AGE_GROUP]
+
+
 # Helper functions
-def calculate_age(birth_date: datetime) -> int:
-    """Calculate age from birth date"""
-    if not birth_date:
-        return None
-    
-    today = date.today()
-    b_date = birth_date.date() if isinstance(birth_date, datetime) else birth_date
-    
-    age = today.year - b_date.year
-    # Adjust if birthday hasn't occurred this year
-    if today.month < b_date.month or (today.month == b_date.month and today.day < b_date.day):
-        age -= 1
-    
-    return age
+def user_age_groups():
+    """
+    Subquery (user_id, age_group) with the age bucket computed in SQL
+
+    date_part('year', age(birth_date)) is the completed age as of today,
+    so the database buckets rows and only a few grouped rows come back.
+    Grouping by the subquery column keeps the bound CASE parameters out of GROUP BY.
+    """
+    age = func.date_part("year", func.age(User.birth_date))
+    age_group = case(
+        (User.birth_date.is_(None), UNKNOWN_AGE_GROUP),
+        *[(age < upper, label) for upper, label in AGE_BUCKETS],
+        else_=OLDEST_AGE_GROUP
+    )
+    return select(User.id.label("user_id"), age_group.label("age_group")).subquery("user_age")
+
 
+def age_group_sort_key(age_group: str) -> int:
+    return AGE_GROUP_ORDER.index(age_group) if age_group in AGE_GROUP_ORDER else 999
 
-def get_age_group(age: int) -> str:
-    """Map age to age group"""
-    if age is None:
-        return "알 수 없음"
-    elif age < 18:
-        return "18세 미만"
-    elif 18 <= age < 25:
-        return "18-24세"
-    elif 25 <= age < 35:
-        return "25-34세"
-    elif 35 <= age < 45:
-        return "35-44세"
-    elif 45 <= age < 55:
-        return "45-54세"
-    else:
-        return "55세 이상"
+
+async def get_category_totals_by_age(db: AsyncSession) -> Dict[str, list]:
+    """
+    Spending per (age group, category), grouped in SQL
+
+    Returns: {age_group: [(category_name, amount, count), ...]} sorted by amount desc
+    """
+    users = user_age_groups()
+    result = await db.execute(
+        select(users.c.age_group, Transaction.category_id, func.sum(Transaction.amount), func.count(Transaction.id))
+        .join(Transaction, users.c.user_id == Transaction.user_id)
+        .where(Transaction.category_id.isnot(None))
+        .group_by(users.c.age_group, Transaction.category_id)
+    )
+    grouped = defaultdict(list)
+    for group, category_id, amount, count in result.all():
+        grouped[group].append((category_id, amount, count))
+
+    categories = await get_categories(db)
+    return {
+        group: sum_by_category_name(rows, categories)
+        for group, rows in grouped.items()
+    }
 
 
 @router.get("/age-groups", response_model=List[AgeGroupData])
@@ -104,24 +128,16 @@ async def get_age_distribution(
     **Admin only endpoint**
     """
     # await verify_superuser(current_user)  # Disabled for development
-    result = await db.execute(select(User))
-    all_users = result.scalars().all()
-    
-    age_groups = defaultdict(int)
-    
-    for user in all_users:
-        age = calculate_age(user.birth_date) if user.birth_date else None
-        age_group = get_age_group(age)
-        age_groups[age_group] += 1
+    users = user_age_groups()
+    result = await db.execute(
+        select(users.c.age_group, func.count(users.c.user_id)).group_by(users.c.age_group)
+    )
     
     # Sort in logical age order
-    order = ["18세 미만", "18-24세", "25-34세", "35-44세", "45-54세", "55세 이상", "알 수 없음"]
-    sorted_groups = sorted(
-        [AgeGroupData(age_group=k, count=v) for k, v in age_groups.items()],
-        key=lambda x: order.index(x.age_group) if x.age_group in order else 999
+    return sorted(
+        [AgeGroupData(age_group=group, count=count) for group, count in result.all()],
+        key=lambda x: age_group_sort_key(x.age_group)
     )
-    
-    return sorted_groups
 
 
 @router.get("/consumption-by-age", response_model=List[ConsumptionByAge])
@@ -138,60 +154,36 @@ async def get_consumption_by_age(
     """
     # await verify_superuser(current_user)  # Disabled for development
     
-    # Import Category model
-    from app.db.model.transaction import Category
-    
-    # Get all transactions with user and category info (explicit joins)
+    # Per age group totals (categorized transactions only)
+    users = user_age_groups()
     result = await db.execute(
-        select(User.id, User.birth_date, Transaction.amount, Category.name.label('category_name'))
-        .join(Transaction, User.id == Transaction.user_id)
-        .join(Category, Transaction.category_id == Category.id)
+        select(
+            users.c.age_group,
+            func.count(func.distinct(users.c.user_id)),
+            func.count(Transaction.id),
+            func.sum(Transaction.amount)
+        )
+        .join(Transaction, users.c.user_id == Transaction.user_id)
+        .where(Transaction.category_id.isnot(None))
+        .group_by(users.c.age_group)
     )
-    rows = result.all()
-    
-    # Group by age group
-    age_data = defaultdict(lambda: {
-        'users': set(),
-        'transaction_count': 0,
-        'total_amount': 0.0,
-        'category_totals': defaultdict(float)
-    })
-    
-    for user_id, birth_date, amount, category_name in rows:
-        age = calculate_age(birth_date) if birth_date else None
-        age_group = get_age_group(age)
-        
-        age_data[age_group]['users'].add(user_id)
-        age_data[age_group]['transaction_count'] += 1
-        age_data[age_group]['total_amount'] += float(amount)
-        age_data[age_group]['category_totals'][category_name] += float(amount)
+    totals = {group: (user_count, tx_count, float(amount or 0)) for group, user_count, tx_count, amount in result.all()}
+    category_totals = await get_category_totals_by_age(db)
     
     # Calculate statistics
     consumption_data = []
-    order = ["18세 미만", "18-24세", "25-34세", "35-44세", "45-54세", "55세 이상", "알 수 없음"]
-    
-    for age_group in order:
-        data = age_data.get(age_group, {'users': set(), 'transaction_count': 0, 'total_amount': 0.0, 'category_totals': {}})
-        
-        user_count = len(data['users'])
-        transaction_count = data['transaction_count']
-        total_spending = data['total_amount']
+    for group in AGE_GROUP_ORDER:
+        user_count, transaction_count, total_spending = totals.get(group, (0, 0, 0.0))
         avg_amount = total_spending / transaction_count if transaction_count > 0 else 0.0
         
-        # Get top 3 categories
-        sorted_categories = sorted(
-            data['category_totals'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-        
+        # Get top 5 categories
         top_categories = [
             CategoryAmount(category=cat, amount=amt)
-            for cat, amt in sorted_categories
+            for cat, amt, _ in category_totals.get(group, [])[:5]
         ]
         
         consumption_data.append(ConsumptionByAge(
-            age_group=age_group,
+            age_group=group,
             user_count=user_count,
             total_spending=round(total_spending, 2),
             avg_transaction_amount=round(avg_amount, 2),
@@ -212,49 +204,20 @@ async def get_category_preferences_by_age(
     **Admin only endpoint**
     """
     # await verify_superuser(current_user)  # Disabled for development
-    
-    # Import Category model
-    from app.db.model.transaction import Category
-    
-    # Get all transactions with user and category info (explicit joins)
-    result = await db.execute(
-        select(User.birth_date, Transaction.amount, Category.name.label('category_name'))
-        .join(Transaction, User.id == Transaction.user_id)
-        .join(Category, Transaction.category_id == Category.id)
-    )
-    rows = result.all()
-    
-    # Group by age group
-    age_data = defaultdict(lambda: defaultdict(float))
-    
-    for birth_date, amount, category_name in rows:
-        age = calculate_age(birth_date) if birth_date else None
-        age_group = get_age_group(age)
-        age_data[age_group][category_name] += float(amount)
+    category_totals = await get_category_totals_by_age(db)
     
     # Get top 3 for each age group
     preferences = []
-    order = ["18세 미만", "18-24세", "25-34세", "35-44세", "45-54세", "55세 이상", "알 수 없음"]
-    
-    for age_group in order:
-        if age_group not in age_data:
+    for group in AGE_GROUP_ORDER:
+        if group not in category_totals:
             continue
-            
-        sorted_categories = sorted(
-            age_data[age_group].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        top_1 = sorted_categories[0][0] if len(sorted_categories) > 0 else "-"
-        top_2 = sorted_categories[1][0] if len(sorted_categories) > 1 else "-"
-        top_3 = sorted_categories[2][0] if len(sorted_categories) > 2 else "-"
         
+        names = [name for name, _, _ in category_totals[group][:3]] + ["-"] * 3
         preferences.append(CategoryPreferenceByAge(
-            age_group=age_group,
-            top_category=top_1,
-            second_category=top_2,
-            third_category=top_3
+            age_group=group,
+            top_category=names[0],
+            second_category=names[1],
+            third_category=names[2]
         ))
     
     return preferences
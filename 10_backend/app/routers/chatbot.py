@@ -6,12 +6,13 @@ import httpx
 from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
 from app.db.database import get_db
-from app.db.model.transaction import Transaction, Category
+from app.db.model.transaction import Transaction
 from app.db.model.user import User
+from app.services.category_registry import get_categories, sum_by_category_name
+from app.services.spend_rollup import get_spend_by_category, get_spend_totals
 
 router = APIRouter(
     prefix="/chat",
@@ -76,43 +77,25 @@ async def get_user_spending_context(db: AsyncSession, user_id: int) -> str:
         now = datetime.now()
         thirty_days_ago = now - timedelta(days=30)
         
-        # Stats query
-        stats_query = select(
-            func.count(Transaction.id).label("count"),
-            func.sum(Transaction.amount).label("total"),
-            func.avg(Transaction.amount).label("avg")
-        ).where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_time >= thirty_days_ago
+        # Stats / category totals from daily rollup (including reported transactions)
+        total_amount, total_count = await get_spend_totals(
+            db, start=thirty_days_ago, user_id=user_id, include_fraud=True
         )
-        stats_result = await db.execute(stats_query)
-        stats = stats_result.fetchone()
+        avg_amount = total_amount / total_count if total_count else 0
         
-        total_count = stats.count or 0
-        total_amount = float(stats.total) if stats.total else 0
-        avg_amount = float(stats.avg) if stats.avg else 0
-        
-        # Category query
-        category_query = select(
-            Category.name,
-            func.sum(Transaction.amount).label("total")
-        ).join(
-            Transaction, Transaction.category_id == Category.id
-        ).where(
-            Transaction.user_id == user_id,
-            Transaction.transaction_time >= thirty_days_ago
-        ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(5)
-        
-        cat_result = await db.execute(category_query)
-        categories = cat_result.fetchall()
+        categories_snapshot = await get_categories(db)
+        category_rows = await get_spend_by_category(
+            db, start=thirty_days_ago, user_id=user_id, include_fraud=True
+        )
+        categories = sum_by_category_name(
+            [row for row in category_rows if row[0] is not None], categories_snapshot
+        )[:5]
         
-        cat_lines = [f"  - {c.name}: {int(c.total):,}원" for c in categories]
+        cat_lines = [f"  - {name}: {int(total):,}원" for name, total, _ in categories]
         category_text = "\n".join(cat_lines) if categories else "  (데이터 없음)"
         
         # Recent transactions
-        recent_query = select(Transaction).options(
-            selectinload(Transaction.category)
-        ).where(
+        recent_query = select(Transaction).where(
             Transaction.user_id == user_id
         ).order_by(Transaction.transaction_time.desc()).limit(5)
         
@@ -120,13 +103,13 @@ async def get_user_spending_context(db: AsyncSession, user_id: int) -> str:
         recent_txs = recent_result.scalars().all()
         
         tx_lines = [
-            f"  - {tx.merchant_name or '알수없음'}: {int(tx.amount):,}원 ({tx.category.name if tx.category else '기타'})"
+            f"  - {tx.merchant_name or '알수없음'}: {int(tx.amount):,}원 ({categories_snapshot.name_of(tx.category_id)})"
             for tx in recent_txs
         ]
         recent_text = "\n".join(tx_lines) if recent_txs else "  (데이터 없음)"
 
         # 다음 예상 소비 카테고리 (ML 기반)
-        predicted_category = categories[0].name if categories else "기타"
+        predicted_category = categories[0][0] if categories else "기타"
 
         context = f"""
 [사용자 소비내역 - 최근 30일]
@@ -1,14 +1,26 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import joblib
-import pandas as pd
-import numpy as np
-import os
 import io
+import asyncio
+import json
+import codecs
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, BinaryIO, List, Optional
 from datetime import datetime
-from app.services.preprocessing import get_preprocessor
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db
+from app.services.model_registry import LoadedModel, get_model_registry
+from app.routers.user import get_current_user
+from app.db.model.user import User
+from app.services.feature_store import get_user_feature_stats, to_user_stats
+from app.core.lazy_imports import lazy_import
+
+# pandas / numpy / 전처리 / 추론 모듈은 ML 엔드포인트를 처음 호출할 때 로드 (콜드 스타트 단축)
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+preprocessing = lazy_import("app.services.preprocessing")
+inference = lazy_import("app.services.inference")
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -23,38 +35,43 @@ router = APIRouter(
 # 모델 전역 변수
 model = None
 
+def _on_model_swap(loaded: LoadedModel):
+    """레지스트리에서 새 버전이 로드되면 전역 모델과 추론 풀 모델을 함께 교체"""
+    global model
+    model = loaded.model
+    # 추론은 전용 스레드 풀(InferenceExecutor)에서 실행
+    inference.get_inference_executor().set_model(loaded.model)
+
+
 def load_model():
     """
-    XGBoost 모델 로드 (model_xgboost_acc_73.47.joblib)
+    XGBoost 카테고리 예측 모델 로드 (모델 레지스트리)
     
-    모델 위치: 10_backend/app/model_xgboost_acc_73.47.joblib
-    정확도: 73.47%
+    레지스트리에 등록된 현재 버전(app/models/registry/category/CURRENT)을 로드하고,
+    없으면 기존 파일(10_backend/app/model_xgboost_acc_73.47.joblib, 정확도 73.47%)을 로드합니다.
+    이후 새 버전은 레지스트리가 무중단으로 교체합니다.
     """
-    global model
-    try:
-        # 모델 파일 경로: /10_backend/app/model_xgboost_acc_73.47.joblib
-        # 현재 파일: /10_backend/app/routers/ml.py
-        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # /10_backend/app
-        model_path = os.path.join(app_dir, "model_xgboost_acc_73.47.joblib")
-        
-        if not os.path.exists(model_path):
-            logger.error(f"Model not found: {model_path}")
-            return
+    get_model_registry().load("category")
 
-        model = joblib.load(model_path)
-        logger.info(f"XGBoost model loaded: {os.path.basename(model_path)}")
-        
-    except Exception as e:
-        logger.error(f"Failed to load model: {e}")
+# 레지스트리 교체 시 전역 모델 동기화 (최초 로드는 main.py 시작 이벤트에서)
+get_model_registry().subscribe("category", _on_model_swap)
 
 # 앱 시작 시 모델 로드 (main.py에서 호출 예정)
 
+# 예측 결과 -> 카테고리명 (모델 메타데이터 기준)
+CATEGORY_MAP = {
+    0: '교통', 1: '생활', 2: '쇼핑',
+    3: '식료품', 4: '외식', 5: '주유'
+}
+
+# 스트리밍 업로드 기본 청크 크기 (행)
+UPLOAD_CHUNK_SIZE = 10000
+
 class PredictionRequest(BaseModel):
     features: Dict[str, Any]
 
 @router.post("/predict")
 async def predict(request: PredictionRequest):
-    global model
     if model is None:
         load_model()
         if model is None:
@@ -66,7 +83,7 @@ async def predict(request: PredictionRequest):
         input_data = pd.DataFrame([request.features])
         
         # 전처리 수행
-        preprocessor = get_preprocessor()
+        preprocessor = preprocessing.get_preprocessor()
         
         # 날짜/시간 필수 컬럼 확인 및 임시 생성 (단일 예측 시)
         if '날짜' not in input_data.columns:
@@ -76,8 +93,8 @@ async def predict(request: PredictionRequest):
             
         df_processed = preprocessor.preprocess(input_data)
         
-        # 예측 수행
-        prediction = model.predict(df_processed)
+        # 예측 수행 (동시 단건 요청은 마이크로 배치로 합쳐서 추론)
+        prediction = await inference.get_inference_executor().predict_batched(df_processed)
         
         # 결과 반환
         result = prediction[0].item() if hasattr(prediction[0], 'item') else prediction[0]
@@ -122,8 +139,6 @@ async def upload_file(file: UploadFile = File(...)):
             "predictions": 전체 예측 결과 (카테고리별 개수)
         }
     """
-    global model
-    
     try:
         # 1. CSV 파일 읽기
         content = await file.read()
@@ -135,7 +150,7 @@ async def upload_file(file: UploadFile = File(...)):
             df_original = pd.read_csv(io.BytesIO(content), encoding='cp949')
         
         # 2. 데이터 전처리
-        preprocessor = get_preprocessor()
+        preprocessor = preprocessing.get_preprocessor()
         
         try:
             # 전처리 수행
@@ -149,8 +164,8 @@ async def upload_file(file: UploadFile = File(...)):
             if model is None:
                 raise HTTPException(status_code=500, detail="모델이 로드되지 않았습니다.")
         
-        # 예측 실행
-        predictions = model.predict(df_processed)
+        # 예측 실행 (이벤트 루프 차단 방지: 추론 스레드 풀에서 실행)
+        predictions = await inference.get_inference_executor().predict(df_processed)
         
         # 4. 카테고리 매핑 (모델 메타데이터 기준)
         category_map = {
@@ -170,34 +185,7 @@ async def upload_file(file: UploadFile = File(...)):
         df_result['AI예측카테고리'] = predicted_categories
         
         # 5. 프론트엔드 형식으로 변환
-        transactions_formatted = []
-        for idx, row in df_result.iterrows():
-            # 금액을 절댓값으로 변환 (양수)
-            amount = abs(int(row.get('금액', 0))) if pd.notna(row.get('금액')) else 0
-
-            # 날짜 + 시간 조합
-            date_str = str(row.get('날짜', '')).strip()
-            time_str = str(row.get('시간', '')).strip()
-            datetime_str = f"{date_str} {time_str}".strip()
-
-            # 카드 타입 결정
-            payment_method = str(row.get('결제수단', ''))
-            card_type = '체크' if '체크' in payment_method else '신용'
-
-            # 거래 객체 생성
-            transaction = {
-                "id": str(idx + 1),
-                "merchant": str(row.get('내용', '알 수 없음')),
-                "businessName": str(row.get('내용', '알 수 없음')),
-                "amount": amount,
-                "category": row.get('AI예측카테고리', '기타'),
-                "date": datetime_str,
-                "notes": str(row.get('메모', '')) if pd.notna(row.get('메모')) else '',
-                "cardType": card_type,
-                "originalCategory": str(row.get('대분류', '')) if pd.notna(row.get('대분류')) else '',
-                "aiPredicted": True
-            }
-            transactions_formatted.append(transaction)
+        transactions_formatted = _format_transactions(df_result)
 
         # 카테고리별 예측 개수 집계
         prediction_summary = df_result['AI예측카테고리'].value_counts().to_dict()
@@ -220,7 +208,172 @@ async def upload_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=f"파일 처리 실패: {str(e)}")
 
 
-def calculate_confidence_metrics(probabilities: np.ndarray) -> dict:
+def _text_column(df: "pd.DataFrame", col: str, default: str, na_as_empty: bool = False) -> "pd.Series":
+    """CSV 컬럼을 문자열 Series로 변환 (컬럼이 없으면 default, NaN은 'nan' 또는 '')"""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    values = df[col]
+    # str(NaN) == 'nan' 과 동일하게 맞춤 (pandas 버전에 따라 astype(str)이 NaN을 유지하는 경우 대비)
+    return values.astype(str).where(values.notna(), '' if na_as_empty else 'nan')
+
+
+def _format_transactions(df: "pd.DataFrame") -> List[Dict[str, Any]]:
+    """
+    업로드 CSV(+ AI 예측 결과)를 프론트엔드 거래 형식 리스트로 변환
+
+    행 단위 iterrows() 대신 컬럼 단위 벡터 연산으로 각 필드를 만든 뒤 한 번에 묶습니다.
+    """
+    # 금액을 절댓값으로 변환 (양수, 소수점 이하 버림)
+    if '금액' in df.columns:
+        raw_amount = df['금액']
+        if not pd.api.types.is_numeric_dtype(raw_amount):
+            raw_amount = raw_amount.astype(str).str.replace(',', '')
+        amount = np.trunc(pd.to_numeric(raw_amount, errors='coerce')).abs().fillna(0).astype(np.int64)
+    else:
+        amount = pd.Series(0, index=df.index, dtype=np.int64)
+
+    # 날짜 + 시간 조합
+    date_str = _text_column(df, '날짜', '').str.strip()
+    time_str = _text_column(df, '시간', '').str.strip()
+    datetime_str = (date_str + ' ' + time_str).str.strip()
+
+    # 카드 타입 결정
+    is_check_card = _text_column(df, '결제수단', '').str.contains('체크', regex=False)
+    card_type = np.where(is_check_card, '체크', '신용')
+
+    merchant = _text_column(df, '내용', '알 수 없음').tolist()
+    category = (df['AI예측카테고리'] if 'AI예측카테고리' in df.columns
+                else pd.Series('기타', index=df.index)).tolist()
+
+    columns = {
+        "id": (np.asarray(df.index) + 1).astype(str).tolist(),
+        "merchant": merchant,
+        "businessName": merchant,
+        "amount": amount.tolist(),
+        "category": category,
+        "date": datetime_str.tolist(),
+        "notes": _text_column(df, '메모', '', na_as_empty=True).tolist(),
+        "cardType": card_type.tolist(),
+        "originalCategory": _text_column(df, '대분류', '', na_as_empty=True).tolist(),
+        "aiPredicted": [True] * len(df),
+    }
+    keys = list(columns.keys())
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def _detect_csv_encoding(fileobj: BinaryIO, sample_size: int = 64 * 1024) -> str:
+    """파일 앞부분만 읽어 utf-8 / cp949 판별 (전체 파일을 메모리에 올리지 않음)"""
+    head = fileobj.read(sample_size)
+    fileobj.seek(0)
+    try:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 허용 (final=False)
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _iter_csv_chunks(fileobj: BinaryIO, encoding: str, chunk_size: int, **kwargs) -> Iterator["pd.DataFrame"]:
+    """업로드 파일을 처음부터 chunk_size 행씩 읽기"""
+    fileobj.seek(0)
+    yield from pd.read_csv(fileobj, encoding=encoding, chunksize=chunk_size, **kwargs)
+
+
+def _stream_upload_predictions(fileobj: BinaryIO, filename: str, encoding: str, chunk_size: int) -> Iterator[str]:
+    """
+    청크 단위 전처리/예측 결과를 NDJSON 라인으로 생성
+
+    - 1차 패스: 통계 컬럼만 읽어 파일 전체 사용자 통계 계산
+    - 2차 패스: 청크마다 전처리 → 예측 → {"type": "transactions"} 라인 출력
+    - 마지막: {"type": "summary"} 라인 (카테고리별 예측 개수)
+
+    동기 제너레이터이므로 StreamingResponse가 스레드풀에서 순회합니다 (이벤트 루프 비차단).
+    """
+    preprocessor = preprocessing.get_preprocessor()
+    executor = inference.get_inference_executor()
+    try:
+        upload_stats = preprocessor.collect_upload_stats(
+            _iter_csv_chunks(fileobj, encoding, chunk_size, usecols=['날짜', '시간', '금액', '대분류'])
+        )
+
+        summary: Dict[str, int] = {}
+        total_rows = 0
+        carry = None
+        for df_chunk in _iter_csv_chunks(fileobj, encoding, chunk_size):
+            if len(df_chunk) == 0:
+                continue
+            df_processed, carry = preprocessor.preprocess_chunk(df_chunk, upload_stats, carry)
+            predictions = executor.predict_blocking(df_processed)
+
+            # 전처리 결과는 시간순 정렬되어 있으므로 인덱스 기준으로 원본 행에 맞춤
+            df_chunk['AI예측카테고리'] = pd.Series(
+                [CATEGORY_MAP.get(int(pred), '기타') for pred in predictions],
+                index=df_processed.index
+            )
+            for category, cnt in df_chunk['AI예측카테고리'].value_counts().items():
+                summary[category] = summary.get(category, 0) + int(cnt)
+            total_rows += len(df_chunk)
+
+            transactions = _format_transactions(df_chunk)
+            yield json.dumps({"type": "transactions", "transactions": transactions}, ensure_ascii=False) + "\n"
+
+        yield json.dumps({
+            "type": "summary",
+            "filename": filename,
+            "total_rows": total_rows,
+            "summary": {
+                "by_category": summary,
+                "total": total_rows
+            }
+        }, ensure_ascii=False) + "\n"
+
+    except Exception as e:
+        # 이미 200 응답이 시작되었으므로 에러도 NDJSON 라인으로 전달
+        logger.error(f"Streaming upload failed: {e}")
+        yield json.dumps({"type": "error", "detail": f"파일 처리 실패: {str(e)}"}, ensure_ascii=False) + "\n"
+
+
+@router.post("/upload/stream")
+async def upload_file_stream(
+    file: UploadFile = File(...),
+    chunk_size: int = Query(UPLOAD_CHUNK_SIZE, ge=100, le=100000, description="청크 크기 (행)")
+):
+    """
+    대용량 CSV 업로드용 스트리밍 예측 (NDJSON)
+
+    /ml/upload와 같은 전처리/예측을 chunk_size 행 단위로 수행하여, 파일 크기와 관계없이
+    메모리 사용량을 청크 크기 수준으로 유지합니다.
+
+    응답 (application/x-ndjson, 한 줄에 하나의 JSON):
+        {"type": "transactions", "transactions": [...]}   # 청크마다 반복
+        {"type": "summary", "filename": ..., "total_rows": ..., "summary": {"by_category": {...}, "total": ...}}
+        {"type": "error", "detail": ...}                   # 처리 도중 실패 시
+    """
+    if model is None:
+        load_model()
+        if model is None:
+            raise HTTPException(status_code=500, detail="모델이 로드되지 않았습니다.")
+
+    # 업로드 파일은 SpooledTemporaryFile(디스크)로 보관되어 있으므로 file.file에서 직접 읽음
+    fileobj = file.file
+    encoding = _detect_csv_encoding(fileobj)
+
+    # 스트리밍 시작 전에 헤더만 읽어 필수 컬럼 확인 (400 응답 가능한 시점)
+    try:
+        header = pd.read_csv(fileobj, encoding=encoding, nrows=0).columns
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"파일 처리 실패: {str(e)}")
+    missing_cols = [col for col in ['날짜', '시간', '금액', '대분류'] if col not in header]
+    if missing_cols:
+        raise HTTPException(status_code=400, detail=f"필수 컬럼이 없습니다: {', '.join(missing_cols)}")
+
+    return StreamingResponse(
+        _stream_upload_predictions(fileobj, file.filename, encoding, chunk_size),
+        media_type="application/x-ndjson"
+    )
+
+
+def calculate_confidence_metrics(probabilities: "np.ndarray") -> dict:
     """
     예측 신뢰도 계산
 
@@ -244,6 +397,69 @@ def calculate_confidence_metrics(probabilities: np.ndarray) -> dict:
         "confidence_level": "high" if top1_prob > 0.7 else "medium" if top1_prob > 0.4 else "low"
     }
 
+def _single_transaction_response() -> Dict[str, Any]:
+    """거래가 1건뿐일 때의 기본 응답 (예측 정확도가 낮으므로 균등 확률)"""
+    return {
+        "predicted_category": "외식",
+        "predicted_category_code": 4,
+        "confidence": 0.17,
+        "probabilities": {cat: 1/6 for cat in CATEGORY_MAP.values()},
+        "context": {
+            "total_transactions": 1,
+            "note": "단일 거래로 예측 정확도가 낮습니다."
+        }
+    }
+
+
+async def _predict_next_response(
+    df_next_features: "pd.DataFrame",
+    user_stats: dict,
+    last_transaction_time: datetime,
+    last_category_name: str
+) -> Dict[str, Any]:
+    """
+    다음 거래 피처로 예측하고 응답 구성 (CSV 업로드 / 피처 스토어 공통)
+
+    predict_proba 한 번으로 라벨까지 결정하고, 컨텍스트는 이미 계산된 사용자 통계를 재사용합니다.
+    """
+    if model is None:
+        load_model()
+        if model is None:
+            raise HTTPException(status_code=500, detail="모델이 로드되지 않았습니다.")
+
+    # 확률 예측 한 번으로 라벨까지 결정 (predict = argmax(predict_proba))
+    prediction_proba = (await inference.get_inference_executor().predict_proba(df_next_features))[0]
+    best_idx = int(np.argmax(prediction_proba))
+    classes = getattr(model, 'classes_', None)
+    predicted_category_code = int(classes[best_idx]) if classes is not None else best_idx
+
+    # 확률 딕셔너리 / 신뢰도 메트릭
+    probabilities_dict = {
+        CATEGORY_MAP[i]: float(prediction_proba[i])
+        for i in range(len(prediction_proba))
+    }
+    confidence_metrics = calculate_confidence_metrics(prediction_proba)
+
+    # 컨텍스트 정보 (전처리/피처 스토어에서 계산한 통계 재사용)
+    last_category_code = preprocessing.get_preprocessor().NEXT_CATEGORY_MAP.get(last_category_name, 4)
+    context = {
+        "total_transactions": int(user_stats['tx_count']),
+        "last_transaction_date": last_transaction_time.strftime('%Y-%m-%d %H:%M'),
+        "last_category": CATEGORY_MAP.get(int(last_category_code), '외식'),
+        "user_avg_amount": float(user_stats['avg_amount']),
+        "most_frequent_category": CATEGORY_MAP.get(int(user_stats['fav_category']), '외식')
+    }
+
+    return {
+        "predicted_category": CATEGORY_MAP.get(predicted_category_code, '기타'),
+        "predicted_category_code": predicted_category_code,
+        "confidence": confidence_metrics["top1_confidence"],
+        "probabilities": probabilities_dict,
+        "context": context,
+        "confidence_metrics": confidence_metrics
+    }
+
+
 @router.post("/predict-next")
 async def predict_next_category(file: UploadFile = File(...)):
     """
@@ -272,8 +488,6 @@ async def predict_next_category(file: UploadFile = File(...)):
             }
         }
     """
-    global model
-
     try:
         # 1. CSV 파일 읽기
         content = await file.read()
@@ -301,99 +515,149 @@ async def predict_next_category(file: UploadFile = File(...)):
 
         # 4. 예외 처리: 단일 거래
         if len(df_original) == 1:
-            category_map = {
-                0: '교통', 1: '생활', 2: '쇼핑',
-                3: '식료품', 4: '외식', 5: '주유'
-            }
-            return {
-                "predicted_category": "외식",
-                "predicted_category_code": 4,
-                "confidence": 0.17,
-                "probabilities": {cat: 1/6 for cat in category_map.values()},
-                "context": {
-                    "total_transactions": 1,
-                    "note": "단일 거래로 예측 정확도가 낮습니다."
-                }
-            }
+            return _single_transaction_response()
 
-        # 5. 데이터 전처리
-        preprocessor = get_preprocessor()
+        # 5. 데이터 전처리: 정제/사용자 통계를 한 번만 계산하고 피처 생성
+        preprocessor = preprocessing.get_preprocessor()
+        df_next_features, last_transaction, user_stats = preprocessor.prepare_next_prediction(df_original)
 
-        # 6. 다음 거래 예측을 위한 피처 생성
-        df_next_features = preprocessor.preprocess_for_next_prediction(df_original)
-        # 피처 생성 완료
+        # 6. 예측 + 응답 구성
+        return await _predict_next_response(
+            df_next_features,
+            user_stats=user_stats,
+            last_transaction_time=last_transaction['CreateDate'],
+            last_category_name=last_transaction.get('대분류', '외식')
+        )
 
-        # 7. ML 예측 수행
-        if model is None:
-            load_model()
-            if model is None:
-                raise HTTPException(status_code=500, detail="모델이 로드되지 않았습니다.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Next prediction failed: {e}")
+        raise HTTPException(status_code=400, detail=f"다음 소비 예측 실패: {str(e)}")
 
-        # 예측 실행 (확률 포함)
-        prediction_proba = model.predict_proba(df_next_features)
-        prediction = model.predict(df_next_features)
 
-        # 예측 완료
+@router.get("/predict-next")
+async def predict_next_category_for_user(
+    user_id: int = Query(..., description="사용자 ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    DB에 저장된 거래 내역 기반 다음 소비 카테고리 예측
 
-        # 8. 카테고리 매핑
-        category_map = {
-            0: '교통', 1: '생활', 2: '쇼핑',
-            3: '식료품', 4: '외식', 5: '주유'
-        }
+    사용자 피처 스토어(user_feature_stats)의 누적 통계로 24개 피처를 구성하므로
+    거래 이력 전체를 다시 조회하지 않습니다. 응답 형식은 POST /ml/predict-next와 같습니다.
 
-        predicted_category_code = int(prediction[0])
-        predicted_category = category_map.get(predicted_category_code, '기타')
+    **권한 필요**: 본인 또는 관리자 (슈퍼유저)
+    """
+    if user_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="다른 사용자의 예측은 조회할 수 없습니다."
+        )
 
-        # 9. 확률 딕셔너리 생성
-        probabilities_dict = {
-            category_map[i]: float(prediction_proba[0][i])
-            for i in range(len(prediction_proba[0]))
-        }
+    try:
+        stats_row = await get_user_feature_stats(db, user_id)
+        if stats_row is None or stats_row.tx_count == 0:
+            raise HTTPException(status_code=404, detail="거래 내역이 없습니다.")
+        if stats_row.tx_count == 1:
+            return _single_transaction_response()
+
+        user_stats = to_user_stats(stats_row)
+        last_time = stats_row.last_transaction_time
+        last_category_name = stats_row.last_category_name or '기타'
+
+        # DB 시각은 timezone-aware이므로 같은 기준의 현재 시각 사용
+        prediction_time = datetime.now(last_time.tzinfo) if last_time.tzinfo else datetime.now()
+        df_next_features = preprocessing.get_preprocessor().preprocess_next_from_stats(
+            user_stats,
+            {'CreateDate': last_time, '대분류': last_category_name},
+            prediction_time
+        )
+
+        return await _predict_next_response(
+            df_next_features,
+            user_stats=user_stats,
+            last_transaction_time=last_time,
+            last_category_name=last_category_name
+        )
 
-        # 10. 신뢰도 메트릭 계산
-        confidence_metrics = calculate_confidence_metrics(prediction_proba[0])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Next prediction (feature store) failed: {e}")
+        raise HTTPException(status_code=400, detail=f"다음 소비 예측 실패: {str(e)}")
 
-        # 11. 컨텍스트 정보 생성
-        # df_original에서 통계 추출
-        preprocessor_temp = get_preprocessor()
-        df_clean = preprocessor_temp._clean_data(df_original.copy())
 
-        last_transaction = df_clean.iloc[-1]
-        user_avg_amount = df_clean['Amount'].mean()
+# ============================================================
+# 모델 레지스트리 관리 (관리자)
+# ============================================================
 
-        # 가장 빈번한 카테고리 찾기
-        category_map_reverse = {
-            '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
-            '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3,
-            '카페/간식': 4  # 추가
-        }
-        df_clean['category_encoded'] = df_clean['대분류'].map(category_map_reverse).fillna(6)
-        most_frequent_category_code = df_clean['category_encoded'].mode()[0] if len(df_clean) > 0 else 4
-        most_frequent_category = category_map.get(int(most_frequent_category_code), '외식')
-
-        last_category_code = category_map_reverse.get(last_transaction.get('대분류', '외식'), 4)
-        last_category = category_map.get(int(last_category_code), '외식')
-
-        context = {
-            "total_transactions": len(df_original),
-            "last_transaction_date": last_transaction['CreateDate'].strftime('%Y-%m-%d %H:%M'),
-            "last_category": last_category,
-            "user_avg_amount": float(user_avg_amount),
-            "most_frequent_category": most_frequent_category
-        }
+class ModelReloadRequest(BaseModel):
+    name: str
+    version: Optional[str] = None  # 지정하면 CURRENT를 이 버전으로 바꾼 뒤 로드 (롤백 포함)
 
-        # 12. 최종 결과 반환
-        return {
-            "predicted_category": predicted_category,
-            "predicted_category_code": predicted_category_code,
-            "confidence": confidence_metrics["top1_confidence"],
-            "probabilities": probabilities_dict,
-            "context": context,
-            "confidence_metrics": confidence_metrics
-        }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Next prediction failed: {e}")
-        raise HTTPException(status_code=400, detail=f"다음 소비 예측 실패: {str(e)}")
+def _require_superuser(current_user: User):
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 권한이 필요합니다."
+        )
+
+
+def _model_status(name: str) -> Dict[str, Any]:
+    registry = get_model_registry()
+    loaded = registry.get(name)
+    return {
+        "name": name,
+        "current_version": registry.current_version(name),
+        "loaded_version": loaded.version if loaded else None,
+        "loaded_at": loaded.loaded_at.isoformat() if loaded else None,
+        "versions": registry.list_versions(name),
+    }
+
+
+@router.get("/models")
+async def list_models(current_user: User = Depends(get_current_user)):
+    """
+    모델 레지스트리 상태 조회 (이 워커 프로세스 기준 로드된 버전 포함)
+
+    **권한 필요**: 관리자 (슈퍼유저)
+    """
+    _require_superuser(current_user)
+    return {"models": [_model_status(name) for name in get_model_registry().specs]}
+
+
+@router.post("/models/reload")
+async def reload_model(
+    request: ModelReloadRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    모델 즉시 교체 (재시작 없음)
+
+    version을 지정하면 CURRENT를 바꾸므로 다른 워커도 다음 refresh 주기에 같은 버전으로 교체됩니다.
+
+    **권한 필요**: 관리자 (슈퍼유저)
+    """
+    _require_superuser(current_user)
+    registry = get_model_registry()
+    if request.name not in registry.specs:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 모델입니다: {request.name}")
+
+    if request.version:
+        # 버전은 CURRENT에 그대로 기록되고 경로로 조합되므로 등록된 디렉토리 이름만 허용
+        if not registry.is_valid_version_name(request.version):
+            raise HTTPException(status_code=400, detail=f"잘못된 버전 이름입니다: {request.version}")
+        if request.version not in registry.list_versions(request.name):
+            raise HTTPException(status_code=404, detail=f"등록되지 않은 버전입니다: {request.name}/{request.version}")
+        try:
+            registry.activate(request.name, request.version)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    loaded = await asyncio.to_thread(registry.load, request.name)
+    if loaded is None or (request.version and loaded.version != request.version):
+        raise HTTPException(status_code=500, detail="모델 로드 실패 (기존 모델 유지)")
+    return _model_status(request.name)
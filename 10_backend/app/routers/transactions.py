@@ -1,14 +1,23 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import and_, func, or_, select, update, delete
+from sqlalchemy import and_, func, or_, select, tuple_, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from app.db.database import get_db
-from app.db.model.transaction import Anomaly, Category, Transaction
+from app.db.model.transaction import Anomaly, Transaction
 from app.core.jwt import verify_access_token
+from app.core.pagination import decode_cursor, encode_cursor, estimate_row_count
+from app.services.category_registry import DEFAULT_CATEGORY_NAME, get_categories
+from app.services.feature_store import (
+    record_transactions, rebuild_user_feature_stats, reset_user_feature_stats
+)
+from app.services.scheduler import trigger_anomaly_detection
+from app.services.spend_rollup import rebuild_spend_rollup, record_spend, reset_user_spend_rollup
+from app.services.transaction_bulk import (
+    build_seed_rows, get_seed_transactions, insert_transaction_rows, prepare_bulk_rows
+)
 
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
@@ -53,6 +62,12 @@ class TransactionBase(BaseModel):
     status: str = "completed"
     currency: str = "KRW"
 
+class TransactionCreateResponse(TransactionBase):
+    """단일 거래 생성 응답 (등록 시점 이상거래 탐지 결과 포함)"""
+    anomaly_detected: bool = False
+    anomaly_severity: Optional[str] = None  # 위험 / 주의
+    anomaly_reason: Optional[str] = None
+
 class TransactionList(BaseModel):
     """거래 목록 응답 스키마"""
     total: int
@@ -60,6 +75,8 @@ class TransactionList(BaseModel):
     page_size: int
     transactions: List[TransactionBase]
     data_source: str = "DB"
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (없으면 마지막 페이지)
+    total_is_estimate: bool = False  # total_mode=estimate일 때 True
 
 class TransactionUpdate(BaseModel):
     """거래 수정 요청 스키마"""
@@ -80,12 +97,18 @@ class TransactionBulkCreate(BaseModel):
     user_id: int
     transactions: List[TransactionCreate]
 
+class TransactionBulkError(BaseModel):
+    """일괄 생성 실패 행 (index: 요청 transactions 배열 기준)"""
+    index: int
+    error: str
+
 class TransactionBulkResponse(BaseModel):
     """거래 일괄 생성 응답 스키마"""
     status: str
     created_count: int
     failed_count: int
     message: str
+    errors: List[TransactionBulkError] = []
 
 class AnomalyReport(BaseModel):
     """이상거래 신고 요청 스키마"""
@@ -105,96 +128,45 @@ async def load_test_data(
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
+    """
+    시드 CSV에서 임의 거래를 골라 사용자 거래를 다시 채움
 
+    시드 데이터는 프로세스당 한 번만 읽어 캐시하고, 저장은 COPY FROM STDIN 1회로 처리합니다.
+    """
     import random
-    import csv
-    import os
-    from sqlalchemy import insert
     
     try:
-        # CSV 파일 경로
-        possible_paths = [
-            os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "synthetic_transactions_3000_2026.csv"),  # 10_backend 기준 (우선)
-            "/app/synthetic_transactions_3000_2026.csv",  # Docker 컨테이너 경로
-            os.path.join(os.getcwd(), "synthetic_transactions_3000_2026.csv"),  # 현재 디렉토리
-            os.path.join(os.path.dirname(__file__), "..", "..", "synthetic_transactions_3000_2026.csv"),  # routers 기준
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), "synthetic_transactions_3000_2026.csv"),  # app 기준
-        ]
-        
-        csv_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                csv_path = path
-                break
-        
-        if not csv_path:
-            raise HTTPException(status_code=500, detail=f"테스트 데이터 CSV 파일을 찾을 수 없습니다. 시도한 경로: {possible_paths}")
+        # 시드 데이터 (첫 호출 시 CSV 파싱 후 캐시)
+        try:
+            seeds = get_seed_transactions()
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=500, detail=str(e))
         
-        # CSV 파일 읽기
-        transactions_from_csv = []
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                transactions_from_csv.append(row)
-        
-        if len(transactions_from_csv) < count:
-            count = len(transactions_from_csv)
+        if len(seeds) < count:
+            count = len(seeds)
         
         # 랜덤으로 선택
-        selected_rows = random.sample(transactions_from_csv, count)
+        selected_seeds = random.sample(seeds, count)
         
         # 기존 사용자 거래 삭제 (새로 시작)
         delete_stmt = delete(Transaction).where(Transaction.user_id == user_id)
         await db.execute(delete_stmt)
         
-        # 카테고리 조회
-        cat_query = select(Category)
-        cat_result = await db.execute(cat_query)
-        categories = {c.name: c.id for c in cat_result.scalars().all()}
+        # 카테고리 매핑 (레지스트리 캐시)
+        categories = (await get_categories(db)).by_name
         
         if not categories:
             raise HTTPException(status_code=500, detail="카테고리 데이터가 없습니다.")
         
-        created_count = 0
+        rows = build_seed_rows(user_id, selected_seeds, categories)
+        created_count = await insert_transaction_rows(db, rows, use_copy=True)
         
-        for row in selected_rows:
-            try:
-                # CSV 필드: 날짜,시간,타입,대분류,소분류,내용,금액,화폐,결제수단,메모
-                date_str = row.get('날짜', '')
-                time_str = row.get('시간', '')
-                category_name = row.get('대분류', '생활')
-                merchant = row.get('내용', '알수없음')
-                amount = float(row.get('금액', 0))
-                currency = row.get('화폐', 'KRW')
-                
-                # 날짜 파싱
-                try:
-                    tx_time = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
-                except:
-                    tx_time = datetime.now()
-                
-                # 카테고리 ID 찾기
-                category_id = categories.get(category_name) or categories.get('생활') or list(categories.values())[0]
-                
-                insert_stmt = insert(Transaction).values(
-                    user_id=user_id,
-                    category_id=category_id,
-                    amount=amount,
-                    currency=currency,
-                    merchant_name=merchant,
-                    description=None,
-                    status="completed",
-                    transaction_time=tx_time,
-                    is_fraudulent=False
-                )
-                await db.execute(insert_stmt)
-                created_count += 1
-                
-            except Exception as e:
-                logger.warning(f"테스트 데이터 개별 생성 실패: {e}")
-                continue
+        # 기존 거래를 지우고 다시 채웠으므로 피처 스토어 / 일별 집계 재계산
+        await rebuild_user_feature_stats(db, user_id)
+        await rebuild_spend_rollup(db, user_id=user_id)
         
         await db.commit()
+        trigger_anomaly_detection()  # 새 거래 이상 탐지 (백그라운드)
         
         return TestDataResponse(
             status="success",
@@ -221,8 +193,17 @@ async def get_transactions(
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1), # 상한선 제거하여 유연성 확보
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 page 대신 키셋 페이지네이션)"),
+    total_mode: str = Query("exact", pattern="^(exact|estimate|none)$", description="total 계산: exact(COUNT) / estimate(플래너 추정) / none"),
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    거래 내역 조회 (최신순, (transaction_time, id) 내림차순)
+
+    - cursor: 이전 응답의 next_cursor를 넘기면 OFFSET 없이 다음 페이지를 조회 (깊이와 무관하게 일정한 비용)
+    - total_mode: exact(기본, COUNT(*)) / estimate(플래너 추정값, total_is_estimate=true) / none(total=0, 계산 생략)
+    - category 필터는 categories JOIN으로 SQL에서 적용 (카테고리 없는 거래는 '기타')
+    """
     try:
         # # user_id가 없으면 빈 목록 반환 (인증되지 않은 경우)
         # # DISABLED FOR ADMIN: Allow fetching all transactions when user_id is None
@@ -235,10 +216,6 @@ async def get_transactions(
         #         data_source="DB"
         #     )
         
-        # 기본 쿼리 및 카운트 쿼리 생성
-        query = select(Transaction).options(selectinload(Transaction.category))
-        count_query = select(func.count(Transaction.id))
-        
         conditions = []
         
         # user_id가 제공된 경우에만 필터링 (관리자는 전체 조회 가능)
@@ -271,51 +248,72 @@ async def get_transactions(
                 )
             )
         
-        # 조건 적용
-        if conditions:
-            query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
+        # 카테고리 이름 필터 (카테고리 레지스트리로 id 변환, 카테고리 없는 거래는 '기타'로 취급)
+        categories = await get_categories(db)
+        if category:
+            category_ids = [cat_id for cat_id, name in categories.by_id.items() if name == category]
+            category_condition = Transaction.category_id.in_(category_ids)
+            if category == DEFAULT_CATEGORY_NAME:
+                category_condition = or_(Transaction.category_id.is_(None), category_condition)
+            conditions.append(category_condition)
+        
+        query = select(Transaction).where(and_(*conditions))
         
         # 총 개수 조회
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
+        total_is_estimate = False
+        if total_mode == "exact":
+            count_query = select(func.count(Transaction.id)).select_from(Transaction)
+            total = (await db.execute(count_query.where(and_(*conditions)))).scalar() or 0
+        elif total_mode == "estimate":
+            total = await estimate_row_count(db, query.with_only_columns(Transaction.id))
+            total_is_estimate = True
+        else:
+            total = 0
         
-        # 페이징 적용 (최신순)
-        offset = (page - 1) * page_size
-        query = query.order_by(Transaction.transaction_time.desc()).offset(offset).limit(page_size)
+        # 페이징 적용 (최신순, 같은 시각은 id 역순)
+        query = query.order_by(Transaction.transaction_time.desc(), Transaction.id.desc())
+        if cursor:
+            cursor_time, cursor_id = decode_cursor(cursor)
+            query = query.where(tuple_(Transaction.transaction_time, Transaction.id) < (cursor_time, cursor_id))
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.limit(page_size + 1)  # 다음 페이지 존재 여부 확인용 1건 추가
         
         # 데이터 조회
-        result = await db.execute(query)
-        rows = result.scalars().all()
+        rows = (await db.execute(query)).scalars().all()
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last_tx = rows[-1]
+            next_cursor = encode_cursor(last_tx.transaction_time, last_tx.id)
         
         # 응답 데이터 변환
-        transactions = []
-        for tx in rows:
-            cat_name = tx.category.name if tx.category else "기타"
-            
-            # 카테고리 이름 필터
-            if category and cat_name != category:
-                continue
-                
-            transactions.append(TransactionBase(
+        transactions = [
+            TransactionBase(
                 id=tx.id,
                 merchant=tx.merchant_name or "알 수 없음",
                 amount=float(tx.amount),
-                category=cat_name,
+                category=categories.name_of(tx.category_id),
                 transaction_date=tx.transaction_time.strftime("%Y-%m-%d %H:%M") if tx.transaction_time else "",
                 description=tx.description,
                 status=tx.status,
                 currency=tx.currency
-            ))
+            )
+            for tx in rows
+        ]
         
         return TransactionList(
             total=total,
             page=page,
             page_size=page_size,
             transactions=transactions,
-            data_source="DB (AWS RDS)"
+            data_source="DB (AWS RDS)",
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"거래 내역 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="거래 내역을 불러올 수 없습니다.")
@@ -326,62 +324,33 @@ async def create_transactions_bulk(
     data: TransactionBulkCreate,
     db: AsyncSession = Depends(get_db)
 ):
+    """
+    거래 일괄 생성
+
+    모든 행을 먼저 검증한 뒤 통과한 행을 배치 단위 multi-row INSERT로 저장합니다
+    (TRANSACTION_BULK_BATCH_SIZE). 실패한 행은 errors에 요청 배열 인덱스와 사유로 반환됩니다.
+    """
     try:
-        from sqlalchemy import insert
-        
-        created_count = 0
-        failed_count = 0
-        
-        # 카테고리 매핑 조회
-        cat_query = select(Category)
-        cat_result = await db.execute(cat_query)
-        categories = {c.name: c.id for c in cat_result.scalars().all()}
-        
-        for tx in data.transactions:
-            try:
-                category_id = categories.get(tx.category)
-                if not category_id:
-                    category_id = categories.get('기타') or (list(categories.values())[0] if categories else None)
-                
-                import random
-                try:
-                    # 1. Try standard format with Seconds
-                    dt = datetime.strptime(tx.transaction_date, "%Y-%m-%d %H:%M:%S")
-                    # User Request: Truncate seconds even if provided
-                    tx_time = dt.replace(second=0, microsecond=0)
-                except ValueError:
-                    try:
-                        # 2. Try format without Seconds (User's case: YYYY-MM-DD HH:MM)
-                        tx_time = datetime.strptime(tx.transaction_date, "%Y-%m-%d %H:%M")
-                        # seconds are already 0 here
-                    except ValueError:
-                        try:
-                            # 3. Try Date only
-                            tx_time = datetime.strptime(tx.transaction_date, "%Y-%m-%d")
-                        except ValueError:
-                            # 4. Fallback: Random past date (Team Logic)
-                            days_ago = random.randint(0, 365)
-                            tx_time = datetime.now() - timedelta(days=days_ago)
-                            tx_time = tx_time.replace(second=0, microsecond=0)
-                
-                insert_stmt = insert(Transaction).values(
-                    user_id=data.user_id,
-                    category_id=category_id,
-                    amount=tx.amount,
-                    currency=tx.currency,
-                    merchant_name=tx.merchant,
-                    description=tx.description,
-                    status="completed",
-                    transaction_time=tx_time
-                )
-                await db.execute(insert_stmt)
-                created_count += 1
-                
-            except Exception as e:
-                logger.warning(f"거래 개별 생성 실패: {e}")
-                failed_count += 1
+        # 카테고리 매핑 (레지스트리 캐시)
+        categories = (await get_categories(db)).by_name
+        
+        # 파싱/검증 (created_rows: 피처 스토어 반영용 (금액, 카테고리명, 거래 시각))
+        rows, created_rows, errors = prepare_bulk_rows(data.user_id, data.transactions, categories)
+        for err in errors:
+            logger.warning(f"거래 개별 생성 실패 (index={err.index}): {err.error}")
+        
+        created_count = await insert_transaction_rows(db, rows)
+        failed_count = len(errors)
+        
+        # 사용자 피처 스토어 / 일별 집계 증분 갱신 (각각 UPSERT 1회)
+        await record_transactions(db, data.user_id, created_rows)
+        await record_spend(
+            db, data.user_id,
+            [(row["amount"], row["category_id"], row["transaction_time"]) for row in rows]
+        )
         
         await db.commit()
+        trigger_anomaly_detection()  # 새 거래 이상 탐지 (백그라운드)
     except Exception as e:
         logger.error(f"일괄 생성 처리 중 치명적 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -392,11 +361,12 @@ async def create_transactions_bulk(
         status="success",
         created_count=created_count,
         failed_count=failed_count,
-        message=f"{created_count}건 생성 완료, {failed_count}건 실패"
+        message=f"{created_count}건 생성 완료, {failed_count}건 실패",
+        errors=[TransactionBulkError(index=err.index, error=err.error) for err in errors]
     )
 
 # 단일 거래 생성 API
-@router.post("", response_model=TransactionBase)
+@router.post("", response_model=TransactionCreateResponse)
 async def create_transaction(
     data: TransactionCreate,
     db: AsyncSession = Depends(get_db),
@@ -410,6 +380,9 @@ async def create_transaction(
     - merchant_name: 가맹점명 (필수)
     - description: 설명/메모 (선택)
     - transaction_date: 거래 시각 ISO format (선택, 기본값: 현재 시각)
+
+    등록한 거래는 응답 전에 이상거래 탐지를 실행하며, 결과는 anomaly_* 필드로 반환됩니다
+    (이상거래면 GET /anomalies에도 바로 나타남).
     """
     try:
         # merchant_name과 merchant 둘 다 지원 (일괄 생성 호환)
@@ -417,16 +390,10 @@ async def create_transaction(
         if not merchant:
             raise HTTPException(status_code=422, detail="merchant_name 또는 merchant 필드가 필요합니다")
 
-        # 카테고리 조회
-        cat_query = select(Category).where(Category.name == data.category)
-        cat_result = await db.execute(cat_query)
-        category = cat_result.scalar_one_or_none()
-
-        # 카테고리가 없으면 "기타"로 검색
-        if not category:
-            cat_query = select(Category).where(Category.name == "기타")
-            cat_result = await db.execute(cat_query)
-            category = cat_result.scalar_one_or_none()
+        # 카테고리 조회 (없으면 "기타", 레지스트리 캐시)
+        categories = await get_categories(db)
+        category_id = categories.resolve_id(data.category)
+        category_name = categories.name_of(category_id, default=None)
 
         # 거래 시각 파싱
         if data.transaction_date:
@@ -443,27 +410,46 @@ async def create_transaction(
             amount=data.amount,
             merchant_name=merchant,
             description=data.description,
-            category_id=category.id if category else None,
+            category_id=category_id,
             transaction_time=tx_time,
             status="completed",
             currency=data.currency or "KRW"
         )
 
         db.add(new_tx)
+        
+        # 사용자 피처 스토어 / 일별 집계 증분 갱신 (거래와 같은 트랜잭션으로 커밋)
+        await record_transactions(db, user_id, [(data.amount, category_name, tx_time)])
+        await record_spend(db, user_id, [(data.amount, category_id, tx_time)])
+        
         await db.commit()
         await db.refresh(new_tx)
-
-        return TransactionBase(
+        response = TransactionCreateResponse(
             id=new_tx.id,
             merchant=new_tx.merchant_name or "알 수 없음",
             amount=float(new_tx.amount),
-            category=category.name if category else "기타",
+            category=category_name or DEFAULT_CATEGORY_NAME,
             transaction_date=new_tx.transaction_time.strftime("%Y-%m-%d %H:%M:%S"),
             description=new_tx.description,
             status=new_tx.status,
             currency=new_tx.currency
         )
 
+        # 새 거래 이상 탐지 (요청 안에서 실행, 실패하면 백그라운드 워커가 검사)
+        try:
+            from app.services.anomaly_detection import detect_transaction  # pandas/모델은 첫 호출 시 로드
+            anomaly = await detect_transaction(db, response.id)
+            if anomaly:
+                response.anomaly_detected = True
+                response.anomaly_severity = anomaly["severity"]
+                response.anomaly_reason = anomaly["reason"]
+        except Exception as e:
+            logger.error(f"거래 등록 시 이상거래 탐지 실패 (transaction_id={response.id}): {e}")
+            await db.rollback()
+        trigger_anomaly_detection()
+
+        return response
+
     except Exception as e:
         logger.error(f"거래 생성 실패: {e}")
         await db.rollback()
@@ -481,6 +467,8 @@ async def delete_all_transactions(
     try:
         delete_stmt = delete(Transaction).where(Transaction.user_id == user_id)
         result = await db.execute(delete_stmt)
+        await reset_user_feature_stats(db, user_id)
+        await reset_user_spend_rollup(db, user_id)
         await db.commit()
         return {
             "status": "success",
@@ -497,18 +485,19 @@ async def get_transaction(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        query = select(Transaction).options(selectinload(Transaction.category)).where(Transaction.id == transaction_id)
+        query = select(Transaction).where(Transaction.id == transaction_id)
         result = await db.execute(query)
         tx = result.scalar_one_or_none()
         
         if not tx:
             raise HTTPException(status_code=404, detail=f"Transaction {transaction_id} not found")
         
+        categories = await get_categories(db)
         return TransactionBase(
             id=tx.id,
             merchant=tx.merchant_name or "알 수 없음",
             amount=float(tx.amount),
-            category=tx.category.name if tx.category else "기타",
+            category=categories.name_of(tx.category_id),
             transaction_date=tx.transaction_time.strftime("%Y-%m-%d %H:%M") if tx.transaction_time else "",
             description=tx.description,
             status=tx.status,
@@ -6,14 +6,14 @@ Provides endpoints for tracking new signups, churned users, and churn metrics
 from datetime import datetime, timedelta
 from typing import List, Optional
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
 from app.db.model.user import User
-from app.db.model.transaction import Transaction
 from app.db.schema.user import UserResponse
 from app.routers.user import get_current_user
+from app.services.user_activity import get_churn_counts, list_users_with_activity
 from pydantic import BaseModel
 from fastapi import HTTPException, status
 
@@ -41,24 +41,9 @@ async def verify_superuser(current_user: User) -> User:
     return current_user
 
 
-# Helper function to check if user is churned
-async def is_user_churned(db: AsyncSession, user_id: int, days: int = 30) -> bool:
-    """Check if user has no transactions in the last N days"""
-    cutoff_date = datetime.now() - timedelta(days=days)
-    
-    result = await db.execute(
-        select(Transaction)
-        .where(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_time >= cutoff_date
-            )
-        )
-        .limit(1)
-    )
-    
-    # If no recent transactions, user is churned
-    return result.scalar_one_or_none() is None
+def to_user_response(user: User, has_activity: bool) -> UserResponse:
+    """Build UserResponse with recent activity status"""
+    return UserResponse(**{**user.__dict__, 'has_recent_activity': has_activity})
 
 
 @router.get("/", response_model=List[UserResponse])
@@ -72,24 +57,14 @@ async def get_all_users_admin(
     **Admin only endpoint**
     """
     # await verify_superuser(current_user)  # Disabled for development
-    result = await db.execute(
-        select(User)
-        .where(User.is_superuser == False)
-        .order_by(User.id.asc())
+    # Users and has_recent_activity in a single query (EXISTS per user, no N+1)
+    rows = await list_users_with_activity(
+        db,
+        User.is_superuser == False,
+        order_by=User.id.asc(),
+        days=30
     )
-    users = result.scalars().all()
-    
-    # Calculate has_recent_activity for each user
-    user_responses = []
-    for user in users:
-        has_activity = not await is_user_churned(db, user.id, days=30)
-        user_dict = {
-            **user.__dict__,
-            'has_recent_activity': has_activity
-        }
-        user_responses.append(UserResponse(**user_dict))
-    
-    return user_responses
+    return [to_user_response(user, has_activity) for user, has_activity in rows]
 
 
 @router.get("/new-signups", response_model=List[UserResponse])
@@ -106,30 +81,16 @@ async def get_new_signups(
     # await verify_superuser(current_user)  # Disabled for development
     cutoff_date = datetime.now() - timedelta(days=days)
     
-    result = await db.execute(
-        select(User)
-        .where(
-            and_(
-                User.created_at >= cutoff_date,
-                User.is_superuser == False
-            )
-        )
-        .order_by(User.created_at.desc())
+    rows = await list_users_with_activity(
+        db,
+        and_(
+            User.created_at >= cutoff_date,
+            User.is_superuser == False
+        ),
+        order_by=User.created_at.desc(),
+        days=30
     )
-    
-    users = result.scalars().all()
-    
-    # Calculate has_recent_activity for each user
-    user_responses = []
-    for user in users:
-        has_activity = not await is_user_churned(db, user.id, days=30)
-        user_dict = {
-            **user.__dict__,
-            'has_recent_activity': has_activity
-        }
-        user_responses.append(UserResponse(**user_dict))
-    
-    return user_responses
+    return [to_user_response(user, has_activity) for user, has_activity in rows]
 
 
 @router.get("/churned", response_model=List[UserResponse])
@@ -146,24 +107,14 @@ async def get_churned_users(
     """
     # await verify_superuser(current_user)  # Disabled for development
     
-    # Get all non-superuser users
-    result = await db.execute(
-        select(User)
-        .where(User.is_superuser == False)
+    # Non-superuser users with no transactions in last N days (filtered in SQL)
+    rows = await list_users_with_activity(
+        db,
+        User.is_superuser == False,
+        days=days,
+        churned_only=True
     )
-    all_users = result.scalars().all()
-    
-    # Filter churned users (no transactions in last N days)
-    churned_user_responses = []
-    for user in all_users:
-        if await is_user_churned(db, user.id, days):
-            user_dict = {
-                **user.__dict__,
-                'has_recent_activity': False  # Churned users have no recent activity
-            }
-            churned_user_responses.append(UserResponse(**user_dict))
-    
-    return churned_user_responses
+    return [to_user_response(user, False) for user, _ in rows]
 
 
 @router.get("/stats/churn-rate", response_model=ChurnMetrics)
@@ -186,37 +137,12 @@ async def get_churn_rate(
     """
     # await verify_superuser(current_user)  # Disabled for development
     
-    # Get total non-superuser users
-    total_result = await db.execute(
-        select(func.count(User.id))
-        .where(User.is_superuser == False)
+    # Total users, churned users and new signups in a single aggregate query
+    total_users, total_churned, new_signups = await get_churn_counts(
+        db,
+        churn_days=churn_days,
+        signup_days=signup_days
     )
-    total_users = total_result.scalar() or 0
-    
-    # Get new signups (excluding superusers)
-    signup_cutoff = datetime.now() - timedelta(days=signup_days)
-    signup_result = await db.execute(
-        select(func.count(User.id))
-        .where(
-            and_(
-                User.created_at >= signup_cutoff,
-                User.is_superuser == False
-            )
-        )
-    )
-    new_signups = signup_result.scalar() or 0
-    
-    # Get all non-superuser users and check transaction history
-    result = await db.execute(
-        select(User)
-        .where(User.is_superuser == False)
-    )
-    all_users = result.scalars().all()
-    
-    total_churned = 0
-    for user in all_users:
-        if await is_user_churned(db, user.id, churn_days):
-            total_churned += 1
     
     active_users = total_users - total_churned
     churn_rate = (total_churned / total_users * 100) if total_users > 0 else 0.0
@@ -3,15 +3,21 @@ Analysis Service Layer
 비즈니스 로직과 DB 쿼리 분리
 
 분석 관련 모든 데이터 처리 로직을 담당
+기간 합계/카테고리/월별 추이는 일별 집계(daily_spend_rollup, services/spend_rollup.py)에서 읽음
+서로 독립적인 집계는 fan_out()으로 별도 커넥션에서 동시에 실행 (한 단계만, 동시 실행 수는 DB_FAN_OUT_CONCURRENCY로 제한)
 """
 
+from fastapi import HTTPException
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Optional, List
 import logging
 
-from app.db.model.transaction import Transaction, Category
+from app.db.database import fan_out
+from app.services.category_registry import get_categories, sum_by_category_name
+from app.services.spend_rollup import get_monthly_spend, get_spend_by_category, get_spend_totals
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +108,96 @@ def get_mock_insights() -> List[SpendingInsight]:
 # ============================================================
 # 서비스 함수들 (비즈니스 로직)
 # ============================================================
+#
+# 조회는 기간 합계/카테고리/월별 추이 집계 작업(partial)으로 만들고 fan_out()으로 한 단계만 동시에 실행합니다.
+# (fan_out 안에서 다시 fan_out 하지 않음 - 요청당 커넥션 수를 작업 수로 제한)
+
+def _month_start(year: Optional[int], month: Optional[int]) -> datetime:
+    if year and month:
+        return datetime(year, month, 1, 0, 0, 0)
+    return datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _fallback(name: str, error: Exception, mock):
+    """
+    조회 실패 시 Mock 데이터로 대체
+
+    커넥션 풀 대기 시간 초과는 Mock으로 숨기지 않고 503으로 응답합니다 (과부하 신호).
+    """
+    if isinstance(error, PoolTimeoutError):
+        logger.error(f"{name} 실패 (커넥션 풀 대기 초과): {error}")
+        raise HTTPException(status_code=503, detail="분석 서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    logger.warning(f"{name} 실패: {error}")
+    return mock()
+
+
+def _summary_jobs(this_month_start: datetime, **scope) -> list:
+    """요약 통계용 집계 작업: 이번 달 합계 / 이번 달 카테고리별 합계 / 전월 합계"""
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+    return [
+        partial(get_spend_totals, start=this_month_start, **scope),
+        partial(get_spend_by_category, start=this_month_start, **scope),
+        partial(get_spend_totals, start=last_month_start, end=this_month_start, **scope),
+    ]
+
+
+def _build_summary(this_month, category_rows, last_month, categories, data_source: str) -> DashboardSummary:
+    total, count = this_month
+    prev_total, prev_count = last_month
+    avg = total / count if count else 0
+    
+    # 최다 카테고리
+    cat_rows = sum_by_category_name(category_rows, categories, default=None)
+    top_category = cat_rows[0][0] if cat_rows else "없음"
+    
+    # 전월 대비 증감률
+    mom_change = ((total - prev_total) / prev_total * 100) if prev_total > 0 else (0.0 if total == 0 else 100.0)
+    count_mom_change = ((count - prev_count) / prev_count * 100) if prev_count > 0 else (0.0 if count == 0 else 100.0)
+    
+    return DashboardSummary(
+        total_spending=total,
+        average_transaction=avg,
+        transaction_count=count,
+        top_category=top_category or "없음",
+        month_over_month_change=round(mom_change, 1),
+        transaction_count_mom_change=round(count_mom_change, 1),
+        data_source=data_source
+    )
+
+
+def _build_breakdown(category_rows, categories) -> List[CategoryBreakdown]:
+    rows = sum_by_category_name(category_rows, categories)
+    grand_total = sum(float(row[1]) for row in rows) if rows else 1
+    return [
+        CategoryBreakdown(
+            category=row[0],
+            total_amount=float(row[1]),
+            transaction_count=row[2],
+            percentage=round((float(row[1]) / grand_total) * 100, 1)
+        )
+        for row in rows
+    ] or get_mock_category_breakdown()
+
+
+def _build_trends(monthly_rows) -> List[MonthlyTrend]:
+    # 최신월 먼저 조회되므로 오래된 순으로 뒤집음
+    return [
+        MonthlyTrend(month=row[0], total_amount=float(row[1]), transaction_count=row[2])
+        for row in reversed(monthly_rows)
+    ] or get_mock_monthly_trend()
+
+
+def _user_categories_start(months: int, year: Optional[int], month: Optional[int]) -> datetime:
+    if year and month:
+        end_date = datetime(year, month, 1, 0, 0, 0)
+        if end_date.month == 12:
+            end_date = end_date.replace(year=end_date.year + 1, month=1)
+        else:
+            end_date = end_date.replace(month=end_date.month + 1)
+    else:
+        end_date = datetime.now()
+    return end_date - timedelta(days=30 * months)
+
 
 async def get_user_summary(
     db: AsyncSession,
@@ -109,84 +205,12 @@ async def get_user_summary(
     year: Optional[int] = None,
     month: Optional[int] = None
 ) -> DashboardSummary:
-    """특정 사용자의 대시보드 요약 통계"""
+    """특정 사용자의 대시보드 요약 통계 (이상거래 제외, 일별 집계)"""
     try:
-        now = datetime.now()
-        
-        if year and month:
-            this_month_start = datetime(year, month, 1, 0, 0, 0)
-        else:
-            this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # 이번 달 통계 (이상거래 제외)
-        query = select(
-            func.coalesce(func.sum(Transaction.amount), 0).label('total'),
-            func.coalesce(func.avg(Transaction.amount), 0).label('avg'),
-            func.count(Transaction.id).label('count')
-        ).where(
-            Transaction.transaction_time >= this_month_start,
-            Transaction.user_id == user_id,
-            Transaction.is_fraudulent == False  # 이상거래 제외
-        )
-        
-        result = await db.execute(query)
-        row = result.fetchone()
-        
-        total = float(row.total) if row.total else 0
-        avg = float(row.avg) if row.avg else 0
-        count = row.count or 0
-        
-        # 최다 카테고리
-        cat_query = text("""
-            SELECT c.name, SUM(t.amount) as cat_total
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.transaction_time >= :start_date 
-              AND t.user_id = :user_id
-              AND t.is_fraudulent = false
-            GROUP BY c.name
-            ORDER BY cat_total DESC
-            LIMIT 1
-        """)
-        cat_result = await db.execute(cat_query, {"start_date": this_month_start, "user_id": user_id})
-        cat_row = cat_result.fetchone()
-        top_category = cat_row[0] if cat_row else "없음"
-        
-        # 전월 대비 증감률
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = this_month_start - timedelta(seconds=1)
-        
-        prev_query = select(
-            func.coalesce(func.sum(Transaction.amount), 0).label('prev_total'),
-            func.count(Transaction.id).label('prev_count')
-        ).where(
-            Transaction.transaction_time >= last_month_start,
-            Transaction.transaction_time <= last_month_end,
-            Transaction.user_id == user_id,
-            Transaction.is_fraudulent == False  # 이상거래 제외
-        )
-        
-        prev_result = await db.execute(prev_query)
-        prev_row = prev_result.fetchone()
-        prev_total = float(prev_row.prev_total) if prev_row.prev_total else 0
-        prev_count = prev_row.prev_count if prev_row.prev_count else 0
-        
-        mom_change = ((total - prev_total) / prev_total * 100) if prev_total > 0 else (0.0 if total == 0 else 100.0)
-        count_mom_change = ((count - prev_count) / prev_count * 100) if prev_count > 0 else (0.0 if count == 0 else 100.0)
-        
-        return DashboardSummary(
-            total_spending=total,
-            average_transaction=avg,
-            transaction_count=count,
-            top_category=top_category or "없음",
-            month_over_month_change=round(mom_change, 1),
-            transaction_count_mom_change=round(count_mom_change, 1),
-            data_source="DB (AWS RDS)"
-        )
-        
+        results = await fan_out(db, *_summary_jobs(_month_start(year, month), user_id=user_id))
+        return _build_summary(*results, await get_categories(db), data_source="DB (AWS RDS)")
     except Exception as e:
-        logger.warning(f"get_user_summary 실패: {e}")
-        return get_mock_summary()
+        return _fallback("get_user_summary", e, get_mock_summary)
 
 
 async def get_user_categories(
@@ -198,48 +222,11 @@ async def get_user_categories(
 ) -> List[CategoryBreakdown]:
     """특정 사용자의 카테고리별 소비 분석"""
     try:
-        if year and month:
-            end_date = datetime(year, month, 1, 0, 0, 0)
-            if end_date.month == 12:
-                end_date = end_date.replace(year=end_date.year + 1, month=1)
-            else:
-                end_date = end_date.replace(month=end_date.month + 1)
-        else:
-            end_date = datetime.now()
-        
-        start_date = end_date - timedelta(days=30 * months)
-        
-        query = text("""
-            SELECT c.name as category, SUM(t.amount) as total, COUNT(t.id) as count
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.transaction_time >= :start_date 
-              AND t.user_id = :user_id
-              AND t.is_fraudulent = false
-            GROUP BY c.name
-            ORDER BY total DESC
-        """)
-        
-        result = await db.execute(query, {"start_date": start_date, "user_id": user_id})
-        rows = result.fetchall()
-        
-        grand_total = sum(float(row[1]) for row in rows) if rows else 1
-        
-        categories = [
-            CategoryBreakdown(
-                category=row[0] or "기타",
-                total_amount=float(row[1]),
-                transaction_count=row[2],
-                percentage=round((float(row[1]) / grand_total) * 100, 1)
-            )
-            for row in rows
-        ]
-        
-        return categories if categories else get_mock_category_breakdown()
-        
+        start_date = _user_categories_start(months, year, month)
+        category_rows = await get_spend_by_category(db, start=start_date, user_id=user_id)
+        return _build_breakdown(category_rows, await get_categories(db))
     except Exception as e:
-        logger.warning(f"get_user_categories 실패: {e}")
-        return get_mock_category_breakdown()
+        return _fallback("get_user_categories", e, get_mock_category_breakdown)
 
 
 async def get_user_trends(
@@ -249,31 +236,19 @@ async def get_user_trends(
 ) -> List[MonthlyTrend]:
     """특정 사용자의 월별 지출 추이"""
     try:
-        query = text("""
-            SELECT TO_CHAR(transaction_time, 'YYYY-MM') as month,
-                   SUM(amount) as total,
-                   COUNT(id) as count
-            FROM transactions
-            WHERE user_id = :user_id
-              AND is_fraudulent = false
-            GROUP BY TO_CHAR(transaction_time, 'YYYY-MM')
-            ORDER BY month DESC
-            LIMIT :limit
-        """)
-        
-        result = await db.execute(query, {"limit": months, "user_id": user_id})
-        rows = result.fetchall()
-        
-        trends = [
-            MonthlyTrend(month=row[0], total_amount=float(row[1]), transaction_count=row[2])
-            for row in rows
-        ]
-        
-        return list(reversed(trends)) if trends else get_mock_monthly_trend()
-        
+        return _build_trends(await get_monthly_spend(db, months, user_id=user_id))
     except Exception as e:
-        logger.warning(f"get_user_trends 실패: {e}")
-        return get_mock_monthly_trend()
+        return _fallback("get_user_trends", e, get_mock_monthly_trend)
+
+
+def _mock_analysis() -> AnalysisResponse:
+    return AnalysisResponse(
+        summary=get_mock_summary(),
+        category_breakdown=get_mock_category_breakdown(),
+        monthly_trend=get_mock_monthly_trend(),
+        insights=get_mock_insights(),
+        data_source="[MOCK]"
+    )
 
 
 async def get_user_full_analysis(
@@ -282,26 +257,24 @@ async def get_user_full_analysis(
 ) -> AnalysisResponse:
     """특정 사용자의 전체 분석 데이터"""
     try:
-        summary = await get_user_summary(db, user_id)
-        categories = await get_user_categories(db, user_id)
-        trends = await get_user_trends(db, user_id)
+        # 요약 3개 + 카테고리 + 추이 집계 5개를 한 단계로 동시에 조회
+        *summary_results, category_rows, monthly_rows = await fan_out(
+            db,
+            *_summary_jobs(_month_start(None, None), user_id=user_id),
+            partial(get_spend_by_category, start=_user_categories_start(1, None, None), user_id=user_id),
+            partial(get_monthly_spend, months=6, user_id=user_id),
+        )
+        categories = await get_categories(db)
         
         return AnalysisResponse(
-            summary=summary,
-            category_breakdown=categories,
-            monthly_trend=trends,
+            summary=_build_summary(*summary_results, categories, data_source="DB (AWS RDS)"),
+            category_breakdown=_build_breakdown(category_rows, categories),
+            monthly_trend=_build_trends(monthly_rows),
             insights=get_mock_insights(),
             data_source="DB (AWS RDS)"
         )
     except Exception as e:
-        logger.warning(f"get_user_full_analysis 실패: {e}")
-        return AnalysisResponse(
-            summary=get_mock_summary(),
-            category_breakdown=get_mock_category_breakdown(),
-            monthly_trend=get_mock_monthly_trend(),
-            insights=get_mock_insights(),
-            data_source="[MOCK]"
-        )
+        return _fallback("get_user_full_analysis", e, _mock_analysis)
 
 
 # ============================================================
@@ -313,84 +286,12 @@ async def get_admin_summary(
     year: Optional[int] = None,
     month: Optional[int] = None
 ) -> DashboardSummary:
-    """관리자용: 전체 사용자(관리자 제외) 요약 통계"""
+    """관리자용: 전체 사용자(관리자 제외) 요약 통계 (이상거래 제외, 일별 집계)"""
     try:
-        now = datetime.now()
-        
-        if year and month:
-            this_month_start = datetime(year, month, 1, 0, 0, 0)
-        else:
-            this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        summary_query = text("""
-            SELECT 
-                COALESCE(SUM(t.amount), 0) as total,
-                COALESCE(AVG(t.amount), 0) as avg,
-                COUNT(t.id) as count
-            FROM transactions t
-            JOIN users u ON t.user_id = u.id
-            WHERE u.is_superuser = false
-              AND t.transaction_time >= :start_date
-              AND t.is_fraudulent = false
-        """)
-        result = await db.execute(summary_query, {"start_date": this_month_start})
-        row = result.fetchone()
-        
-        total = float(row[0]) if row[0] else 0
-        avg = float(row[1]) if row[1] else 0
-        count = row[2] or 0
-        
-        # 최다 카테고리
-        cat_query = text("""
-            SELECT c.name, SUM(t.amount) as cat_total
-            FROM transactions t
-            JOIN users u ON t.user_id = u.id
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE u.is_superuser = false
-              AND t.transaction_time >= :start_date
-              AND t.is_fraudulent = false
-            GROUP BY c.name
-            ORDER BY cat_total DESC
-            LIMIT 1
-        """)
-        cat_result = await db.execute(cat_query, {"start_date": this_month_start})
-        cat_row = cat_result.fetchone()
-        top_category = cat_row[0] if cat_row else "없음"
-        
-        # 전월 대비 증감률
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = this_month_start - timedelta(seconds=1)
-        
-        prev_query = text("""
-            SELECT COALESCE(SUM(t.amount), 0) as prev_total, COUNT(t.id) as prev_count
-            FROM transactions t
-            JOIN users u ON t.user_id = u.id
-            WHERE u.is_superuser = false
-              AND t.transaction_time >= :start_date
-              AND t.transaction_time <= :end_date
-              AND t.is_fraudulent = false
-        """)
-        prev_result = await db.execute(prev_query, {"start_date": last_month_start, "end_date": last_month_end})
-        prev_row = prev_result.fetchone()
-        prev_total = float(prev_row[0]) if prev_row[0] else 0
-        prev_count = prev_row[1] if prev_row[1] else 0
-        
-        mom_change = ((total - prev_total) / prev_total * 100) if prev_total > 0 else (0.0 if total == 0 else 100.0)
-        count_mom_change = ((count - prev_count) / prev_count * 100) if prev_count > 0 else (0.0 if count == 0 else 100.0)
-        
-        return DashboardSummary(
-            total_spending=total,
-            average_transaction=avg,
-            transaction_count=count,
-            top_category=top_category or "없음",
-            month_over_month_change=round(mom_change, 1),
-            transaction_count_mom_change=round(count_mom_change, 1),
-            data_source="DB (Admin - All Users)"
-        )
-        
+        results = await fan_out(db, *_summary_jobs(_month_start(year, month), exclude_superusers=True))
+        return _build_summary(*results, await get_categories(db), data_source="DB (Admin - All Users)")
     except Exception as e:
-        logger.warning(f"get_admin_summary 실패: {e}")
-        return get_mock_summary()
+        return _fallback("get_admin_summary", e, get_mock_summary)
 
 
 async def get_admin_categories(
@@ -400,70 +301,18 @@ async def get_admin_categories(
 ) -> List[CategoryBreakdown]:
     """관리자용: 전체 사용자(관리자 제외) 카테고리 분석"""
     try:
-        now = datetime.now()
-        
-        if year and month:
-            this_month_start = datetime(year, month, 1, 0, 0, 0)
-        else:
-            this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        query = text("""
-            SELECT c.name as category, SUM(t.amount) as total, COUNT(t.id) as count
-            FROM transactions t
-            JOIN users u ON t.user_id = u.id
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE u.is_superuser = false
-              AND t.transaction_time >= :start_date
-              AND t.is_fraudulent = false
-            GROUP BY c.name
-            ORDER BY total DESC
-        """)
-        result = await db.execute(query, {"start_date": this_month_start})
-        rows = result.fetchall()
-        
-        grand_total = sum(float(r[1]) for r in rows) if rows else 1
-        
-        return [
-            CategoryBreakdown(
-                category=r[0] or "기타",
-                total_amount=float(r[1]),
-                transaction_count=r[2],
-                percentage=round((float(r[1]) / grand_total) * 100, 1)
-            )
-            for r in rows
-        ] or get_mock_category_breakdown()
-        
+        category_rows = await get_spend_by_category(db, start=_month_start(year, month), exclude_superusers=True)
+        return _build_breakdown(category_rows, await get_categories(db))
     except Exception as e:
-        logger.warning(f"get_admin_categories 실패: {e}")
-        return get_mock_category_breakdown()
+        return _fallback("get_admin_categories", e, get_mock_category_breakdown)
 
 
 async def get_admin_trends(db: AsyncSession, months: int = 6) -> List[MonthlyTrend]:
     """관리자용: 전체 사용자(관리자 제외) 월별 추이"""
     try:
-        query = text("""
-            SELECT TO_CHAR(t.transaction_time, 'YYYY-MM') as month,
-                   SUM(t.amount) as total,
-                   COUNT(t.id) as count
-            FROM transactions t
-            JOIN users u ON t.user_id = u.id
-            WHERE u.is_superuser = false
-              AND t.is_fraudulent = false
-            GROUP BY TO_CHAR(t.transaction_time, 'YYYY-MM')
-            ORDER BY month DESC
-            LIMIT :limit
-        """)
-        result = await db.execute(query, {"limit": months})
-        rows = result.fetchall()
-        
-        return [
-            MonthlyTrend(month=r[0], total_amount=float(r[1]), transaction_count=r[2])
-            for r in reversed(rows)
-        ] or get_mock_monthly_trend()
-        
+        return _build_trends(await get_monthly_spend(db, months, exclude_superusers=True))
     except Exception as e:
-        logger.warning(f"get_admin_trends 실패: {e}")
-        return get_mock_monthly_trend()
+        return _fallback("get_admin_trends", e, get_mock_monthly_trend)
 
 
 async def get_admin_full_analysis(
@@ -473,23 +322,22 @@ async def get_admin_full_analysis(
 ) -> AnalysisResponse:
     """관리자용 전체 분석 데이터"""
     try:
-        summary = await get_admin_summary(db, year, month)
-        categories = await get_admin_categories(db, year, month)
-        trends = await get_admin_trends(db)
+        this_month_start = _month_start(year, month)
+        # 요약 3개 + 카테고리(요약의 이번 달 카테고리 합계 재사용) + 추이 = 집계 4개를 동시에 조회
+        this_month, category_rows, last_month, monthly_rows = await fan_out(
+            db,
+            *_summary_jobs(this_month_start, exclude_superusers=True),
+            partial(get_monthly_spend, months=6, exclude_superusers=True),
+        )
+        categories = await get_categories(db)
         
         return AnalysisResponse(
-            summary=summary,
-            category_breakdown=categories,
-            monthly_trend=trends,
+            summary=_build_summary(this_month, category_rows, last_month, categories,
+                                   data_source="DB (Admin - All Users)"),
+            category_breakdown=_build_breakdown(category_rows, categories),
+            monthly_trend=_build_trends(monthly_rows),
             insights=get_mock_insights(),
             data_source="DB (Admin - All Users)"
         )
     except Exception as e:
-        logger.warning(f"get_admin_full_analysis 실패: {e}")
-        return AnalysisResponse(
-            summary=get_mock_summary(),
-            category_breakdown=get_mock_category_breakdown(),
-            monthly_trend=get_mock_monthly_trend(),
-            insights=get_mock_insights(),
-            data_source="[MOCK]"
-        )
+        return _fallback("get_admin_full_analysis", e, _mock_analysis)
@@ -6,12 +6,13 @@ Anomaly Service Layer
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from typing import Optional
 import logging
 
 from app.db.model.transaction import Anomaly, Transaction
 from app.db.model.user import User
+from app.services.spend_rollup import apply_fraud_flag
 
 logger = logging.getLogger(__name__)
 
@@ -71,13 +72,19 @@ async def report_anomaly(
     anomaly.reason = 'User Reported'
     
     # Transaction의 is_fraudulent 플래그 설정 (소비 집계에서 제외)
-    tx_query = select(Transaction).where(Transaction.id == anomaly.transaction_id)
-    tx_result = await db.execute(tx_query)
-    transaction = tx_result.scalar_one_or_none()
-    
-    if transaction:
-        transaction.is_fraudulent = True
-        logger.info(f"Transaction {transaction.id} marked as fraudulent (User Reported)")
+    # 조건부 UPDATE로 실제로 false -> true로 바뀐 경우에만 행이 반환되므로,
+    # 같은 거래를 동시에 신고해도 일별 집계 이동은 한 번만 일어남
+    flipped = (await db.execute(
+        update(Transaction)
+        .where(Transaction.id == anomaly.transaction_id, Transaction.is_fraudulent == False)
+        .values(is_fraudulent=True)
+        .returning(Transaction.id)
+    )).scalar_one_or_none()
+    
+    if flipped is not None:
+        # 일별 집계에서 정상 -> 이상거래 합계로 이동 (같은 트랜잭션으로 커밋)
+        await apply_fraud_flag(db, [flipped], fraudulent=True)
+        logger.info(f"Transaction {flipped} marked as fraudulent (User Reported)")
     
     await db.commit()
     await db.refresh(anomaly)
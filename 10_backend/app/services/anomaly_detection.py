@@ -0,0 +1,623 @@
+"""
+이상거래 탐지 서비스 (백그라운드 워커)
+
+새로 들어온 거래를 transactions.id 기준 하이워터마크(마지막으로 검사한 거래 ID) 이후부터
+배치 단위로 검사하여 anomalies 테이블에 일괄 저장합니다.
+GET /api/anomalies는 저장된 결과만 조회하므로 요청 경로에서 스캔이 실행되지 않습니다.
+
+- 실행: 스케줄러 주기 작업(scheduler.run_anomaly_detection_job) + 거래 추가 시 즉시 트리거
+  단일 거래 등록(POST /transactions)은 detect_transaction()으로 요청 안에서 바로 검사하고 결과를 응답에 포함
+- 탐지: 휴리스틱(카테고리별 최근 30건 평균 대비 배율, 카테고리 컷오프) → 통과 거래만 AI 모델 배치 점수
+- 하이워터마크: admin_settings의 anomaly_detection.last_transaction_id (배치와 같은 트랜잭션으로 커밋)
+  늦게 커밋되는 낮은 ID(대량 등록/COPY)는 검사 범위의 ID 빈칸으로 기록해 두었다가,
+  그 시점에 진행 중이던 트랜잭션이 모두 끝난 뒤(txid 스냅샷 기준) 해당 범위를 다시 검사
+"""
+
+import asyncio
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, insert, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.settings import settings
+from app.db.model.admin_settings import AdminSettings
+from app.db.model.transaction import Anomaly, Transaction
+from app.services.feature_store import CategoryKey, get_recent_category_history
+from app.services.fraud_preprocessing import HISTORY_WINDOW, FraudPreprocessor
+from app.services.model_registry import LoadedModel, get_model_registry
+from app.services.online_stats import RunningStats
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# Fraud Model Loading
+# ============================================================
+fraud_model = None
+fraud_preprocessor = FraudPreprocessor()
+
+# AI 모델 임계값 (메타데이터 best_threshold / 주의 단계)
+FRAUD_THRESHOLD = 0.955
+FRAUD_WARNING_THRESHOLD = 0.8
+
+# Category absolute cutoffs for cold start (KRW)
+CATEGORY_CUTOFFS = {
+    "식비": 5_000_000,
+    "쇼핑": 9_990_000,
+    "공과금": 5_000_000,
+    "여가": 9_990_000,
+    "문화": 9_990_000,
+    "교통": 1_000_000,
+    "의료": 9_990_000,
+    "교육": 5_000_000,
+    "기타": 9_990_000,
+}
+
+# Default cutoff if category not matched
+DEFAULT_CUTOFF = 9_990_000
+
+def _on_fraud_model_swap(loaded: LoadedModel):
+    global fraud_model
+    fraud_model = loaded.model
+
+
+def load_fraud_model():
+    """
+    Load the XGBoost Fraud Detection Model from the model registry.
+    Later versions are hot-swapped by the registry (see services/model_registry.py).
+    """
+    get_model_registry().load("fraud")
+
+# Keep fraud_model in sync with the registry (initial load happens on prewarm or the first worker run)
+get_model_registry().subscribe("fraud", _on_fraud_model_swap)
+
+# ============================================================
+# Feature Calculation & Heuristics
+# ============================================================
+
+# 버스트(짧은 시간 내 연속 거래) 판정 구간
+BURST_WINDOW = timedelta(minutes=10)
+
+def build_user_time_index(txs: List[Transaction]) -> dict[int, List[datetime]]:
+    """
+    사용자별 거래 시각을 정렬해 둔 인덱스 (스캔 시작 시 한 번 생성)
+    Returns: {user_id: [transaction_time, ...] (오름차순)}
+    """
+    index: dict[int, List[datetime]] = {}
+    for t in txs:
+        index.setdefault(t.user_id, []).append(t.transaction_time)
+    for times in index.values():
+        times.sort()
+    return index
+
+def count_burst_neighbors(current_time: datetime, user_times: List[datetime]) -> int:
+    """
+    정렬된 user_times 중 current_time 기준 ±10분(미만) 안의 다른 거래 수 (이분 탐색, O(log n))
+    user_times에는 현재 거래의 시각도 포함되어 있어야 합니다.
+    """
+    lo = bisect_right(user_times, current_time - BURST_WINDOW)
+    hi = bisect_left(user_times, current_time + BURST_WINDOW)
+    return max(hi - lo - 1, 0)  # 자기 자신 제외
+
+def calculate_features(tx: Transaction, avg_amt: float, user_times: List[datetime]) -> dict:
+    """
+    ML 모델 및 히리스틱에 사용할 피쳐 계산
+    user_times: 같은 사용자의 거래 시각 (build_user_time_index 결과, 오름차순)
+    """
+    features = {}
+    
+    # 1. Amount Z-Score-like (Simple Ratio)
+    # Fix TypeError: Decimal vs Float
+    amt_val = float(tx.amount)
+    # If avg_amt is 0 (first time in category), ratio is 1.0 (Normal)
+    features['amt_ratio'] = (amt_val / avg_amt) if avg_amt > 0 else 1.0
+    
+    # 2. Time Features
+    hour = tx.transaction_time.hour
+    features['is_night'] = 1 if 0 <= hour < 5 else 0
+    
+    # 3. Burst Detection (Same merchant in short time)
+    features['burst_count'] = count_burst_neighbors(tx.transaction_time, user_times)
+    
+    # 4. Keyword Checks
+    merchant = tx.merchant_name or ""
+    features['is_gangnam'] = 1 if "강남" in merchant else 0
+    features['is_foreign'] = 1 if tx.currency != 'KRW' else 0
+    
+    return features
+
+def apply_heuristics(tx: Transaction, features: dict) -> tuple[Optional[str], Optional[str]]:
+    """
+    Apply statistical rules.
+    Only one rule: Average Amount Deviation (Ratio)
+    """
+    # Single Rule: Ratio Check (Leave-One-Out Average)
+    # Threshold: 100x (User requested refinement)
+    if features['amt_ratio'] >= 100.0:
+        return ("위험", f"평균액의 {features['amt_ratio']:.1f}배")
+
+    # Cold-start absolute cutoff by category
+    cat_name = (tx.category.name if tx.category else tx.merchant_name) or ""
+    cutoff = DEFAULT_CUTOFF
+    for key, val in CATEGORY_CUTOFFS.items():
+        if key in cat_name:
+            cutoff = val
+            break
+    if float(tx.amount) >= cutoff:
+        return ("위험", f"카테고리 컷오프 초과 ({cutoff:,.0f}원)")
+
+    return None, None
+
+
+# ============================================================
+# AI Model Detection
+# ============================================================
+
+def detect_fraud_with_model(
+    tx: Transaction,
+    history: List[Transaction],
+    amount_stats: Optional[RunningStats] = None
+) -> tuple[str, str]:
+    """
+    ML 모델 기반 이상 탐지
+    amount_stats: history 금액의 누적 통계 (주어지면 history를 다시 순회하지 않음)
+    Returns: (risk_level, reason)
+    """
+    if not fraud_model:
+        return ("정상", "정상")
+        
+    try:
+        # Preprocess
+        df_features = fraud_preprocessor.preprocess_transaction(tx, history, amount_stats)
+        
+        # Ensure columns match model expectation (simple check/padding if needed)
+        # XGBoost handles missing columns often, but order matters if no feature names.
+        # Our preprocessor ensures names match metadata.
+        
+        # Predict Probability
+        # Assuming model supports predict_proba
+        if hasattr(fraud_model, "predict_proba"):
+            probs = fraud_model.predict_proba(df_features)
+            # Binary classification: [prob_normal, prob_fraud]
+            fraud_prob = probs[0][1]
+            
+            # Threshold from metadata is 0.955, but that might be conservative/aggressive.
+            # strict (high precision) vs loose (high recall).
+            # Metadata says best_threshold 0.955 for F1 0.753.
+            threshold = FRAUD_THRESHOLD
+            
+            if fraud_prob >= threshold:
+                return ("위험", f"AI 모델 탐지 (확률 {(fraud_prob*100):.1f}%)")
+            elif fraud_prob >= FRAUD_WARNING_THRESHOLD: # Lower threshold for warning
+                return ("주의", f"AI 모델 의심 (확률 {(fraud_prob*100):.1f}%)")
+                
+        else:
+            # Fallback to hard prediction
+            pred = fraud_model.predict(df_features)
+            if pred[0] == 1:
+                return ("위험", "AI 모델 탐지")
+                
+    except Exception as e:
+        logger.error(f"Error in AI fraud detection: {e}")
+        # Fail safe
+        return ("정상", "정상")
+        
+    return ("정상", "정상")
+
+
+def detect_fraud_batch(
+    txs: List[Transaction],
+    amount_stats: Optional[List[Optional[RunningStats]]] = None,
+    histories: Optional[List[List[float]]] = None
+) -> List[tuple[str, str]]:
+    """
+    ML 모델 기반 이상 탐지 (배치)
+
+    모든 후보 거래의 피처 행렬을 한 번에 만들고 predict_proba 한 번으로 점수를 계산한 뒤,
+    임계값(0.955 / 0.8)을 배열 단위로 적용합니다.
+
+    Args:
+        txs: 검사할 거래 목록
+        amount_stats: 각 거래 사용자의 금액 누적 통계 (txs와 같은 순서).
+            histories 없이 호출하면 detect_fraud_with_model과 같은 근사 피처를 사용합니다.
+        histories: 각 거래 직전 거래 금액 (오래된 순, txs와 같은 순서).
+            주어지면 preprocess_batch로 실제 3/5/10 롤링 z-score, IQR z-score, 순위 백분위를 계산합니다.
+    Returns: [(risk_level, reason), ...] (txs와 같은 순서)
+    """
+    normal = [("정상", "정상")] * len(txs)
+    if not fraud_model or not txs:
+        return normal
+
+    try:
+        if histories is not None:
+            df_features = fraud_preprocessor.preprocess_batch(txs, histories)
+        else:
+            df_features = fraud_preprocessor.preprocess_transactions(txs, amount_stats or [None] * len(txs))
+
+        if hasattr(fraud_model, "predict_proba"):
+            fraud_probs = fraud_model.predict_proba(df_features)[:, 1]
+            risk_mask = fraud_probs >= FRAUD_THRESHOLD
+            warn_mask = ~risk_mask & (fraud_probs >= FRAUD_WARNING_THRESHOLD)
+
+            results = list(normal)
+            for i in np.flatnonzero(risk_mask):
+                results[i] = ("위험", f"AI 모델 탐지 (확률 {(fraud_probs[i]*100):.1f}%)")
+            for i in np.flatnonzero(warn_mask):
+                results[i] = ("주의", f"AI 모델 의심 (확률 {(fraud_probs[i]*100):.1f}%)")
+            return results
+
+        # Fallback to hard prediction
+        preds = np.asarray(fraud_model.predict(df_features))
+        return [("위험", "AI 모델 탐지") if p == 1 else ("정상", "정상") for p in preds]
+
+    except Exception as e:
+        logger.error(f"Error in batch AI fraud detection: {e}")
+        # Fail safe
+        return normal
+
+
+# ============================================================
+# Incremental Detection (Background Worker)
+# ============================================================
+
+# admin_settings 하이워터마크 키
+# 값(JSON): {"last_id": 마지막으로 검사한 transactions.id, "gaps": [[from_id, to_id, wait_txid], ...]}
+#   gaps: (from_id, to_id] 범위를 검사할 때 ID 빈칸이 있었던 구간. wait_txid 미만 트랜잭션이
+#   모두 끝나면(빈칸이 늦게 커밋되었거나 롤백으로 확정) 범위를 다시 검사하고 목록에서 제거
+#   (이전 버전의 정수 값도 last_id로 읽음)
+HIGH_WATER_MARK_KEY = "anomaly_detection.last_transaction_id"
+
+# 진행 중인 트랜잭션 중 가장 오래된 txid / 아직 할당되지 않은 첫 txid (epoch 포함 64비트)
+OLDEST_RUNNING_TXID_SQL = text("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+NEXT_TXID_SQL = text("SELECT txid_snapshot_xmax(txid_current_snapshot())")
+
+# 최초 실행 시 검사 범위 (기존 GET /anomalies 기본 조회 기간과 동일)
+INITIAL_LOOKBACK_DAYS = 60
+
+# 사용자별로 기준 시각 이전 최근 N건 (idx_transactions_user_time 인덱스를 LIMIT 건만 읽음)
+PRIOR_TRANSACTIONS_SQL = text("""
+    SELECT k.user_id, r.id, r.amount, r.transaction_time
+    FROM unnest(CAST(:user_ids AS BIGINT[]), CAST(:before AS TIMESTAMPTZ[])) AS k(user_id, before)
+    CROSS JOIN LATERAL (
+        SELECT t.id, t.amount, t.transaction_time
+        FROM transactions t
+        WHERE t.user_id = k.user_id
+          AND t.transaction_time < k.before
+        ORDER BY t.transaction_time DESC
+        LIMIT :limit
+    ) r
+""")
+
+# 카테고리별 최근 평균에 사용하는 거래 수 (Leave-One-Out, 조회는 feature_store.RECENT_WINDOW_SIZE=31건)
+RECENT_AVG_SIZE = 30
+
+
+def _load_mark(value: Optional[str]) -> Tuple[int, List[list]]:
+    """하이워터마크 값 → (last_id, gaps)"""
+    mark = json.loads(value) if value else 0
+    if isinstance(mark, dict):
+        return int(mark.get("last_id") or 0), list(mark.get("gaps") or [])
+    return int(mark), []
+
+
+def _dump_mark(last_id: int, gaps: List[list]) -> str:
+    return json.dumps({"last_id": last_id, "gaps": gaps})
+
+
+def _first_gap(last_id: int, tx_ids: List[int]) -> Optional[int]:
+    """(last_id, tx_ids[-1]] 범위에서 처음 비어 있는 ID 직전 값 (빈칸 없으면 None, tx_ids는 오름차순)"""
+    previous = last_id
+    for tx_id in tx_ids:
+        if tx_id != previous + 1:
+            return previous
+        previous = tx_id
+    return None
+
+
+async def _lock_high_water_mark(db: AsyncSession) -> Optional[AdminSettings]:
+    """
+    하이워터마크 행을 잠금 (SELECT ... FOR UPDATE SKIP LOCKED)
+
+    여러 워커/프로세스가 동시에 실행되어도 한 곳만 배치를 처리합니다.
+    Returns: 잠근 설정 행 (다른 워커가 처리 중이면 None)
+    """
+    result = await db.execute(
+        select(AdminSettings)
+        .where(AdminSettings.key == HIGH_WATER_MARK_KEY)
+        .with_for_update(skip_locked=True)
+    )
+    row = result.scalar_one_or_none()
+    if row is not None:
+        return row
+
+    # 최초 실행: 조회 기간 이전 거래는 건너뛰도록 시작 위치를 잡고 행 생성
+    start_date = datetime.now() - timedelta(days=INITIAL_LOOKBACK_DAYS)
+    initial_id = (await db.execute(
+        select(Transaction.id)
+        .where(Transaction.transaction_time < start_date)
+        .order_by(Transaction.id.desc())
+        .limit(1)
+    )).scalar_one_or_none() or 0
+    await db.execute(
+        pg_insert(AdminSettings)
+        .values(key=HIGH_WATER_MARK_KEY, value=_dump_mark(initial_id, []))
+        .on_conflict_do_nothing(index_elements=[AdminSettings.key])
+    )
+    result = await db.execute(
+        select(AdminSettings)
+        .where(AdminSettings.key == HIGH_WATER_MARK_KEY)
+        .with_for_update(skip_locked=True)
+    )
+    return result.scalar_one_or_none()
+
+
+def _recent_entries(txs: List[Transaction]) -> dict[CategoryKey, list]:
+    """거래를 최근 거래 캐시 병합용 (사용자, 카테고리)별 (id, 금액, 시각) 목록으로 묶음"""
+    entries: dict[CategoryKey, list] = {}
+    for tx in txs:
+        entries.setdefault((tx.user_id, tx.category_id or 0), []).append(
+            (tx.id, float(tx.amount), tx.transaction_time)
+        )
+    return entries
+
+
+async def _load_user_history(db: AsyncSession, txs: List[Transaction]):
+    """
+    배치 거래의 탐지용 이력을 조회 (전체 이력이 아닌 필요한 범위만)
+
+    Returns:
+        recent_history: {(user_id, category_key): [(id, amount, time), ...]} (최신순, 최대 31건)
+        tx_histories: {transaction_id: [amount, ...]} (해당 거래 직전 최대 10건, 오래된 순, AI 모델 롤링 피처용)
+        user_time_index: {user_id: [transaction_time, ...]} (배치 시간 범위 ±10분, 버스트 판정용, 오름차순)
+    """
+    user_ids = list({tx.user_id for tx in txs})
+
+    # 1. 사용자/카테고리별 최근 31건 (캐시 또는 LATERAL 쿼리)
+    recent_history = await get_recent_category_history(
+        db, _recent_entries(txs), use_cache=settings.anomaly_history_mode == "cached"
+    )
+
+    # 2. 사용자별 거래 흐름: 배치 시간 범위 ± 버스트 구간 + 그 이전 최근 HISTORY_WINDOW건
+    times = [tx.transaction_time for tx in txs]
+    window_res = await db.execute(
+        select(Transaction.user_id, Transaction.id, Transaction.amount, Transaction.transaction_time)
+        .where(Transaction.user_id.in_(user_ids))
+        .where(Transaction.transaction_time > min(times) - BURST_WINDOW)
+        .where(Transaction.transaction_time < max(times) + BURST_WINDOW)
+    )
+    first_times: dict[int, datetime] = {}
+    for tx in txs:
+        if tx.user_id not in first_times or tx.transaction_time < first_times[tx.user_id]:
+            first_times[tx.user_id] = tx.transaction_time
+    prior_res = await db.execute(PRIOR_TRANSACTIONS_SQL, {
+        "user_ids": list(first_times),
+        "before": list(first_times.values()),
+        "limit": HISTORY_WINDOW,
+    })
+
+    user_rows: dict[int, dict[int, tuple[datetime, int, float]]] = {}
+    for uid, tx_id, amount, tx_time in [*window_res.all(), *prior_res.all()]:
+        user_rows.setdefault(uid, {})[tx_id] = (tx_time, tx_id, float(amount))
+    for tx in txs:
+        user_rows.setdefault(tx.user_id, {})[tx.id] = (tx.transaction_time, tx.id, float(tx.amount))
+
+    tx_histories: dict[int, List[float]] = {}
+    user_time_index: dict[int, List[datetime]] = {}
+    for uid, rows in user_rows.items():
+        ordered = sorted(rows.values())
+        user_time_index[uid] = [tx_time for tx_time, _, _ in ordered]
+        position = {tx_id: i for i, (_, tx_id, _) in enumerate(ordered)}
+        for tx in txs:
+            if tx.user_id == uid:
+                i = position[tx.id]
+                tx_histories[tx.id] = [amount for _, _, amount in ordered[max(i - HISTORY_WINDOW, 0):i]]
+
+    return recent_history, tx_histories, user_time_index
+
+
+async def detect_anomalies(db: AsyncSession, txs: List[Transaction]) -> List[dict]:
+    """
+    거래 목록에서 이상거래를 탐지하여 anomalies INSERT용 행으로 반환
+
+    1단계 휴리스틱 → 2단계 휴리스틱을 통과한 거래 전체를 AI 모델로 배치 점수 계산
+    txs는 category가 로드되어 있어야 합니다.
+    """
+    if not txs:
+        return []
+
+    recent_history, tx_histories, user_time_index = await _load_user_history(db, txs)
+
+    # 1단계: 휴리스틱 판정 (모델 검사가 필요한 거래는 모아 두었다가 배치로 점수 계산)
+    scan_results = []  # (tx, risk, reason)
+    model_candidates = []  # scan_results 인덱스
+    for tx in txs:
+        # Recent 30 Avg per category, Leave-One-Out
+        history_list = recent_history.get((tx.user_id, tx.category_id or 0), [])
+        recent_amts = [amt for tid, amt, _ in history_list if tid != tx.id][:RECENT_AVG_SIZE]
+
+        if not recent_amts:
+            # No history other than self -> Cold Start (Ratio 1.0)
+            avg_amt = float(tx.amount) if tx.amount else 1.0
+        else:
+            avg_amt = sum(recent_amts) / len(recent_amts)
+        if avg_amt == 0:
+            avg_amt = 1.0
+
+        features = calculate_features(tx, avg_amt, user_time_index.get(tx.user_id, [tx.transaction_time]))
+        risk, reason = apply_heuristics(tx, features)
+
+        if risk == "정상" or risk is None:
+            model_candidates.append(len(scan_results))
+        scan_results.append((tx, risk, reason))
+
+    # 2단계: 휴리스틱에 걸리지 않은 거래 전체를 predict_proba 한 번으로 점수 계산
+    model_txs = [scan_results[i][0] for i in model_candidates]
+    # 전처리 + predict_proba는 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    model_results = await asyncio.to_thread(
+        detect_fraud_batch, model_txs, histories=[tx_histories.get(t.id, []) for t in model_txs]
+    )
+    for i, (risk, reason) in zip(model_candidates, model_results):
+        scan_results[i] = (scan_results[i][0], risk, reason)
+
+    return [
+        {
+            "user_id": tx.user_id,
+            "transaction_id": tx.id,
+            "reason": reason[:255] if reason else "System Detected",
+            "severity": risk,
+            "is_resolved": False,
+        }
+        for tx, risk, reason in scan_results
+        if risk != "정상" and risk is not None
+    ]
+
+
+async def process_new_transactions(db: AsyncSession, batch_size: Optional[int] = None) -> Optional[int]:
+    """
+    하이워터마크 이후 거래 한 배치를 검사하고 이상거래를 일괄 저장
+
+    탐지 결과 INSERT와 하이워터마크 갱신을 같은 트랜잭션으로 커밋하므로
+    실패 시 해당 배치는 다음 실행에서 다시 검사됩니다.
+
+    ID는 INSERT 시점에 할당되고 커밋 순서는 다를 수 있으므로(대량 등록/COPY가 오래 걸리는 경우 등),
+    검사한 범위에 ID 빈칸이 있으면 (빈칸 직전 ID, 마지막 ID] 구간과 현재 다음 txid를 gaps에 기록합니다.
+    이후 실행에서 가장 오래된 진행 중 txid가 그 값 이상이 되면 당시 진행 중이던 트랜잭션이 모두
+    커밋/롤백된 것이므로 구간을 다시 검사합니다. 이미 anomalies에 등록된 거래는 제외하므로 중복 저장되지 않습니다.
+
+    Returns:
+        검사한 거래 수 (새 거래 + 다시 검사한 구간), 다른 워커가 처리 중이면 None
+    """
+    batch_size = batch_size or settings.anomaly_detection_batch_size
+
+    hwm = await _lock_high_water_mark(db)
+    if hwm is None:
+        await db.rollback()
+        return None
+    last_id, gaps = _load_mark(hwm.value)
+
+    # 1. 빈칸 구간 중 당시 진행 중이던 트랜잭션이 모두 끝난 구간은 다시 검사
+    oldest_running = (await db.execute(OLDEST_RUNNING_TXID_SQL)).scalar_one()
+    settled = [gap for gap in gaps if oldest_running >= gap[2]]
+    gaps = [gap for gap in gaps if oldest_running < gap[2]]
+    txs: List[Transaction] = []
+    if settled:
+        txs = list((await db.execute(
+            select(Transaction)
+            .where(or_(*[and_(Transaction.id > lo, Transaction.id <= hi) for lo, hi, _ in settled]))
+            .options(selectinload(Transaction.category))
+            .order_by(Transaction.id)
+        )).scalars().all())
+
+    # 2. 하이워터마크 이후 새 거래
+    new_txs = list((await db.execute(
+        select(Transaction)
+        .where(Transaction.id > last_id)
+        .options(selectinload(Transaction.category))
+        .order_by(Transaction.id)
+        .limit(batch_size)
+    )).scalars().all())
+    if not txs and not new_txs:
+        if settled:
+            hwm.value = _dump_mark(last_id, gaps)
+            await db.commit()
+        else:
+            await db.rollback()
+        return 0
+
+    seen = {tx.id for tx in txs}
+    txs += [tx for tx in new_txs if tx.id not in seen]
+
+    # 이미 이상거래로 등록된 거래(사용자 신고, 거래 등록 시 탐지, 이전 실행 등)는 제외
+    tx_ids = [tx.id for tx in txs]
+    existing = set((await db.execute(
+        select(Anomaly.transaction_id).where(Anomaly.transaction_id.in_(tx_ids))
+    )).scalars().all())
+    rows = await detect_anomalies(db, [tx for tx in txs if tx.id not in existing])
+
+    # 제외한 거래도 최근 거래 캐시에는 병합 (빠지면 이후 거래의 최근 평균이 계속 틀어짐)
+    skipped = [tx for tx in txs if tx.id in existing]
+    if skipped and settings.anomaly_history_mode == "cached":
+        await get_recent_category_history(db, _recent_entries(skipped))
+
+    if rows:
+        await db.execute(insert(Anomaly), rows)
+    if new_txs:
+        new_ids = [tx.id for tx in new_txs]
+        gap_from = _first_gap(last_id, new_ids)
+        if gap_from is not None:
+            # 검사 쿼리 이후의 스냅샷으로 기록 (빈칸 ID를 할당받은 트랜잭션이 모두 이 값 미만이 되도록)
+            gaps.append([gap_from, new_ids[-1], (await db.execute(NEXT_TXID_SQL)).scalar_one()])
+        last_id = new_ids[-1]
+    hwm.value = _dump_mark(last_id, gaps)
+    await db.commit()
+
+    logger.info(
+        f"Anomaly detection: scanned {len(txs)} transactions (mark at id={last_id}, "
+        f"pending gaps={len(gaps)}), detected {len(rows)}"
+    )
+    return len(txs)
+
+
+async def detect_transaction(db: AsyncSession, transaction_id: int) -> Optional[dict]:
+    """
+    거래 1건을 즉시 검사하고 이상거래면 저장 (단일 거래 등록 API용)
+
+    등록 직후 탐지 결과를 확인하는 클라이언트(앱 거래 추가 화면)가 워커 실행을 기다리지 않도록
+    요청 안에서 검사합니다. 워커 배치와 같은 거래를 동시에 검사하지 않도록 하이워터마크 행을
+    잠근 뒤(진행 중인 배치가 끝날 때까지 대기) 기존 등록 여부를 확인하므로 중복 저장되지 않고,
+    워커가 나중에 이 거래를 다시 만나도 anomalies에 있으면 건너뜁니다.
+
+    Returns: 저장한(또는 이미 등록된) anomalies 행 값 (정상이면 None)
+    """
+    if fraud_model is None:
+        await asyncio.to_thread(load_fraud_model)
+
+    await db.execute(
+        select(AdminSettings.key).where(AdminSettings.key == HIGH_WATER_MARK_KEY).with_for_update()
+    )
+    existing = (await db.execute(
+        select(Anomaly).where(Anomaly.transaction_id == transaction_id).limit(1)
+    )).scalar_one_or_none()
+    if existing is not None:
+        await db.rollback()
+        return {"severity": existing.severity, "reason": existing.reason}
+
+    tx = (await db.execute(
+        select(Transaction).where(Transaction.id == transaction_id).options(selectinload(Transaction.category))
+    )).scalar_one_or_none()
+    if tx is None:
+        await db.rollback()
+        return None
+
+    rows = await detect_anomalies(db, [tx])
+    if rows:
+        await db.execute(insert(Anomaly), rows)
+    await db.commit()  # 최근 거래 캐시 갱신도 함께 커밋
+    return rows[0] if rows else None
+
+
+async def run_anomaly_detection(db: AsyncSession, max_batches: Optional[int] = None) -> int:
+    """
+    새 거래가 없을 때까지 배치 처리 반복
+
+    Returns: 검사한 전체 거래 수
+    """
+    if fraud_model is None:
+        # 모델 파일 로드는 블로킹이므로 스레드에서 실행
+        await asyncio.to_thread(load_fraud_model)
+
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        scanned = await process_new_transactions(db)
+        if not scanned:
+            break
+        total += scanned
+        batches += 1
+    return total
@@ -0,0 +1,129 @@
+"""
+카테고리 레지스트리 (프로세스 내 캐시)
+
+categories 테이블은 거의 바뀌지 않으므로 한 번 읽어 메모리에 두고
+거래 등록/일괄 등록/분석/리포트에서 요청마다 select(Category)를 하지 않도록 합니다.
+
+- 조회: name -> id, id -> name, code -> id
+- 갱신: CATEGORY_CACHE_TTL_SECONDS가 지나면 다음 조회 때 다시 로드, 또는 invalidate() 호출 시 즉시
+- 스냅샷은 통째로 교체되므로 조회 중에 내용이 바뀌지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.db.model.transaction import Category
+
+logger = logging.getLogger(__name__)
+
+# 매핑되지 않는 카테고리의 기본값 (거래 목록/분석 화면과 동일)
+DEFAULT_CATEGORY_NAME = "기타"
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    """카테고리 매핑 스냅샷"""
+    by_name: Dict[str, int]
+    by_id: Dict[int, str]
+    by_code: Dict[str, int]
+    loaded_at: float
+
+    def resolve_id(self, name: Optional[str], fallback: Optional[str] = DEFAULT_CATEGORY_NAME) -> Optional[int]:
+        """카테고리명 -> id (없으면 fallback 카테고리 id, 그것도 없으면 None)"""
+        category_id = self.by_name.get(name) if name else None
+        if category_id is None and fallback:
+            category_id = self.by_name.get(fallback)
+        return category_id
+
+    def name_of(self, category_id: Optional[int], default: Optional[str] = DEFAULT_CATEGORY_NAME) -> Optional[str]:
+        """카테고리 id -> 이름 (없으면 default)"""
+        if category_id is None:
+            return default
+        return self.by_id.get(category_id, default)
+
+
+class CategoryRegistry:
+    """TTL 기반 카테고리 캐시 (get()은 필요할 때만 DB 조회)"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self, snapshot: Optional[CategorySnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+
+    async def get(self, db: AsyncSession) -> CategorySnapshot:
+        """현재 스냅샷 반환 (만료/무효화 상태면 db 세션으로 다시 로드)"""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        async with self._lock:
+            # 대기 중 다른 요청이 이미 로드했으면 그대로 사용
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            return await self.load(db)
+
+    async def load(self, db: AsyncSession) -> CategorySnapshot:
+        result = await db.execute(select(Category.id, Category.code, Category.name))
+        rows = result.all()
+        snapshot = CategorySnapshot(
+            by_name={name: cat_id for cat_id, _, name in rows},
+            by_id={cat_id: name for cat_id, _, name in rows},
+            by_code={code: cat_id for cat_id, code, _ in rows},
+            loaded_at=time.monotonic(),
+        )
+        self._snapshot = snapshot
+        logger.info(f"Category registry loaded: {len(rows)} categories")
+        return snapshot
+
+    def invalidate(self):
+        """다음 get()에서 다시 로드 (카테고리 추가/수정 후 호출)"""
+        self._snapshot = None
+
+
+def sum_by_category_name(
+    rows: Iterable,
+    categories: CategorySnapshot,
+    default: Optional[str] = DEFAULT_CATEGORY_NAME,
+) -> List[Tuple[Optional[str], float, int]]:
+    """
+    category_id별 (id, 합계, 건수) 집계를 카테고리명 기준으로 합산 (합계 내림차순)
+
+    GROUP BY category_id 결과에 categories 조인 없이 이름을 붙일 때 사용합니다.
+    카테고리 없는 거래는 default 이름으로 묶습니다.
+    """
+    totals: Dict[Optional[str], List] = {}
+    for category_id, total, count in rows:
+        entry = totals.setdefault(categories.name_of(category_id, default=default), [0.0, 0])
+        entry[0] += float(total or 0)
+        entry[1] += count or 0
+    return sorted(
+        ((name, total, count) for name, (total, count) in totals.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+_registry: Optional[CategoryRegistry] = None
+
+
+def get_category_registry() -> CategoryRegistry:
+    """카테고리 레지스트리 싱글톤 인스턴스 반환"""
+    global _registry
+    if _registry is None:
+        _registry = CategoryRegistry(settings.category_cache_ttl_seconds)
+    return _registry
+
+
+async def get_categories(db: AsyncSession) -> CategorySnapshot:
+    """카테고리 스냅샷 조회 (get_category_registry().get(db) 축약)"""
+    return await get_category_registry().get(db)
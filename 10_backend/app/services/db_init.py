@@ -3,7 +3,7 @@
 # - 테이블 자동 생성 (CREATE TABLE IF NOT EXISTS)
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from app.core.settings import settings
 from app.db.database import Base
 
@@ -11,6 +11,9 @@ from app.db.database import Base
 from app.db.model.user import User, LoginHistory
 from app.db.model.group import UserGroup
 from app.db.model.transaction import Transaction, Category, CouponTemplate, UserCoupon, Anomaly
+from app.db.model.user_feature_stats import UserFeatureStats, UserCategoryRecentAmounts
+from app.db.model.spend_rollup import DailySpendRollup
+from app.services.spend_rollup import spend_rollup_needs_backfill
 
 async def ensure_database_and_tables():
     """
@@ -20,7 +23,17 @@ async def ensure_database_and_tables():
         # 테이블 생성
         full_engine = create_async_engine(settings.database_url, echo=False)
         async with full_engine.begin() as conn:
+            # 거래 검색 trigram 인덱스(gin_trgm_ops)용 확장
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await conn.run_sync(Base.metadata.create_all)
+        # 새로 만든 일별 집계 테이블이 비어 있으면 안내만 함 (전체 재계산은 부팅을 막으므로 스크립트로 실행)
+        async with full_engine.connect() as conn:
+            async with AsyncSession(bind=conn) as session:
+                if await spend_rollup_needs_backfill(session):
+                    print(
+                        "WARNING: daily_spend_rollup is empty but transactions exist - "
+                        "run `python scripts/backfill_spend_rollup.py` (or migrations/add_daily_spend_rollup.sql)"
+                    )
         await full_engine.dispose()
         print("RDS table verification/creation completed")
     except Exception as e:
@@ -0,0 +1,381 @@
+"""
+사용자 피처 스토어 서비스
+
+다음 소비 카테고리 예측에 필요한 사용자 통계(거래 수, 금액 RunningStats 상태, 카테고리별 거래 수,
+최근 거래)를 user_feature_stats 테이블에 누적 관리합니다.
+
+- 거래 추가 시 record_transactions()로 증분 갱신 (저장된 상태에 새 거래 통계를 병합,
+  행이 없으면 첫 조회 때 재계산)
+- 대량 삭제/재적재 시 rebuild_user_feature_stats()로 재계산
+  (두 경로는 사용자별 advisory lock으로 직렬화되어 재계산 중 커밋된 거래가 빠지지 않음)
+- 예측 시 get_user_feature_stats() + to_user_stats()로 전체 이력 조회 없이 통계 구성
+- 이상거래 탐지용 사용자/카테고리별 최근 31건은 get_recent_category_history()로 조회
+  (user_category_recent_amounts 캐시 + 캐시 미스 시 LATERAL ... LIMIT 31 쿼리)
+"""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, literal, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.model.transaction import Category, Transaction
+from app.db.model.user_feature_stats import UserCategoryRecentAmounts, UserFeatureStats
+from app.services.online_stats import RunningStats
+
+logger = logging.getLogger(__name__)
+
+# 카테고리 인코딩 (DataPreprocessor.NEXT_CATEGORY_MAP과 동일, 6: 기타)
+# preprocessing 모듈은 pandas를 로드하므로 거래 API에서 import하지 않도록 별도로 둠
+CATEGORY_CODES = {
+    '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
+    '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3,
+    '카페/간식': 4
+}
+CATEGORY_RATIO_NAMES = ['교통', '생활', '쇼핑', '식료품', '외식', '주유']
+CATEGORY_COUNT_COLUMNS = [f"category_{code}_count" for code in range(7)]
+
+# (금액, 카테고리명, 거래 시각)
+TransactionRow = Tuple[Any, Optional[str], datetime]
+
+# 이상거래 탐지 최근 평균 윈도우: 최근 30건 + 자기 자신 제외분 1건
+RECENT_WINDOW_SIZE = 31
+
+# (user_id, COALESCE(category_id, 0))
+CategoryKey = Tuple[int, int]
+# (거래 ID, 금액, 거래 시각) - 최신순으로 보관
+RecentEntry = Tuple[int, float, datetime]
+
+# 키마다 idx_transactions_user_category_time 인덱스를 LIMIT 건만 읽음 (전체 이력 전송 없음)
+RECENT_CATEGORY_HISTORY_SQL = text("""
+    SELECT k.user_id, k.category_key, r.id, r.amount, r.transaction_time
+    FROM unnest(CAST(:user_ids AS BIGINT[]), CAST(:category_keys AS BIGINT[])) AS k(user_id, category_key)
+    CROSS JOIN LATERAL (
+        SELECT t.id, t.amount, t.transaction_time
+        FROM transactions t
+        WHERE t.user_id = k.user_id
+          AND COALESCE(t.category_id, 0) = k.category_key
+        ORDER BY t.transaction_time DESC, t.id DESC
+        LIMIT :limit
+    ) r
+""")
+
+
+# 사용자별 피처 스토어 갱신/재계산 직렬화 (트랜잭션 advisory lock, 커밋/롤백 시 해제)
+# 두 정수 키 형식: 네임스페이스 + user_id (단일 bigint 키 advisory lock과 키 공간이 겹치지 않음)
+FEATURE_STATS_LOCK_NAMESPACE = 724012
+FEATURE_STATS_LOCK_SQL = text(
+    "SELECT pg_advisory_xact_lock(:namespace, CAST(:user_id % 2147483648 AS INTEGER))"
+)
+
+
+def category_code(category_name: Optional[str]) -> int:
+    return CATEGORY_CODES.get(category_name, 6)
+
+
+def _to_decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def amount_stats(stats: UserFeatureStats) -> RunningStats:
+    """피처 스토어 행에 저장된 금액 통계 상태를 RunningStats로 복원"""
+    return RunningStats.from_state(
+        stats.tx_count, stats.amount_mean, stats.amount_m2, stats.amount_min, stats.amount_max
+    )
+
+
+def _amount_state(amount_stats: RunningStats) -> Dict[str, Any]:
+    """RunningStats를 user_feature_stats 금액 컬럼 값으로 변환"""
+    return {
+        "tx_count": amount_stats.count,
+        "amount_mean": amount_stats.mean,
+        "amount_m2": amount_stats.m2,
+        "amount_min": amount_stats.min,
+        "amount_max": amount_stats.max,
+    }
+
+
+def _aggregate_rows(rows: Iterable[TransactionRow]) -> Optional[Dict[str, Any]]:
+    """거래 행들을 저장된 통계에 한 번에 병합할 배치 통계로 합침"""
+    values: Dict[str, Any] = {
+        "amount_stats": RunningStats(),
+        **{col: 0 for col in CATEGORY_COUNT_COLUMNS},
+        "last_transaction_time": None,
+        "last_category_name": None,
+    }
+    for amount, category_name, tx_time in rows:
+        values["amount_stats"].update(amount)
+        values[CATEGORY_COUNT_COLUMNS[category_code(category_name)]] += 1
+        if values["last_transaction_time"] is None or tx_time >= values["last_transaction_time"]:
+            values["last_transaction_time"] = tx_time
+            values["last_category_name"] = category_name
+    return values if values["amount_stats"].count else None
+
+
+async def _lock_user_feature_stats(db: AsyncSession, user_id: int) -> None:
+    """
+    같은 사용자의 record_transactions()와 rebuild_user_feature_stats()를 직렬화
+
+    락이 없으면 재계산의 GROUP BY 이후 커밋된 거래가 빠질 수 있습니다
+    (record는 아직 행이 없어 건너뛰고, rebuild는 그 거래를 보지 못한 값으로 행을 만듦).
+    record는 거래 INSERT와 같은 트랜잭션에서 락을 잡으므로, rebuild는 그 거래가 커밋된 뒤에 집계하고
+    rebuild가 먼저 잡으면 record는 만들어진 행에 병합합니다.
+    """
+    await db.execute(FEATURE_STATS_LOCK_SQL, {"namespace": FEATURE_STATS_LOCK_NAMESPACE, "user_id": user_id})
+
+
+async def record_transactions(db: AsyncSession, user_id: int, rows: Iterable[TransactionRow]) -> None:
+    """
+    새로 추가된 거래를 사용자 피처 스토어에 증분 반영
+
+    호출 측 트랜잭션 안에서 실행되므로 거래 INSERT와 함께 커밋/롤백됩니다.
+    저장된 금액 통계 상태에 새 거래의 배치 통계를 RunningStats.merge()로 병합하므로
+    기존 거래 이력은 읽지 않습니다.
+    아직 통계 행이 없는 사용자는 건너뛰고, 첫 조회 때 전체 이력으로 생성합니다.
+    """
+    values = _aggregate_rows(rows)
+    if values is None:
+        return
+
+    # 행이 있을 때만 누적. 행이 없으면 get_user_feature_stats()가 전체 이력으로 재계산하므로
+    # 여기서 새 거래만 담은 행을 만들면 이후 재계산되지 않고 통계가 계속 틀어짐
+    await _lock_user_feature_stats(db, user_id)
+    # FOR UPDATE: 동시에 거래를 추가하는 요청이 같은 상태를 읽고 병합 결과를 덮어쓰지 않도록 함
+    table = UserFeatureStats
+    current = (await db.execute(
+        select(
+            table.tx_count, table.amount_mean, table.amount_m2, table.amount_min, table.amount_max,
+            *(getattr(table, col) for col in CATEGORY_COUNT_COLUMNS),
+        )
+        .where(table.user_id == user_id)
+        .with_for_update()
+    )).first()
+    if current is None:
+        return
+
+    merged = RunningStats.from_state(*current[:5]).merge(values["amount_stats"])
+    counts = current[5:]
+    # 최근 거래 비교는 DB에서 (요청 시각이 naive일 수 있어 timestamptz 변환 규칙을 그대로 따름)
+    new_time = literal(values["last_transaction_time"], type_=table.last_transaction_time.type)
+    is_newer = or_(table.last_transaction_time.is_(None), table.last_transaction_time <= new_time)
+    await db.execute(
+        update(table)
+        .where(table.user_id == user_id)
+        .values(
+            **_amount_state(merged),
+            **{col: count + values[col] for col, count in zip(CATEGORY_COUNT_COLUMNS, counts)},
+            last_transaction_time=case((is_newer, new_time), else_=table.last_transaction_time),
+            last_category_name=case((is_newer, values["last_category_name"]), else_=table.last_category_name),
+            updated_at=func.now(),
+        )
+    )
+
+
+async def rebuild_user_feature_stats(db: AsyncSession, user_id: int) -> Optional[UserFeatureStats]:
+    """
+    transactions 테이블에서 사용자 통계를 다시 계산하여 저장 (최초 조회, 대량 삭제/재적재 후)
+
+    카테고리별 GROUP BY 결과만 가져오므로 거래 행 자체는 전송하지 않습니다.
+    최근 거래 캐시는 비워 두고 다음 탐지 때 다시 채웁니다.
+    진행 중인 거래 추가와는 사용자별 advisory lock으로 직렬화됩니다 (호출 측 커밋 시 해제).
+    """
+    await _lock_user_feature_stats(db, user_id)
+    await db.execute(delete(UserCategoryRecentAmounts).where(UserCategoryRecentAmounts.user_id == user_id))
+
+    # 카테고리별 (개수, 평균, 편차제곱합, 최소, 최대)를 받아 RunningStats로 병합
+    grouped = await db.execute(
+        select(
+            Category.name,
+            func.count(Transaction.id),
+            func.avg(Transaction.amount),
+            func.var_pop(Transaction.amount) * func.count(Transaction.id),
+            func.min(Transaction.amount),
+            func.max(Transaction.amount),
+        )
+        .select_from(Transaction)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+        .group_by(Category.name)
+    )
+    total = RunningStats()
+    counts = {col: 0 for col in CATEGORY_COUNT_COLUMNS}
+    for name, count, mean, m2, min_amount, max_amount in grouped.all():
+        total.merge(RunningStats.from_state(count, mean, m2 or 0, min_amount, max_amount))
+        counts[CATEGORY_COUNT_COLUMNS[category_code(name)]] += count
+
+    if total.count == 0:
+        await reset_user_feature_stats(db, user_id)
+        return None
+
+    last = (await db.execute(
+        select(Transaction.transaction_time, Category.name)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_time.desc(), Transaction.id.desc())
+        .limit(1)
+    )).first()
+    values: Dict[str, Any] = {
+        **_amount_state(total),
+        **counts,
+        "last_transaction_time": last[0],
+        "last_category_name": last[1],
+    }
+
+    stmt = pg_insert(UserFeatureStats).values(user_id=user_id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserFeatureStats.user_id],
+        set_={**{key: stmt.excluded[key] for key in values}, "updated_at": func.now()}
+    ).returning(UserFeatureStats)
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+async def reset_user_feature_stats(db: AsyncSession, user_id: int) -> None:
+    """사용자 거래 전체 삭제 시 피처 스토어도 비움"""
+    await db.execute(delete(UserFeatureStats).where(UserFeatureStats.user_id == user_id))
+    await db.execute(delete(UserCategoryRecentAmounts).where(UserCategoryRecentAmounts.user_id == user_id))
+
+
+async def get_user_feature_stats(db: AsyncSession, user_id: int) -> Optional[UserFeatureStats]:
+    """
+    사용자 피처 스토어 조회 (없으면 거래 이력으로 한 번 생성)
+
+    Returns:
+        UserFeatureStats 또는 거래가 없으면 None
+    """
+    result = await db.execute(select(UserFeatureStats).where(UserFeatureStats.user_id == user_id))
+    stats = result.scalar_one_or_none()
+    if stats is None:
+        stats = await rebuild_user_feature_stats(db, user_id)
+    return stats
+
+
+def to_user_stats(stats: UserFeatureStats) -> Dict[str, Any]:
+    """
+    피처 스토어 행을 DataPreprocessor._calculate_user_stats()와 같은 형식으로 변환
+    """
+    n = stats.tx_count
+    running = amount_stats(stats)
+    # 표본 표준편차 (ddof=1, pandas std와 동일)
+    std_amount = running.std() if n > 1 else 0
+
+    counts = [getattr(stats, col) for col in CATEGORY_COUNT_COLUMNS]
+    # 최빈 카테고리: 개수가 같으면 작은 코드 우선 (Series.mode()[0]과 동일)
+    fav_category = min(range(len(counts)), key=lambda code: (-counts[code], code))
+
+    return {
+        "avg_amount": running.mean,
+        "std_amount": std_amount,
+        "tx_count": n,
+        "fav_category": fav_category,
+        "category_count": sum(1 for c in counts if c > 0),
+        "category_ratios": {name: counts[code] / n for code, name in enumerate(CATEGORY_RATIO_NAMES)},
+    }
+
+
+async def fetch_recent_category_history(
+    db: AsyncSession, keys: Iterable[CategoryKey]
+) -> Dict[CategoryKey, List[RecentEntry]]:
+    """
+    (사용자, 카테고리)별 최근 RECENT_WINDOW_SIZE건을 DB에서 조회 (LATERAL ... LIMIT)
+
+    전송량은 키 수 × 31행으로 제한됩니다.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    user_ids, category_keys = zip(*keys)
+    result = await db.execute(
+        RECENT_CATEGORY_HISTORY_SQL,
+        {"user_ids": list(user_ids), "category_keys": list(category_keys), "limit": RECENT_WINDOW_SIZE}
+    )
+    history: Dict[CategoryKey, List[RecentEntry]] = {key: [] for key in keys}
+    for user_id, category_key, tx_id, amount, tx_time in result.all():
+        history[(user_id, category_key)].append((tx_id, float(amount), tx_time))
+    return history
+
+
+def _merge_recent(entries: List[RecentEntry], new_entries: List[RecentEntry]) -> List[RecentEntry]:
+    """최근 거래 목록에 새 거래를 병합 (ID 중복 제거, 최신순 상위 RECENT_WINDOW_SIZE건)"""
+    seen = {entry[0] for entry in entries}
+    merged = entries + [entry for entry in new_entries if entry[0] not in seen]
+    merged.sort(key=lambda entry: (entry[2], entry[0]), reverse=True)
+    return merged[:RECENT_WINDOW_SIZE]
+
+
+async def get_recent_category_history(
+    db: AsyncSession,
+    new_entries: Dict[CategoryKey, List[RecentEntry]],
+    use_cache: bool = True
+) -> Dict[CategoryKey, List[RecentEntry]]:
+    """
+    이상거래 탐지 배치의 (사용자, 카테고리)별 최근 거래 목록
+
+    Args:
+        new_entries: 이번 배치에서 검사할 거래 (키별)
+        use_cache: True면 user_category_recent_amounts 캐시를 읽고 병합 결과를 다시 저장,
+            False면 매번 LATERAL 쿼리로 조회 (캐시 테이블 미사용)
+    Returns:
+        {키: [(거래 ID, 금액, 거래 시각), ...]} (최신순, 최대 RECENT_WINDOW_SIZE건)
+    """
+    keys = list(new_entries)
+    if not keys:
+        return {}
+
+    history: Dict[CategoryKey, List[RecentEntry]] = {}
+    if use_cache:
+        cache = UserCategoryRecentAmounts
+        result = await db.execute(
+            select(cache.user_id, cache.category_key, cache.recent_ids, cache.recent_amounts, cache.recent_times)
+            .where(tuple_(cache.user_id, cache.category_key).in_(keys))
+        )
+        for user_id, category_key, ids, amounts, times in result.all():
+            history[(user_id, category_key)] = [
+                (tx_id, float(amount), tx_time) for tx_id, amount, tx_time in zip(ids, amounts, times)
+            ]
+
+    # 캐시 미스 키만 DB 조회 (이번 배치 거래도 이미 DB에 있으므로 병합 시 중복 제거)
+    missing = [key for key in keys if key not in history]
+    history.update(await fetch_recent_category_history(db, missing))
+
+    for key in keys:
+        history[key] = _merge_recent(history[key], new_entries[key])
+
+    if use_cache:
+        await save_recent_category_history(db, {key: history[key] for key in keys})
+    return history
+
+
+async def save_recent_category_history(db: AsyncSession, history: Dict[CategoryKey, List[RecentEntry]]) -> None:
+    """최근 거래 캐시 UPSERT (호출 측 트랜잭션과 함께 커밋)"""
+    rows = []
+    for (user_id, category_key), entries in history.items():
+        if not entries:
+            continue
+        recent_amounts = [_to_decimal(amount) for _, amount, _ in entries]
+        window = recent_amounts[:RECENT_WINDOW_SIZE - 1]
+        rows.append({
+            "user_id": user_id,
+            "category_key": category_key,
+            "recent_ids": [tx_id for tx_id, _, _ in entries],
+            "recent_amounts": recent_amounts,
+            "recent_times": [tx_time for _, _, tx_time in entries],
+            "recent_avg": sum(window) / len(window),
+        })
+    if not rows:
+        return
+
+    stmt = pg_insert(UserCategoryRecentAmounts).values(rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[UserCategoryRecentAmounts.user_id, UserCategoryRecentAmounts.category_key],
+        set_={
+            "recent_ids": stmt.excluded.recent_ids,
+            "recent_amounts": stmt.excluded.recent_amounts,
+            "recent_times": stmt.excluded.recent_times,
+            "recent_avg": stmt.excluded.recent_avg,
+            "updated_at": func.now(),
+        }
+    ))
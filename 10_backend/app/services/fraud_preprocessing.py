@@ -2,8 +2,21 @@ import pandas as pd
 import numpy as np
 import math
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Sequence, Union
 from app.db.model.transaction import Transaction
+from app.services.online_stats import RunningStats
+
+# Rolling windows of the training features (amount_log_z3 / z5 / z10)
+ROLLING_WINDOWS = (3, 5, 10)
+# Previous transactions per row used by preprocess_batch (z-scores, IQR z-score, rank)
+HISTORY_WINDOW = max(ROLLING_WINDOWS)
+# Spread at or below this fraction of the window's center counts as zero (constant history)
+ZERO_SPREAD_RTOL = 1e-9
+
+
+def _has_spread(spread: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """Relative zero-spread test, so rounding residue of equal amounts never becomes a z-score."""
+    return spread > ZERO_SPREAD_RTOL * np.maximum(np.abs(center), 1.0)
 
 class FraudPreprocessor:
     """
@@ -17,13 +30,21 @@ class FraudPreprocessor:
         # Here we mock 'step' as hour variance or similar.
         pass
 
-    def preprocess_transaction(self, tx: Transaction, history: List[Transaction]) -> pd.DataFrame:
+    def preprocess_transaction(
+        self,
+        tx: Transaction,
+        history: List[Transaction],
+        amount_stats: Optional[RunningStats] = None
+    ) -> pd.DataFrame:
         """
         Single transaction preprocessing.
         
         Args:
             tx: Current transaction to predict
             history: List of recent transactions (for z-score, etc.)
+            amount_stats: Precomputed running stats over the history amounts.
+                When given, the history is not rescanned (callers scoring many
+                transactions of the same user can build it once).
             
         Returns:
             DataFrame with 1 row and all required features.
@@ -54,23 +75,18 @@ class FraudPreprocessor:
         
         # Z-scores (requires history)
         # We need history of amounts to calculate mean/std
-        if not history:
-            amounts = [amount]
-        else:
-            amounts = [float(t.amount) for t in history]
-            # Ensure current tx amount is comprised if not in history
-            # But history usually implies 'past'. preprocessing should consider 'context'.
-            # If 'history' excludes 'tx', we append it for stats? 
-            # Usually Z-score is (Current - Mean_Past) / Std_Past
-            pass
-            
-        # Filter history to recent N
-        # This is a simplified calculation. Real-time system might need Redis.
-        past_amounts = np.array(amounts)
+        if amount_stats is None or amount_stats.count == 0:
+            if not history:
+                amounts = [amount]
+            else:
+                amounts = [float(t.amount) for t in history]
+                # Usually Z-score is (Current - Mean_Past) / Std_Past
+            amount_stats = RunningStats.from_values(amounts)
         
         # Rolling stats (approximate with entire history provided)
-        mean = np.mean(past_amounts)
-        std = np.std(past_amounts) + 1e-9
+        # np.std 기본값과 같은 모표준편차(ddof=0)
+        mean = amount_stats.mean
+        std = amount_stats.std(ddof=0) + 1e-9
         
         features['amount_log_z3'] = (amount_log - np.log1p(mean)) / (np.log1p(std) + 1e-9) # Approximation
         features['amount_log_z5'] = features['amount_log_z3'] # Placeholder if distinct windows not avail
@@ -114,6 +130,167 @@ class FraudPreprocessor:
         # Ensure all columns from metadata exist (we'll implement robustness in loader)
         return df
 
+    def preprocess_transactions(
+        self,
+        txs: Sequence[Transaction],
+        amount_stats: Sequence[Optional[RunningStats]]
+    ) -> pd.DataFrame:
+        """
+        Batch version of preprocess_transaction: one row per transaction, built with
+        array operations so the whole batch can be scored in a single predict_proba call.
+
+        Produces the same columns, column order and values as calling
+        preprocess_transaction(tx, history, amount_stats[i]) for each tx.
+
+        Args:
+            txs: Transactions to score
+            amount_stats: Running amount stats of each transaction's history
+                (aligned with txs; None means "no history", i.e. the tx amount alone)
+        """
+        n = len(txs)
+        amount = np.fromiter((float(tx.amount) for tx in txs), dtype=np.float64, count=n)
+
+        # History stats per row (no history -> the amount itself, std 0)
+        mean = np.empty(n)
+        std = np.empty(n)
+        for i, stats in enumerate(amount_stats):
+            if stats is None or stats.count == 0:
+                mean[i], std[i] = amount[i], 0.0
+            else:
+                mean[i], std[i] = stats.mean, stats.std(ddof=0)
+        std += 1e-9
+
+        amount_log = np.log1p(np.abs(amount))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            amount_log_z = (amount_log - np.log1p(mean)) / (np.log1p(std) + 1e-9)
+
+        return self._build_frame(
+            txs, amount, amount_log,
+            z3=amount_log_z, z5=amount_log_z, z10=amount_log_z,
+            iqr_z=np.zeros(n, dtype=np.int64), rank_pct=np.full(n, 0.5)
+        )
+
+    def preprocess_batch(
+        self,
+        transactions: Sequence[Transaction],
+        histories: Sequence[Sequence[Union[Transaction, float]]]
+    ) -> pd.DataFrame:
+        """
+        Batch preprocessing with true rolling-window amount features.
+
+        Unlike preprocess_transaction (which approximates z5/z10 with z3 and uses
+        placeholders for the IQR z-score and rank), this computes, over each
+        transaction's previous HISTORY_WINDOW amounts:
+            - amount_log_z3/z5/z10: (amount_log - mean) / std of the last 3/5/10
+              log amounts (sample std, as pandas rolling().std())
+            - amount_log_iqr_z: (amount_log - median) / IQR of the last 10 log amounts
+            - amount_rank_pct: percentile rank of the amount among the last 10
+              amounts and itself (as pandas rank(pct=True), ties averaged)
+        Windows with fewer than 2 values (or zero spread) give 0.
+
+        The previous amounts are packed into an (N, HISTORY_WINDOW) NaN-padded
+        matrix, so the whole batch is one set of array operations.
+
+        Args:
+            transactions: Transactions to score
+            histories: Previous transactions (or amounts) of each transaction,
+                oldest first, not including the transaction itself. Only the
+                last HISTORY_WINDOW entries are used.
+
+        Returns:
+            DataFrame with one row per transaction, same columns as preprocess_transaction.
+        """
+        n = len(transactions)
+        amount = np.fromiter((float(tx.amount) for tx in transactions), dtype=np.float64, count=n)
+        amount_log = np.log1p(np.abs(amount))
+
+        # Right-aligned history matrix (most recent amount in the last column)
+        history = np.full((n, HISTORY_WINDOW), np.nan)
+        for i, prev in enumerate(histories):
+            recent = [float(getattr(h, 'amount', h)) for h in prev[-HISTORY_WINDOW:]]
+            if recent:
+                history[i, HISTORY_WINDOW - len(recent):] = recent
+        history_log = np.log1p(np.abs(history))
+
+        # Window moments on the right-aligned slices, centered before squaring
+        # (sum of squares minus n * mean^2 cancels catastrophically on log amounts)
+        z_scores = {}
+        for w in ROLLING_WINDOWS:
+            window = history_log[:, -w:]
+            valid = ~np.isnan(window)
+            cnt = valid.sum(axis=1)
+            mean = np.where(valid, window, 0.0).sum(axis=1) / np.maximum(cnt, 1)
+            centered = np.where(valid, window - mean[:, None], 0.0)
+            std = np.sqrt((centered * centered).sum(axis=1) / np.maximum(cnt - 1, 1))
+            ok = (cnt >= 2) & _has_spread(std, mean)
+            z_scores[w] = np.where(ok, (amount_log - mean) / np.where(ok, std, 1.0), 0.0)
+
+        # Robust z-score over the full window. Quantiles use linear interpolation
+        # (numpy/pandas default) on row-sorted values; NaN padding sorts to the end.
+        n_hist = np.sum(~np.isnan(history_log), axis=1)
+        sorted_log = np.sort(history_log, axis=1)
+
+        def row_quantile(q):
+            pos = q * np.maximum(n_hist - 1, 0)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, np.maximum(n_hist - 1, 0))
+            lo_val = np.take_along_axis(sorted_log, lo[:, None], axis=1)[:, 0]
+            hi_val = np.take_along_axis(sorted_log, hi[:, None], axis=1)[:, 0]
+            return lo_val + (hi_val - lo_val) * (pos - lo)
+
+        q1, median, q3 = row_quantile(0.25), row_quantile(0.5), row_quantile(0.75)
+        iqr = q3 - q1
+        ok = (n_hist >= 2) & _has_spread(iqr, median)
+        iqr_z = np.where(ok, (amount_log - median) / np.where(ok, iqr, 1.0), 0.0)
+
+        # Percentile rank of the amount among history + itself (average rank for ties)
+        with np.errstate(invalid='ignore'):
+            less = np.sum(history < amount[:, None], axis=1)
+            equal = np.sum(history == amount[:, None], axis=1) + 1  # + itself
+        rank_pct = (less + (equal + 1) / 2.0) / (n_hist + 1)
+
+        return self._build_frame(
+            transactions, amount, amount_log,
+            z3=z_scores[3], z5=z_scores[5], z10=z_scores[10],
+            iqr_z=iqr_z, rank_pct=rank_pct
+        )
+
+    def _build_frame(self, txs, amount, amount_log, z3, z5, z10, iqr_z, rank_pct) -> pd.DataFrame:
+        """Assemble the 22 feature columns (order of preprocess_transaction) from per-row arrays."""
+        n = len(txs)
+        times = [tx.transaction_time for tx in txs]
+        day = np.fromiter((dt.day for dt in times), dtype=np.int64, count=n)
+        hour = np.fromiter((dt.hour for dt in times), dtype=np.int64, count=n)
+        dow = np.fromiter((dt.weekday() for dt in times), dtype=np.int64, count=n)
+
+        zeros = np.zeros(n, dtype=np.int64)
+        return pd.DataFrame({
+            'step': day * 24 + hour,
+            'day': day,
+            'hour': hour,
+            'dow': dow,
+            'hour_sin': np.sin(2 * np.pi * hour / 24.0),
+            'hour_cos': np.cos(2 * np.pi * hour / 24.0),
+            'amount_log': amount_log,
+            'amount_log_z3': z3,
+            'amount_log_z5': z5,
+            'amount_log_z10': z10,
+            'amount_log_iqr_z': iqr_z,
+            'amount_bin': np.trunc(amount / 10000).astype(np.int64),
+            'amount_rank_pct': rank_pct,
+            # Card transactions are all mapped to PAYMENT (see preprocess_transaction),
+            # so the type one-hot is constant and the type change rates are exactly 0.
+            'type_PAYMENT': np.ones(n, dtype=np.int64),
+            'type_CASH_IN': zeros,
+            'type_TRANSFER': zeros,
+            'type_CASH_OUT': zeros,
+            'type_DEBIT': zeros,
+            'type_change_rate2': zeros,
+            'type_change_rate3': zeros,
+            'type_change_rate5': zeros,
+            'type_change_rate10': zeros,
+        })
+
     def get_feature_names(self):
         # Based on metadata
         return [
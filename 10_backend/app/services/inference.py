@@ -0,0 +1,172 @@
+"""
+ML 추론 실행기
+
+카테고리 예측 모델(XGBoost)을 이벤트 루프 밖의 전용 스레드 풀에서 실행합니다.
+
+- predict / predict_proba: 업로드처럼 이미 여러 행인 입력을 풀에서 한 번에 추론
+- predict_batched: 동시에 들어온 단건 요청(/ml/predict)을 짧은 시간 창 안에서 모아
+  model.predict 한 번으로 처리하는 마이크로 배칭
+
+XGBoost는 추론 중 GIL을 놓기 때문에 프로세스 풀 없이 스레드 풀로도 병렬 처리가 됩니다.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceExecutor:
+    """
+    모델 추론 전용 스레드 풀 + 마이크로 배칭 큐
+
+    Args:
+        max_workers: 추론 스레드 수 (동시에 실행되는 배치 수 상한)
+        max_batch_size: 한 배치에 모을 최대 행 수
+        max_latency_ms: 첫 요청 이후 배치를 모으기 위해 기다리는 최대 시간
+    """
+
+    def __init__(self, max_workers: int = 2, max_batch_size: int = 64, max_latency_ms: float = 5.0):
+        self.max_workers = max_workers
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.model = None
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-inference")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+    def set_model(self, model: Any) -> None:
+        """추론에 사용할 모델 교체 (이후 배치부터 적용)"""
+        self.model = model
+
+    def _require_model(self) -> Any:
+        model = self.model
+        if model is None:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+        return model
+
+    # ---------------------------------------------------------
+    # 다건 추론 (풀에서 실행)
+    # ---------------------------------------------------------
+    async def predict(self, X: pd.DataFrame) -> np.ndarray:
+        model = self._require_model()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, model.predict, X)
+
+    async def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        model = self._require_model()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, model.predict_proba, X)
+
+    def predict_blocking(self, X: pd.DataFrame) -> np.ndarray:
+        """동기 코드(스트리밍 제너레이터 등 워커 스레드)에서 풀을 통해 추론"""
+        model = self._require_model()
+        return self._pool.submit(model.predict, X).result()
+
+    # ---------------------------------------------------------
+    # 마이크로 배칭 (단건 요청 합치기)
+    # ---------------------------------------------------------
+    async def predict_batched(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        X(보통 1행)를 배칭 큐에 넣고, 다른 동시 요청과 합쳐진 배치의 예측 결과 중 자기 몫을 반환
+        """
+        self._require_model()
+        self._ensure_batch_loop()
+        future = self._loop.create_future()
+        await self._queue.put((X, future))
+        return await future
+
+    def _ensure_batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._batch_task is None or self._batch_task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._batch_task = loop.create_task(self._batch_loop())
+
+    async def _collect_batch(self) -> List[Tuple[pd.DataFrame, asyncio.Future]]:
+        """첫 요청을 기다린 뒤 max_latency 동안 또는 max_batch_size 행이 찰 때까지 모음"""
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        deadline = self._loop.time() + self.max_latency
+
+        while rows < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _batch_loop(self) -> None:
+        while True:
+            # 모든 추론 스레드가 바쁘면 그동안 들어온 요청은 다음 배치로 더 크게 모임
+            await self._slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[pd.DataFrame, asyncio.Future]]) -> None:
+        try:
+            frames = [X for X, _ in batch]
+            X_all = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            model = self._require_model()
+            predictions = await self._loop.run_in_executor(self._pool, model.predict, X_all)
+
+            offset = 0
+            for X, future in batch:
+                n = len(X)
+                if not future.done():
+                    future.set_result(predictions[offset:offset + n])
+                offset += n
+        except Exception as e:
+            logger.error(f"Batched inference failed ({len(batch)} requests): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._batch_task is not None and not self._batch_task.done():
+            self._batch_task.cancel()
+        self._pool.shutdown(wait=False)
+
+
+# 싱글톤 인스턴스
+_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    global _executor
+    if _executor is None:
+        _executor = InferenceExecutor(
+            max_workers=settings.ml_inference_workers,
+            max_batch_size=settings.ml_batch_max_size,
+            max_latency_ms=settings.ml_batch_max_latency_ms,
+        )
+    return _executor
+
+
+def shutdown_inference_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
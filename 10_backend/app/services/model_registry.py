@@ -0,0 +1,299 @@
+"""
+모델 레지스트리 서비스
+
+카테고리 예측 모델과 이상거래 탐지 모델을 버전별 디렉토리로 관리하고,
+요청을 끊지 않고 새 버전으로 교체(hot-swap)합니다.
+
+디렉토리 구조 (MODEL_REGISTRY_DIR, 기본: app/models/registry):
+    {name}/CURRENT                      # 현재 버전 이름 (os.replace로 원자적 교체)
+    {name}/{version}/model.ubj          # XGBoost 네이티브 부스터 (권장) 또는 model.json / model.joblib
+    {name}/{version}/model_metadata*.json
+
+- 로드: 네이티브 부스터는 XGBClassifier.load_model(), joblib은 mmap_mode='r'
+  (pickle 안의 numpy 배열은 읽기 전용 메모리 맵으로 열려 워커 프로세스 간 페이지 캐시를 공유)
+- 교체: 새 버전을 완전히 로드한 뒤 참조 하나만 바꾸므로, 진행 중인 요청은 이전 모델로 끝까지 처리됩니다.
+- 반영: 각 워커가 스케줄러 주기 작업(refresh)으로 CURRENT 변경을 감지해 스스로 교체합니다.
+- 레지스트리에 버전이 없으면 기존 위치의 모델 파일(legacy)을 로드합니다.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.lazy_imports import lazy_import
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 모델을 실제로 로드할 때만 import (레지스트리 조회/구독만 하는 모듈의 시작 시간 단축)
+joblib = lazy_import("joblib")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # /10_backend/app
+
+# 버전 디렉토리에서 찾는 모델 파일 (우선순위 순)
+MODEL_FILENAMES = ("model.ubj", "model.json", "model.joblib")
+CURRENT_FILENAME = "CURRENT"
+LEGACY_VERSION = "legacy"
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """레지스트리에 등록된 모델 정의"""
+    name: str
+    metadata_filename: str
+    legacy_model_path: str
+    legacy_metadata_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """로드된 모델 (교체 시 통째로 바뀌므로 모델/메타데이터/버전이 항상 일치)"""
+    name: str
+    version: str
+    model: Any
+    metadata: Dict[str, Any]
+    path: str
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+
+MODEL_SPECS = {
+    "category": ModelSpec(
+        name="category",
+        metadata_filename="model_metadata.json",
+        legacy_model_path=os.path.join(APP_DIR, "model_xgboost_acc_73.47.joblib"),
+        legacy_metadata_path=os.path.join(APP_DIR, "model_metadata.json"),
+    ),
+    "fraud": ModelSpec(
+        name="fraud",
+        metadata_filename="model_metadata_fraud.json",
+        legacy_model_path=os.path.join(APP_DIR, "models", "paysim_generic_no_flag_featplus.joblib"),
+        legacy_metadata_path=os.path.join(APP_DIR, "models", "model_metadata_fraud.json"),
+    ),
+}
+
+
+def load_model_file(path: str) -> Any:
+    """모델 파일 로드 (네이티브 XGBoost 부스터 또는 joblib 메모리 맵)"""
+    if path.endswith((".ubj", ".json")):
+        from xgboost import XGBClassifier
+
+        model = XGBClassifier()
+        model.load_model(path)
+        return model
+    return joblib.load(path, mmap_mode="r")
+
+
+def _read_json(path: Optional[str]) -> Dict[str, Any]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ModelRegistry:
+    """
+    버전 관리 + 원자적 교체 모델 레지스트리
+
+    Example:
+        registry = get_model_registry()
+        registry.subscribe("fraud", lambda loaded: ...)  # 교체 시 호출
+        registry.load("fraud")
+        registry.get("fraud").model
+    """
+
+    def __init__(self, root: str, specs: Dict[str, ModelSpec] = MODEL_SPECS):
+        self.root = root
+        self.specs = specs
+        self._models: Dict[str, LoadedModel] = {}
+        self._listeners: Dict[str, List[Callable[[LoadedModel], None]]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------
+    def get(self, name: str) -> Optional[LoadedModel]:
+        return self._models.get(name)
+
+    def current_version(self, name: str) -> Optional[str]:
+        """CURRENT 파일이 가리키는 버전 (없으면 None)"""
+        pointer = os.path.join(self.root, name, CURRENT_FILENAME)
+        try:
+            with open(pointer, "r", encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def list_versions(self, name: str) -> List[str]:
+        model_dir = os.path.join(self.root, name)
+        if not os.path.isdir(model_dir):
+            return []
+        return sorted(
+            entry for entry in os.listdir(model_dir)
+            if os.path.isdir(os.path.join(model_dir, entry)) and not entry.startswith(".")
+        )
+
+    @staticmethod
+    def is_valid_version_name(version: str) -> bool:
+        """버전 이름은 {name}/ 바로 아래 디렉토리 하나 (경로 구분자, '.'/'..', 숨김 이름 불가)"""
+        separators = [sep for sep in (os.sep, os.altsep) if sep]
+        return bool(version) and not version.startswith(".") and not any(sep in version for sep in separators)
+
+    def subscribe(self, name: str, callback: Callable[[LoadedModel], None]) -> None:
+        """모델 교체 시 호출할 콜백 등록 (이미 로드돼 있으면 즉시 한 번 호출)"""
+        self._listeners.setdefault(name, []).append(callback)
+        loaded = self._models.get(name)
+        if loaded is not None:
+            callback(loaded)
+
+    # ---------------------------------------------------------
+    # 로드 / 교체
+    # ---------------------------------------------------------
+    def _resolve(self, name: str, version: Optional[str]) -> tuple[str, str, Optional[str]]:
+        """(버전, 모델 파일 경로, 메타데이터 경로)"""
+        spec = self.specs[name]
+        if version and version != LEGACY_VERSION:
+            version_dir = os.path.join(self.root, name, version)
+            for filename in MODEL_FILENAMES:
+                path = os.path.join(version_dir, filename)
+                if os.path.exists(path):
+                    return version, path, os.path.join(version_dir, spec.metadata_filename)
+            raise FileNotFoundError(f"모델 파일이 없습니다: {version_dir}")
+        return LEGACY_VERSION, spec.legacy_model_path, spec.legacy_metadata_path
+
+    def load(self, name: str, version: Optional[str] = None) -> Optional[LoadedModel]:
+        """
+        지정 버전(기본: CURRENT, 없으면 legacy)을 로드하여 교체
+
+        로드에 실패하면 기존 모델을 그대로 유지합니다.
+        블로킹 작업이므로 이벤트 루프에서는 asyncio.to_thread로 호출하세요.
+        """
+        with self._lock:
+            try:
+                version, path, metadata_path = self._resolve(name, version or self.current_version(name))
+                if not os.path.exists(path):
+                    logger.warning(f"Model not found: {path}")
+                    return self._models.get(name)
+
+                loaded = LoadedModel(
+                    name=name,
+                    version=version,
+                    model=load_model_file(path),
+                    metadata=_read_json(metadata_path),
+                    path=path,
+                )
+            except Exception as e:
+                logger.error(f"Failed to load model '{name}': {e}")
+                return self._models.get(name)
+
+            # 참조 교체 (진행 중인 요청은 이전 LoadedModel을 계속 사용)
+            self._models[name] = loaded
+
+        for callback in self._listeners.get(name, []):
+            try:
+                callback(loaded)
+            except Exception as e:
+                logger.error(f"Model swap callback failed for '{name}': {e}")
+
+        logger.info(f"Model '{name}' loaded: version={loaded.version}, file={os.path.basename(loaded.path)}")
+        return loaded
+
+    def refresh(self) -> List[str]:
+        """
+        CURRENT가 바뀐 모델만 다시 로드 (각 워커 프로세스에서 주기적으로 호출)
+
+        Returns: 교체된 모델 이름 목록
+        """
+        swapped = []
+        for name in self.specs:
+            loaded = self._models.get(name)
+            target = self.current_version(name) or LEGACY_VERSION
+            if loaded is not None and loaded.version == target:
+                continue
+            if loaded is None and target == LEGACY_VERSION:
+                continue  # 아직 한 번도 로드하지 않은 모델은 시작 시 로드에 맡김
+            new = self.load(name)
+            if new is not None and new is not loaded:
+                swapped.append(name)
+        return swapped
+
+    # ---------------------------------------------------------
+    # 배포
+    # ---------------------------------------------------------
+    def publish(
+        self,
+        name: str,
+        model_path: str,
+        metadata_path: Optional[str] = None,
+        version: Optional[str] = None,
+        native: bool = True,
+    ) -> str:
+        """
+        새 모델 버전을 등록하고 CURRENT를 원자적으로 교체
+
+        임시 디렉토리에 모두 쓴 뒤 rename하므로, 다른 프로세스가 반쯤 복사된 버전을 읽지 않습니다.
+
+        Args:
+            model_path: joblib / ubj / json 모델 파일
+            metadata_path: 메타데이터 JSON (버전 디렉토리에 spec.metadata_filename으로 저장)
+            version: 버전 이름 (기본: 현재 시각 YYYYMMDDHHMMSS)
+            native: joblib XGBoost 모델을 네이티브 부스터(model.ubj)로 변환하여 저장
+        Returns: 등록된 버전 이름
+        """
+        spec = self.specs[name]
+        version = version or datetime.now().strftime("%Y%m%d%H%M%S")
+        if not self.is_valid_version_name(version):
+            raise ValueError(f"잘못된 버전 이름입니다: {version!r}")
+        model_dir = os.path.join(self.root, name)
+        final_dir = os.path.join(model_dir, version)
+        if os.path.exists(final_dir):
+            raise FileExistsError(f"이미 존재하는 버전입니다: {final_dir}")
+
+        tmp_dir = os.path.join(model_dir, f".{version}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            if model_path.endswith((".ubj", ".json")):
+                shutil.copy2(model_path, os.path.join(tmp_dir, "model" + os.path.splitext(model_path)[1]))
+            else:
+                model = joblib.load(model_path)
+                if native and hasattr(model, "save_model"):
+                    model.save_model(os.path.join(tmp_dir, "model.ubj"))
+                else:
+                    shutil.copy2(model_path, os.path.join(tmp_dir, "model.joblib"))
+            if metadata_path:
+                shutil.copy2(metadata_path, os.path.join(tmp_dir, spec.metadata_filename))
+            os.rename(tmp_dir, final_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.activate(name, version)
+        return version
+
+    def activate(self, name: str, version: str) -> None:
+        """CURRENT 포인터를 지정 버전으로 교체 (롤백에도 사용, 등록된 버전 목록에 있는 이름만 허용)"""
+        if version not in self.list_versions(name):
+            raise FileNotFoundError(f"등록되지 않은 버전입니다: {name}/{version}")
+        pointer = os.path.join(self.root, name, CURRENT_FILENAME)
+        tmp_pointer = f"{pointer}.{os.getpid()}.tmp"
+        with open(tmp_pointer, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_pointer, pointer)
+        logger.info(f"Model '{name}' activated: version={version}")
+
+
+# 싱글톤 인스턴스
+_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """모델 레지스트리 싱글톤 인스턴스 반환"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry(settings.model_registry_dir or os.path.join(APP_DIR, "models", "registry"))
+    return _registry
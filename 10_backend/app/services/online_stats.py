@@ -0,0 +1,115 @@
+"""
+온라인(증분) 통계 유틸리티
+
+거래를 하나씩 추가하면서 개수/평균/분산/최소/최대를 유지하고,
+청크·사용자 등 파티션별로 계산한 결과를 병합할 수 있습니다.
+
+- 평균/분산: Welford 알고리즘 (단건 갱신), Chan et al. 병렬 병합 (배치/파티션 병합)
+  sum / sum of squares 방식과 달리 큰 금액에서도 상쇄 오차가 생기지 않습니다.
+
+사용처: DataPreprocessor(업로드/사용자 통계), FraudPreprocessor(금액 z-score),
+이상거래 스캔(사용자별 금액 통계), 사용자 피처 스토어(user_feature_stats에 상태 저장 후 병합)
+"""
+
+import math
+from typing import Iterable
+
+import numpy as np
+
+
+class RunningStats:
+    """
+    수치적으로 안정적인 증분 통계 (Welford)
+
+    Example:
+        stats = RunningStats()
+        for amount in amounts:
+            stats.update(amount)
+        stats.mean, stats.std(ddof=1)
+
+        # 파티션별 결과 병합
+        total = RunningStats.from_values(chunk1)
+        total.merge(RunningStats.from_values(chunk2))
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # 평균 편차 제곱합
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "RunningStats":
+        """배열/Series로 한 번에 생성 (벡터 연산)"""
+        stats = cls()
+        stats.update_many(values)
+        return stats
+
+    @classmethod
+    def from_state(cls, count: int, mean: float, m2: float, min_value: float = None, max_value: float = None) -> "RunningStats":
+        """저장해 둔 상태(개수/평균/편차제곱합/최소/최대)로 복원"""
+        stats = cls()
+        stats.count = int(count)
+        stats.mean = float(mean)
+        stats.m2 = float(m2)
+        if min_value is not None:
+            stats.min = float(min_value)
+        if max_value is not None:
+            stats.max = float(max_value)
+        return stats
+
+    def update(self, value: float) -> None:
+        """값 하나 추가 (Welford)"""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """여러 값을 배치로 추가 (배치 통계를 구한 뒤 병합)"""
+        if not isinstance(values, (np.ndarray, list, tuple)) and not hasattr(values, 'to_numpy'):
+            values = list(values)  # 제너레이터 등
+        arr = np.asarray(values, dtype=np.float64)
+        if arr.size == 0:
+            return
+        batch_mean = float(arr.mean())
+        self._merge_moments(int(arr.size), batch_mean, float(((arr - batch_mean) ** 2).sum()))
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+
+    def _merge_moments(self, n_b: int, mean_b: float, m2_b: float) -> None:
+        # Chan et al. 병렬 분산 병합
+        if n_b == 0:
+            return
+        n_a = self.count
+        total = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / total
+        self.m2 += m2_b + delta * delta * n_a * n_b / total
+        self.count = total
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """다른 파티션의 통계를 병합 (self를 갱신하고 반환)"""
+        self._merge_moments(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 1) -> float:
+        """분산 (ddof=1: 표본분산, pandas 기본 / ddof=0: 모분산, numpy 기본). 표본 부족 시 nan"""
+        if self.count - ddof <= 0:
+            return math.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> float:
+        variance = self.variance(ddof)
+        return math.sqrt(variance) if not math.isnan(variance) else math.nan
+
+    def __repr__(self):
+        return f"<RunningStats(count={self.count}, mean={self.mean:.4f}, std={self.std():.4f})>"
@@ -3,7 +3,8 @@ import numpy as np
 import json
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Iterable, Optional
+from app.services.online_stats import RunningStats
 
 class DataPreprocessor:
     """
@@ -15,6 +16,19 @@ class DataPreprocessor:
     3. Column Ordering (모델 입력 순서 보장)
     을 수행합니다.
     """
+
+    # _feature_engineering에서 사용하는 대분류 -> 인코딩 매핑 (6: 기타)
+    FEATURE_CATEGORY_MAP = {
+        '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
+        '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3 # 유사 카테고리 매핑
+    }
+
+    # 다음 거래 예측(사용자 통계)용 매핑 ('카페/간식' 포함)
+    NEXT_CATEGORY_MAP = {
+        '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
+        '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3,
+        '카페/간식': 4
+    }
     
     def __init__(self, metadata_path: str = None):
         """
@@ -87,6 +101,89 @@ class DataPreprocessor:
         
         return df_final
 
+    def collect_upload_stats(self, chunks: Iterable[pd.DataFrame]) -> Dict[str, Any]:
+        """
+        스트리밍 업로드용 1차 패스: 청크를 순회하며 파일 전체 통계를 누적
+
+        청크별 (개수, 평균, 편차제곱합)을 병합하므로 파일 전체를 메모리에 올리지 않고도
+        preprocess()와 같은 User_AvgAmount/User_StdAmount/카테고리 비율을 얻을 수 있습니다.
+
+        Args:
+            chunks: 원본 CSV 청크 DataFrame 이터러블 (최소 '날짜', '시간', '금액', '대분류' 컬럼)
+
+        Returns:
+            preprocess_chunk()에 전달할 통계 딕셔너리
+        """
+        amount_stats = RunningStats()
+        category_counts: Dict[float, int] = {}
+
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            df_clean = self._clean_data(chunk)
+
+            # 청크 통계를 계산해 누적 통계에 병합
+            amount_stats.update_many(df_clean['Amount'])
+
+            encoded = df_clean['대분류'].map(self.FEATURE_CATEGORY_MAP).fillna(6)
+            for code, cnt in encoded.value_counts().items():
+                category_counts[code] = category_counts.get(code, 0) + int(cnt)
+
+        count = amount_stats.count
+        if count == 0:
+            raise ValueError("CSV 파일에 거래 데이터가 없습니다.")
+
+        # 최빈값: 개수가 같으면 작은 코드 우선 (Series.mode()[0]과 동일)
+        fav_category = min(category_counts, key=lambda code: (-category_counts[code], code))
+
+        return {
+            'avg_amount': amount_stats.mean,
+            'std_amount': amount_stats.std() if count > 1 else 0,
+            'tx_count': count,
+            'fav_category': fav_category,
+            'category_count': len(category_counts),
+            'category_counts': category_counts,
+        }
+
+    def preprocess_chunk(
+        self,
+        df: pd.DataFrame,
+        upload_stats: Dict[str, Any],
+        carry: Optional[Dict[str, Any]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        스트리밍 업로드용 2차 패스: 청크 하나를 모델 입력으로 변환
+
+        통계 피처는 collect_upload_stats()의 파일 전체 값을 사용하고, 순서 피처
+        (Time_Since_Last, Transaction_Sequence, Previous_Category)는 이전 청크의 마지막
+        거래(carry)에 이어서 계산합니다. CSV가 시간순으로 정렬되어 있으면 preprocess()와 같은 결과입니다.
+
+        Args:
+            df: 원본 CSV 청크
+            upload_stats: collect_upload_stats() 결과
+            carry: 이전 청크에서 넘어온 상태 (첫 청크는 None)
+
+        Returns:
+            (모델 입력용 DataFrame, 다음 청크에 넘길 carry)
+        """
+        df_clean = self._clean_data(df)
+        df_engineered = self._feature_engineering(df_clean, upload_stats=upload_stats, carry=carry)
+
+        if self.feature_stats is not None:
+            df_scaled = self._apply_scaling(df_engineered)
+        else:
+            df_scaled = df_engineered
+
+        available_features = [f for f in self.feature_names if f in df_scaled.columns]
+
+        prev = carry or {}
+        next_carry = {
+            'offset': prev.get('offset', 0) + len(df_engineered),
+            'prev_time': df_engineered['CreateDate'].iloc[-1] if len(df_engineered) else prev.get('prev_time'),
+            'prev_category': df_engineered['Current_Category_encoded'].iloc[-1] if len(df_engineered) else prev.get('prev_category'),
+        }
+        return df_scaled[available_features], next_carry
+
     def preprocess_for_next_prediction(self, df: pd.DataFrame, prediction_time: datetime = None) -> pd.DataFrame:
         """
         다음 거래 예측을 위한 피처 생성
@@ -101,6 +198,27 @@ class DataPreprocessor:
         Returns:
             24개 피처를 가진 단일 행 DataFrame (XGBoost용)
         """
+        next_features, _, _ = self.prepare_next_prediction(df, prediction_time)
+        return next_features
+
+    def prepare_next_prediction(
+        self,
+        df: pd.DataFrame,
+        prediction_time: datetime = None
+    ) -> Tuple[pd.DataFrame, pd.Series, dict]:
+        """
+        다음 거래 예측용 피처와 함께 정제 과정에서 얻은 중간 결과를 반환
+
+        히스토리 정제와 사용자 통계 계산을 한 번만 수행하므로, 호출 측에서 응답 컨텍스트
+        (최근 거래, 평균 금액, 최빈 카테고리)를 다시 계산할 필요가 없습니다.
+
+        Args:
+            df: 전체 거래 이력 DataFrame
+            prediction_time: 예측 시점 (기본값: 현재 시간)
+
+        Returns:
+            (24개 피처 단일 행 DataFrame, 가장 최근 거래, 사용자 통계)
+        """
         if prediction_time is None:
             prediction_time = datetime.now()
 
@@ -114,14 +232,36 @@ class DataPreprocessor:
         last_transaction = df_clean.iloc[-1]
 
         # 4. "다음 거래" 피처 구성
+        next_features = self.preprocess_next_from_stats(user_stats, last_transaction, prediction_time)
+        return next_features, last_transaction, user_stats
+
+    def preprocess_next_from_stats(
+        self,
+        user_stats: dict,
+        last_transaction,
+        prediction_time: datetime = None
+    ) -> pd.DataFrame:
+        """
+        미리 계산된 사용자 통계로 다음 거래 피처 생성 (거래 이력 DataFrame 불필요)
+
+        Args:
+            user_stats: _calculate_user_stats() 형식의 통계 (피처 스토어 등)
+            last_transaction: 가장 최근 거래 ('CreateDate', '대분류' 키를 가진 Series 또는 dict)
+            prediction_time: 예측 시점 (기본값: 현재 시간)
+
+        Returns:
+            24개 피처를 가진 단일 행 DataFrame (XGBoost용)
+        """
+        if prediction_time is None:
+            prediction_time = datetime.now()
+
         next_features = self._build_next_transaction_features(
             last_transaction=last_transaction,
             user_stats=user_stats,
-            prediction_time=prediction_time,
-            full_history=df_clean
+            prediction_time=prediction_time
         )
 
-        # 5. Scaling 적용 (XGBoost는 스케일링 불필요)
+        # Scaling 적용 (XGBoost는 스케일링 불필요)
         if self.feature_stats is not None:
             next_scaled = self._apply_scaling(next_features)
         else:
@@ -143,9 +283,10 @@ class DataPreprocessor:
         """
         stats = {}
 
-        # 금액 통계
-        stats['avg_amount'] = df['Amount'].mean()
-        stats['std_amount'] = df['Amount'].std()
+        # 금액 통계 (단일 패스 증분 통계)
+        amount_stats = RunningStats.from_values(df['Amount'])
+        stats['avg_amount'] = amount_stats.mean if amount_stats.count else np.nan
+        stats['std_amount'] = amount_stats.std()
         if pd.isna(stats['std_amount']):
             stats['std_amount'] = 0
 
@@ -153,12 +294,7 @@ class DataPreprocessor:
         stats['tx_count'] = len(df)
 
         # 카테고리 인코딩 (기존 로직 재사용)
-        category_map = {
-            '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
-            '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3,
-            '카페/간식': 4  # 추가
-        }
-        df['category_encoded'] = df['대분류'].map(category_map).fillna(6)
+        df['category_encoded'] = df['대분류'].map(self.NEXT_CATEGORY_MAP).fillna(6)
 
         # 가장 선호하는 카테고리
         if len(df) > 0:
@@ -187,17 +323,15 @@ class DataPreprocessor:
         self,
         last_transaction: pd.Series,
         user_stats: dict,
-        prediction_time: datetime,
-        full_history: pd.DataFrame
+        prediction_time: datetime
     ) -> pd.DataFrame:
         """
         가상의 다음 거래 피처 구성
 
         Args:
             last_transaction: 가장 최근 거래
-            user_stats: 사용자 통계
+            user_stats: 사용자 통계 (tx_count = 전체 거래 수)
             prediction_time: 예측 시점
-            full_history: 전체 거래 이력
 
         Returns:
             피처 딕셔너리를 포함하는 DataFrame
@@ -234,7 +368,7 @@ class DataPreprocessor:
         # ---------------------------------------------------------
         features['User_AvgAmount'] = user_stats['avg_amount']
         features['User_StdAmount'] = user_stats['std_amount']
-        features['User_TxCount'] = len(full_history)
+        features['User_TxCount'] = user_stats['tx_count']
 
         # ---------------------------------------------------------
         # 5. Sequence Features
@@ -242,20 +376,13 @@ class DataPreprocessor:
         last_tx_time = last_transaction['CreateDate']
         time_since_last = (prediction_time - last_tx_time).total_seconds() / 60  # 분 단위
         features['Time_Since_Last'] = time_since_last
-        features['Transaction_Sequence'] = (len(full_history) + 1) / (len(full_history) + 1)  # 정규화
+        features['Transaction_Sequence'] = (user_stats['tx_count'] + 1) / (user_stats['tx_count'] + 1)  # 정규화
 
         # ---------------------------------------------------------
         # 6. Category Features
         # ---------------------------------------------------------
-        # 카테고리 매핑
-        category_map = {
-            '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
-            '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3,
-            '카페/간식': 4
-        }
-
         # 마지막 거래의 카테고리
-        prev_category = category_map.get(last_transaction.get('대분류', '외식'), 4)
+        prev_category = self.NEXT_CATEGORY_MAP.get(last_transaction.get('대분류', '외식'), 4)
         features['Previous_Category_encoded'] = prev_category
 
         # Current Category는 가장 빈번한 카테고리 사용
@@ -303,12 +430,22 @@ class DataPreprocessor:
         
         return df
         
-    def _feature_engineering(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _feature_engineering(
+        self,
+        df: pd.DataFrame,
+        upload_stats: Optional[Dict[str, Any]] = None,
+        carry: Optional[Dict[str, Any]] = None
+    ) -> pd.DataFrame:
         """
         27개 Feature 생성
         
         주의: 실제 사용자 전체 히스토리가 아닌 업로드된 CSV 내에서만 통계를 계산하므로
         일부 누적 통계(User_AvgAmount 등)는 정확하지 않을 수 있습니다.
+
+        Args:
+            df: 정제된 DataFrame
+            upload_stats: 파일 전체 통계 (스트리밍 청크 처리 시, None이면 df로 계산)
+            carry: 이전 청크의 마지막 거래 상태 (스트리밍 청크 처리 시)
         """
         df = df.copy()
         
@@ -322,23 +459,28 @@ class DataPreprocessor:
         # ---------------------------------------------------------
         # 2. Boolean Time Features (0 or 1)
         # ---------------------------------------------------------
+        # Series.apply / 행 단위 apply 대신 boolean mask로 한 번에 계산 (대용량 CSV 대응)
+        hour = df['Hour'].to_numpy()
+        day_of_week = df['DayOfWeek'].to_numpy()
+
         # 주말 여부 (토, 일)
-        df['IsWeekend'] = df['DayOfWeek'].apply(lambda x: 1 if x >= 5 else 0)
-        
+        is_weekend = day_of_week >= 5
+        df['IsWeekend'] = is_weekend.astype(np.int64)
+
         # 점심 시간 (11:00 ~ 13:59)
-        df['IsLunchTime'] = df['Hour'].apply(lambda x: 1 if 11 <= x <= 13 else 0)
-        
+        df['IsLunchTime'] = ((hour >= 11) & (hour <= 13)).astype(np.int64)
+
         # 저녁 시간 (18:00 ~ 20:59)
-        df['IsEvening'] = df['Hour'].apply(lambda x: 1 if 18 <= x <= 20 else 0)
-        
+        df['IsEvening'] = ((hour >= 18) & (hour <= 20)).astype(np.int64)
+
         # 아침 출근 시간 (07:00 ~ 09:59)
-        df['IsMorningRush'] = df['Hour'].apply(lambda x: 1 if 7 <= x <= 9 else 0)
-        
+        df['IsMorningRush'] = ((hour >= 7) & (hour <= 9)).astype(np.int64)
+
         # 심야 시간 (22:00 ~ 04:59)
-        df['IsNight'] = df['Hour'].apply(lambda x: 1 if x >= 22 or x <= 4 else 0)
-        
+        df['IsNight'] = ((hour >= 22) | (hour <= 4)).astype(np.int64)
+
         # 업무 시간 (09:00 ~ 17:59, 주말 제외)
-        df['IsBusinessHour'] = df.apply(lambda row: 1 if (9 <= row['Hour'] <= 17) and (row['IsWeekend'] == 0) else 0, axis=1)
+        df['IsBusinessHour'] = ((hour >= 9) & (hour <= 17) & ~is_weekend).astype(np.int64)
         
         # ---------------------------------------------------------
         # 3. Amount Features
@@ -356,23 +498,36 @@ class DataPreprocessor:
         # 4. User Stats Features (CSV 내 데이터로 계산)
         # ---------------------------------------------------------
         # 전체 평균/표준편차 (여기서는 단일 사용자라고 가정)
-        user_mean = df['Amount'].mean()
-        user_std = df['Amount'].std()
-        if np.isnan(user_std): user_std = 0
+        if upload_stats is not None:
+            user_mean = upload_stats['avg_amount']
+            user_std = upload_stats['std_amount']
+            total_count = upload_stats['tx_count']
+        else:
+            amount_stats = RunningStats.from_values(df['Amount'])
+            user_mean = amount_stats.mean if amount_stats.count else np.nan
+            user_std = amount_stats.std()
+            if np.isnan(user_std): user_std = 0
+            total_count = len(df)
             
         df['User_AvgAmount'] = user_mean
         df['User_StdAmount'] = user_std
-        df['User_TxCount'] = len(df)
+        df['User_TxCount'] = total_count
         
         # ---------------------------------------------------------
         # 5. Sequence Features
         # ---------------------------------------------------------
         # 이전 거래와의 시간 간격 (분 단위)
+        carry = carry or {}
         df['Time_Since_Last'] = df['CreateDate'].diff().dt.total_seconds() / 60
+        if carry.get('prev_time') is not None and len(df) > 0:
+            # 이전 청크 마지막 거래와의 간격
+            df.iloc[0, df.columns.get_loc('Time_Since_Last')] = (
+                (df['CreateDate'].iloc[0] - carry['prev_time']).total_seconds() / 60
+            )
         df['Time_Since_Last'] = df['Time_Since_Last'].fillna(0)
         
         # 거래 순서 (0 ~ 1 정규화된 순서)
-        df['Transaction_Sequence'] = np.arange(len(df)) / len(df)
+        df['Transaction_Sequence'] = (carry.get('offset', 0) + np.arange(len(df))) / total_count
         
         # ---------------------------------------------------------
         # 6. Category Features
@@ -383,28 +538,29 @@ class DataPreprocessor:
         # 자주 사용하는 카테고리를 하드코딩
         
         # 대분류를 기준으로 함
-        category_map = {
-            '교통': 0, '생활': 1, '쇼핑': 2, '식료품': 3, '외식': 4, '주유': 5,
-            '식비': 4, '카페': 4, '간식': 3, '마트': 3, '편의점': 3 # 유사 카테고리 매핑
-        }
-        
-        df['Current_Category_encoded'] = df['대분류'].map(category_map).fillna(6) # 6: 기타
-        
-        # 이전 카테고리
-        df['Previous_Category_encoded'] = df['Current_Category_encoded'].shift(1).fillna(6)
-        
-        # 사용자 선호 카테고리 (가장 많이 나온 것)
-        fav_cat = df['Current_Category_encoded'].mode()[0]
-        df['User_FavCategory_encoded'] = fav_cat
+        df['Current_Category_encoded'] = df['대분류'].map(self.FEATURE_CATEGORY_MAP).fillna(6) # 6: 기타
         
-        # 카테고리 개수
-        df['User_Category_Count'] = df['Current_Category_encoded'].nunique()
+        # 이전 카테고리 (청크 경계에서는 이전 청크의 마지막 카테고리)
+        prev_category = carry.get('prev_category')
+        df['Previous_Category_encoded'] = df['Current_Category_encoded'].shift(1).fillna(
+            6 if prev_category is None else prev_category
+        )
+        if upload_stats is not None:
+            df['User_FavCategory_encoded'] = upload_stats['fav_category']
+            df['User_Category_Count'] = upload_stats['category_count']
+            cat_counts = upload_stats['category_counts']
+        else:
+            # 사용자 선호 카테고리 (가장 많이 나온 것)
+            fav_cat = df['Current_Category_encoded'].mode()[0]
+            df['User_FavCategory_encoded'] = fav_cat
+            
+            # 카테고리 개수
+            df['User_Category_Count'] = df['Current_Category_encoded'].nunique()
+            cat_counts = df['Current_Category_encoded'].value_counts()
         
         # ---------------------------------------------------------
         # 7. Ratio Features (비율)
         # ---------------------------------------------------------
-        total_count = len(df)
-        cat_counts = df['Current_Category_encoded'].value_counts()
         
         # 각 카테고리별 비율 (전체 대비)
         # 매핑: 0:교통, 1:생활, 2:쇼핑, 3:식료품, 4:외식, 5:주유
@@ -0,0 +1,169 @@
+"""
+리포트 집계 엔진
+
+일간/주간/월간(및 임의 기간) 리포트에 필요한 값을 CTE 쿼리 한 번으로 계산합니다.
+- 기간 합계/건수, 비교 기간 합계, 카테고리별 합계: 일별 집계(daily_spend_rollup)
+- 최대 지출 거래, 이상거래 목록: transactions (행 단위 정보가 필요)
+
+기간은 ReportPeriod로 표현하며 [start, end) 구간입니다 (자정 경계).
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+REPORT_AGGREGATES_SQL = text("""
+    WITH period AS (
+        SELECT COALESCE(SUM(total), 0) AS total, COALESCE(SUM(count), 0) AS count
+        FROM daily_spend_rollup
+        WHERE day >= :start_day AND day < :end_day
+    ), previous AS (
+        SELECT COALESCE(SUM(total), 0) AS total
+        FROM daily_spend_rollup
+        WHERE day >= :previous_start_day AND day < :previous_end_day
+    ), categories AS (
+        SELECT category_key, SUM(total) AS total, SUM(count) AS count
+        FROM daily_spend_rollup
+        WHERE day >= :start_day AND day < :end_day AND category_key <> 0
+        GROUP BY category_key
+        HAVING SUM(count) > 0
+    ), max_tx AS (
+        SELECT merchant_name, amount, transaction_time, category_id
+        FROM transactions
+        WHERE transaction_time >= :start AND transaction_time < :end
+          AND category_id IS NOT NULL AND status = 'completed' AND is_fraudulent = false
+        ORDER BY amount DESC
+        LIMIT 1
+    ), fraud AS (
+        SELECT merchant_name, amount, transaction_time, description
+        FROM transactions
+        WHERE transaction_time >= :start AND transaction_time < :end AND is_fraudulent = true
+    )
+    SELECT
+        period.total,
+        period.count,
+        previous.total,
+        (SELECT json_agg(json_build_array(category_key, total, count) ORDER BY total DESC) FROM categories),
+        (SELECT row_to_json(max_tx) FROM max_tx),
+        (SELECT json_agg(fraud ORDER BY fraud.transaction_time DESC) FROM fraud)
+    FROM period, previous
+""")
+
+
+def _midnight(value) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return datetime(value.year, value.month, value.day)
+
+
+def _shift_months(value: datetime, months: int) -> datetime:
+    """월 단위 이동 (value는 1일이어야 함)"""
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+@dataclass(frozen=True)
+class ReportPeriod:
+    """리포트 기간 [start, end)와 증감률 비교 기간 [previous_start, start)"""
+    start: datetime
+    end: datetime
+    previous_start: datetime
+
+    @property
+    def last_day(self) -> datetime:
+        """기간의 마지막 날 (리포트 표시용)"""
+        return self.end - timedelta(days=1)
+
+    @classmethod
+    def daily(cls, now: Optional[datetime] = None) -> "ReportPeriod":
+        """어제 (비교: 그저께)"""
+        end = _midnight(now or datetime.now())
+        start = end - timedelta(days=1)
+        return cls(start=start, end=end, previous_start=start - timedelta(days=1))
+
+    @classmethod
+    def weekly(cls, now: Optional[datetime] = None) -> "ReportPeriod":
+        """지난주 월~일 (비교: 지지난 주)"""
+        today = _midnight(now or datetime.now())
+        end = today - timedelta(days=today.weekday())
+        start = end - timedelta(days=7)
+        return cls(start=start, end=end, previous_start=start - timedelta(days=7))
+
+    @classmethod
+    def monthly(cls, now: Optional[datetime] = None) -> "ReportPeriod":
+        """지난달 1일 ~ 말일 (비교: 지지난 달)"""
+        end = _midnight(now or datetime.now()).replace(day=1)
+        start = _shift_months(end, -1)
+        return cls(start=start, end=end, previous_start=_shift_months(end, -2))
+
+    @classmethod
+    def custom(cls, first_day: date, last_day: date) -> "ReportPeriod":
+        """임의 기간 (first_day ~ last_day, 양 끝 포함). 비교 기간은 바로 앞의 같은 일수"""
+        start = _midnight(first_day)
+        end = _midnight(last_day) + timedelta(days=1)
+        if end <= start:
+            raise ValueError("last_day must not be earlier than first_day")
+        return cls(start=start, end=end, previous_start=start - (end - start))
+
+
+@dataclass
+class ReportAggregates:
+    """리포트 집계 결과 (금액은 float, 이상거래 제외 합계)"""
+    total: float
+    count: int
+    previous_total: float
+    # (category_id, 합계, 건수), 합계 내림차순. 카테고리 없는 거래 제외
+    categories: List[Tuple[int, float, int]] = field(default_factory=list)
+    # merchant_name, amount, transaction_time, category_id
+    max_transaction: Optional[Dict[str, Any]] = None
+    # merchant_name, amount, transaction_time, description (최신순)
+    fraud_transactions: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _from_json(value):
+    # 드라이버 codec 설정에 따라 json 컬럼이 문자열로 올 수 있음
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _transaction_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    row["amount"] = float(row["amount"])
+    row["transaction_time"] = datetime.fromisoformat(row["transaction_time"])
+    return row
+
+
+async def aggregate_report(db: AsyncSession, period: ReportPeriod) -> ReportAggregates:
+    """
+    기간 리포트 집계를 한 번의 왕복으로 조회
+
+    transaction_time은 JSON으로 직렬화되므로 DB 세션 타임존 기준 시각으로 돌아옵니다
+    (일별 집계의 일자 경계와 같은 기준).
+    """
+    row = (await db.execute(REPORT_AGGREGATES_SQL, {
+        "start": period.start,
+        "end": period.end,
+        "start_day": period.start.date(),
+        "end_day": period.end.date(),
+        "previous_start_day": period.previous_start.date(),
+        "previous_end_day": period.start.date(),
+    })).one()
+    total, count, previous_total, categories, max_transaction, fraud_transactions = row
+
+    max_transaction = _from_json(max_transaction)
+    return ReportAggregates(
+        total=float(total or 0),
+        count=int(count or 0),
+        previous_total=float(previous_total or 0),
+        categories=[
+            (int(category_id), float(amount), int(tx_count))
+            for category_id, amount, tx_count in _from_json(categories) or []
+        ],
+        max_transaction=_transaction_row(max_transaction) if max_transaction else None,
+        fraud_transactions=[_transaction_row(tx) for tx in _from_json(fraud_transactions) or []],
+    )
@@ -1,16 +1,17 @@
 """
 리포트 생성 서비스
 
-주간/월간 소비 데이터를 집계하고 리포트를 생성합니다.
+일간/주간/월간(및 임의 기간) 소비 데이터를 집계하고 리포트를 생성합니다.
+집계는 services/report_aggregation.py에서 기간별 CTE 쿼리 한 번으로 계산합니다.
 """
 
 import logging
 import re
-from datetime import datetime, timedelta
+from datetime import date
 from typing import Dict, Any
-from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.model.transaction import Transaction, Category
+from app.services.category_registry import get_categories, sum_by_category_name
+from app.services.report_aggregation import ReportPeriod, aggregate_report
 from app.db.model.user import User
 
 logger = logging.getLogger(__name__)
@@ -20,27 +21,36 @@ logger = logging.getLogger(__name__)
 from app.services.ai_service import call_gemini_api, generate_report_prompt
 import os
 import io
-import matplotlib.pyplot as plt
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak
+# matplotlib / reportlab은 import 비용이 커서 차트·PDF를 만들 때 함수 안에서 import 합니다.
 
 # 한글 폰트 설정 (윈도우 기본 맑은 고딕)
 FONT_PATH = "C:\\Windows\\Fonts\\malgun.ttf"
-if os.path.exists(FONT_PATH):
-    pdfmetrics.registerFont(TTFont('MalgunGothic', FONT_PATH))
-    pdfmetrics.registerFont(TTFont('MalgunGothicBold', "C:\\Windows\\Fonts\\malgunbd.ttf"))
-else:
-    # 폰트가 없을 경우 기본 폰트 사용 (한글 깨짐 주의)
-    logger.warning("Korean font not found. PDF might have encoding issues.")
+_fonts_registered = False
+
+
+def _register_korean_fonts():
+    """PDF용 한글 폰트 등록 (최초 PDF 생성 시 한 번)"""
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    if os.path.exists(FONT_PATH):
+        pdfmetrics.registerFont(TTFont('MalgunGothic', FONT_PATH))
+        pdfmetrics.registerFont(TTFont('MalgunGothicBold', "C:\\Windows\\Fonts\\malgunbd.ttf"))
+    else:
+        # 폰트가 없을 경우 기본 폰트 사용 (한글 깨짐 주의)
+        logger.warning("Korean font not found. PDF might have encoding issues.")
+    _fonts_registered = True
+
 
 def generate_category_pie_chart(top_categories: list) -> io.BytesIO:
     """
     카테고리 지출 비중을 도넛형 파이 차트로 생성합니다.
     """
+    import matplotlib.pyplot as plt
+
     if not top_categories:
         return None
         
@@ -95,6 +105,8 @@ def generate_daily_bar_chart(daily_data: list) -> io.BytesIO:
     """
     일별 지출 데이터를 막대 그래프로 생성합니다.
     """
+    import matplotlib.pyplot as plt
+
     if not daily_data:
         return None
         
@@ -138,6 +150,13 @@ def generate_report_pdf(report_type: str, report_data: Dict[str, Any], output_pa
     리포트 데이터를 바탕으로 '프레젠테이션 슬라이드 덱(Slide Deck)' 형태의 PDF를 생성합니다.
     (가로형 A4, 큰 폰트, 페이지 넘김 구조)
     """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak
+
+    _register_korean_fonts()
+
     # 가로형 A4 설정
     doc = SimpleDocTemplate(output_path, pagesize=landscape(A4), topMargin=40, bottomMargin=40, leftMargin=50, rightMargin=50)
     styles = getSampleStyleSheet()
@@ -687,124 +706,45 @@ def generate_report_html_slide(report_data: Dict[str, Any], title: str = "Monthl
 </body>
 </html>"""
 
-async def generate_weekly_report(db: AsyncSession) -> Dict[str, Any]:
+async def build_period_report(
+    db: AsyncSession,
+    period: ReportPeriod,
+    report_label: str,
+    date_format: str = "%m/%d",
+    fraud_date_format: str = "%m/%d %H:%M",
+) -> Dict[str, Any]:
     """
-    주간 리포트 데이터를 생성합니다. (지난주 월~일)
+    기간 리포트 데이터를 생성합니다. (일간/주간/월간/임의 기간 공통)
     
     Args:
         db: 데이터베이스 세션
+        period: 리포트 기간과 비교 기간
+        report_label: AI 인사이트 프롬프트용 리포트 이름 (예: "주간 소비")
+        date_format: 최대 지출 거래 날짜 표시 형식
+        fraud_date_format: 이상 거래 날짜 표시 형식
     
     Returns:
         dict: 리포트 데이터
     """
-    # 실행 시점 (보통 월요일 오전)
-    today = datetime.now()
-    
-    # 지난주 월요일 구하기
-    # today.weekday(): 월(0) ~ 일(6)
-    # 이번주 월요일: today - timedelta(days=today.weekday())
-    # 지난주 월요일: 이번주 월요일 - 7일
-    this_week_monday = today - timedelta(days=today.weekday())
-    start_of_week = this_week_monday - timedelta(days=7)
-    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # 지난주 일요일 (이번주 월요일 00:00 직전)
-    end_of_week = this_week_monday.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # 지지난 주 (증감율 비교용)
-    last_week_start = start_of_week - timedelta(days=7)
-    last_week_end = start_of_week
-    
-    # 이번 주(실제로는 지난 주) 거래 데이터 (이상 거래 제외)
-    this_week_query = select(
-        func.count(Transaction.id).label("count"),
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_week,
-            Transaction.transaction_time < end_of_week,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    )
-    this_week_result = await db.execute(this_week_query)
-    this_week_data = this_week_result.first()
-    
-    # 최대 지출 거래 조회 (카테고리명 포함)
-    max_tx_query = select(Transaction, Category.name).join(
-        Category, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_week,
-            Transaction.transaction_time < end_of_week,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).order_by(Transaction.amount.desc()).limit(1)
-    max_tx_result = await db.execute(max_tx_query)
-    max_tx_row = max_tx_result.first()
-    
-    max_transaction = max_tx_row[0] if max_tx_row else None
-    max_cat_name = max_tx_row[1] if max_tx_row else None
+    # 합계/건수/비교 기간/카테고리/최대 지출/이상 거래를 한 번에 집계
+    aggregates = await aggregate_report(db, period)
+    categories_snapshot = await get_categories(db)
+    total = aggregates.total
     
-    # 이상 거래 조회
-    fraud_tx_query = select(Transaction).where(
-        and_(
-            Transaction.transaction_time >= start_of_week,
-            Transaction.transaction_time < end_of_week,
-            Transaction.is_fraudulent == True
-        )
-    ).order_by(Transaction.transaction_time.desc())
-    fraud_tx_result = await db.execute(fraud_tx_query)
-    fraud_transactions = fraud_tx_result.scalars().all()
-
-    # 지난 주(실제로는 지지난 주) 거래 데이터 (이상 거래 제외)
-    last_week_query = select(
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= last_week_start,
-            Transaction.transaction_time < last_week_end,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    )
-    last_week_result = await db.execute(last_week_query)
-    last_week_data = last_week_result.first()
-    
-    # 카테고리별 집계 (이상 거래 제외)
-    category_query = select(
-        Category.name,
-        func.sum(Transaction.amount).label("amount"),
-        func.count(Transaction.id).label("count")
-    ).join(
-        Transaction, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_week,
-            Transaction.transaction_time < end_of_week,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(5)
-    
-    category_result = await db.execute(category_query)
-    categories = category_result.all()
-    
-    # 전주 대비 증감율 계산
-    this_week_total = float(this_week_data.total_amount or 0)
-    last_week_total = float(last_week_data.total_amount or 0)
+    # 카테고리 이름은 레지스트리로 매핑 후 상위 5개
+    categories = sum_by_category_name(aggregates.categories, categories_snapshot)[:5]
     
-    if last_week_total > 0:
-        change_rate = ((this_week_total - last_week_total) / last_week_total) * 100
+    # 비교 기간 대비 증감율 계산
+    if aggregates.previous_total > 0:
+        change_rate = ((total - aggregates.previous_total) / aggregates.previous_total) * 100
     else:
         change_rate = 0
     
     report_data = {
-        "period_start": start_of_week.strftime("%Y-%m-%d"),
-        "period_end": (end_of_week - timedelta(days=1)).strftime("%Y-%m-%d"),
-        "total_amount": this_week_total,
-        "transaction_count": this_week_data.count or 0,
+        "period_start": period.start.strftime("%Y-%m-%d"),
+        "period_end": period.last_day.strftime("%Y-%m-%d"),
+        "total_amount": total,
+        "transaction_count": aggregates.count,
         "change_rate": round(change_rate, 1),
         "top_categories": [],
         "max_transaction": None,
@@ -812,41 +752,41 @@ async def generate_weekly_report(db: AsyncSession) -> Dict[str, Any]:
     }
     
     # 카테고리 데이터 처리 (비율 계산)
-    if categories and this_week_total > 0:
-        for cat in categories:
-            cat_amount = float(cat.amount)
+    if categories and total > 0:
+        for cat_name, cat_amount, cat_count in categories:
             # 전체 지출액 대비 비중으로 계산
-            percentage = (cat_amount / this_week_total) * 100
+            percentage = (cat_amount / total) * 100
             report_data["top_categories"].append({
-                "name": cat.name, 
+                "name": cat_name, 
                 "amount": cat_amount, 
-                "count": int(cat.count),
+                "count": int(cat_count),
                 "percent": percentage
             })
-            
+    
+    max_transaction = aggregates.max_transaction
     if max_transaction:
         report_data["max_transaction"] = {
-            "merchant_name": max_transaction.merchant_name,
-            "amount": float(max_transaction.amount),
-            "date": max_transaction.transaction_time.strftime("%m/%d"),
-            "category": max_cat_name
+            "merchant_name": max_transaction["merchant_name"],
+            "amount": max_transaction["amount"],
+            "date": max_transaction["transaction_time"].strftime(date_format),
+            "category": categories_snapshot.name_of(max_transaction["category_id"])
         }
 
     # 이상 거래 데이터 처리
-    for tx in fraud_transactions:
+    for tx in aggregates.fraud_transactions:
         report_data["fraud_transactions"].append({
-            "merchant_name": tx.merchant_name,
-            "amount": float(tx.amount),
-            "date": tx.transaction_time.strftime("%m/%d %H:%M"),
-            "description": tx.description
+            "merchant_name": tx["merchant_name"],
+            "amount": tx["amount"],
+            "date": tx["transaction_time"].strftime(fraud_date_format),
+            "description": tx["description"]
         })
 
     # AI Insight 생성
     try:
-        prompt = generate_report_prompt("주간 소비", report_data)
+        prompt = generate_report_prompt(report_label, report_data)
         ai_insight = await call_gemini_api(prompt)
         report_data["ai_insight"] = ai_insight
-        logger.info(f"Generated AI Insight (Weekly): {ai_insight}")
+        logger.info(f"Generated AI Insight ({report_label}): {ai_insight}")
     except Exception as e:
         logger.error(f"Failed to generate AI insight: {e}")
         report_data["ai_insight"] = "AI 분석을 불러올 수 없습니다."
@@ -854,337 +794,38 @@ async def generate_weekly_report(db: AsyncSession) -> Dict[str, Any]:
     return report_data
 
 
-async def generate_monthly_report(db: AsyncSession) -> Dict[str, Any]:
+async def generate_weekly_report(db: AsyncSession) -> Dict[str, Any]:
     """
-    월간 리포트 데이터를 생성합니다. (지난달 1일 ~ 말일)
+    주간 리포트 데이터를 생성합니다. (지난주 월~일, 비교: 지지난 주)
     
-    Args:
-        db: 데이터베이스 세션
-    
-    Returns:
-        dict: 리포트 데이터
+    보통 월요일 오전에 실행됩니다.
     """
-    # 실행 시점 (보통 1일 오전)
-    today = datetime.now()
-    
-    # 이번 달 1일
-    this_month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    # 지난 달 1일 (start_of_month)
-    if this_month_start.month == 1:
-        start_of_month = this_month_start.replace(year=this_month_start.year - 1, month=12)
-    else:
-        start_of_month = this_month_start.replace(month=this_month_start.month - 1)
-        
-    # 지난 달의 다음 달 1일 == 이번 달 1일 (end_of_month)
-    # 쿼리에서 < end_of_month 로 사용하여 지난 달 말일까지 포함
-    end_of_month = this_month_start
-    
-    # 지지난 달 (증감율 비교용)
-    if start_of_month.month == 1:
-        last_month_start = start_of_month.replace(year=start_of_month.year - 1, month=12)
-    else:
-        last_month_start = start_of_month.replace(month=start_of_month.month - 1)
-    last_month_end = start_of_month
-    
-    # 이번 달 거래 데이터 (이상 거래 제외)
-    this_month_query = select(
-        func.count(Transaction.id).label("count"),
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_month,
-            Transaction.transaction_time < end_of_month,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    )
-    this_month_result = await db.execute(this_month_query)
-    this_month_data = this_month_result.first()
-    
-    # 최대 지출 거래 조회 (이상 거래 제외)
-    max_tx_query = select(Transaction, Category.name).join(
-        Category, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_month,
-            Transaction.transaction_time < end_of_month,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).order_by(Transaction.amount.desc()).limit(1)
-    max_tx_result = await db.execute(max_tx_query)
-    max_tx_row = max_tx_result.first()
-    
-    max_transaction = max_tx_row[0] if max_tx_row else None
-    max_cat_name = max_tx_row[1] if max_tx_row else None
+    return await build_period_report(db, ReportPeriod.weekly(), "주간 소비")
 
-    # 이상 거래 조회
-    fraud_tx_query = select(Transaction).where(
-        and_(
-            Transaction.transaction_time >= start_of_month,
-            Transaction.transaction_time < end_of_month,
-            Transaction.is_fraudulent == True
-        )
-    ).order_by(Transaction.transaction_time.desc())
-    fraud_tx_result = await db.execute(fraud_tx_query)
-    fraud_transactions = fraud_tx_result.scalars().all()
-    
-    # 지난 달 거래 데이터 (이상 거래 제외)
-    last_month_query = select(
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= last_month_start,
-            Transaction.transaction_time < last_month_end,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    )
-    last_month_result = await db.execute(last_month_query)
-    last_month_data = last_month_result.first()
-    
-    # 카테고리별 집계 (이상 거래 제외)
-    category_query = select(
-        Category.name,
-        func.sum(Transaction.amount).label("amount"),
-        func.count(Transaction.id).label("count")
-    ).join(
-        Transaction, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_month,
-            Transaction.transaction_time < end_of_month,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(5)
-    
-    category_result = await db.execute(category_query)
-    categories = category_result.all()
-    
-    # 전월 대비 증감율 계산
-    this_month_total = float(this_month_data.total_amount or 0)
-    last_month_total = float(last_month_data.total_amount or 0)
-    
-    if last_month_total > 0:
-        change_rate = ((this_month_total - last_month_total) / last_month_total) * 100
-    else:
-        change_rate = 0
-    
-    report_data = {
-        "period_start": start_of_month.strftime("%Y-%m-%d"),
-        "period_end": (end_of_month - timedelta(days=1)).strftime("%Y-%m-%d"),
-        "total_amount": this_month_total,
-        "transaction_count": this_month_data.count or 0,
-        "change_rate": round(change_rate, 1),
-        "top_categories": [],
-        "max_transaction": None,
-        "fraud_transactions": []
-    }
-    
-    # 카테고리 데이터 처리 (비율 계산)
-    if categories and this_month_total > 0:
-        for cat in categories:
-            cat_amount = float(cat.amount)
-            # 전체 지출액 대비 비중으로 계산
-            percentage = (cat_amount / this_month_total) * 100
-            report_data["top_categories"].append({
-                "name": cat.name, 
-                "amount": cat_amount, 
-                "count": int(cat.count),
-                "percent": percentage
-            })
-            
-    if max_transaction:
-        report_data["max_transaction"] = {
-            "merchant_name": max_transaction.merchant_name,
-            "amount": float(max_transaction.amount),
-            "date": max_transaction.transaction_time.strftime("%m/%d"),
-            "category": max_cat_name
-        }
 
-    # 이상 거래 데이터 처리
-    for tx in fraud_transactions:
-        report_data["fraud_transactions"].append({
-            "merchant_name": tx.merchant_name,
-            "amount": float(tx.amount),
-            "date": tx.transaction_time.strftime("%m/%d %H:%M"),
-            "description": tx.description
-        })
-
-    # AI Insight 생성
-    try:
-        prompt = generate_report_prompt("월간 소비", report_data)
-        ai_insight = await call_gemini_api(prompt)
-        report_data["ai_insight"] = ai_insight
-        logger.info(f"Generated AI Insight (Monthly): {ai_insight}")
-    except Exception as e:
-        logger.error(f"Failed to generate AI insight: {e}")
-        report_data["ai_insight"] = "AI 분석을 불러올 수 없습니다."
-
-    return report_data
-
-
-async def generate_daily_report(db: AsyncSession) -> Dict[str, Any]:
+async def generate_monthly_report(db: AsyncSession) -> Dict[str, Any]:
     """
-    일간 리포트 데이터를 생성합니다. (전날 데이터)
-    
-    Args:
-        db: 데이터베이스 세션
+    월간 리포트 데이터를 생성합니다. (지난달 1일 ~ 말일, 비교: 지지난 달)
     
-    Returns:
-        dict: 리포트 데이터
+    보통 1일 오전에 실행됩니다.
     """
-    # 어제 (00:00:00 ~ 23:59:59)
-    today = datetime.now()
-    yesterday = today - timedelta(days=1)
-    
-    start_of_day = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_of_day = today.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # 그저께 (증감율 비교용)
-    day_before_yesterday_start = start_of_day - timedelta(days=1)
-    day_before_yesterday_end = start_of_day
-
-    # 어제 거래 데이터 (이상 거래 제외)
-    yesterday_query = select(
-        func.count(Transaction.id).label("count"),
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_day,
-            Transaction.transaction_time < end_of_day,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    )
-    yesterday_result = await db.execute(yesterday_query)
-    yesterday_data = yesterday_result.first()
+    return await build_period_report(db, ReportPeriod.monthly(), "월간 소비")
 
-    # 최대 지출 거래 조회 (카테고리명 포함)
-    max_tx_query = select(Transaction, Category.name).join(
-        Category, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_day,
-            Transaction.transaction_time < end_of_day,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).order_by(Transaction.amount.desc()).limit(1)
-    max_tx_result = await db.execute(max_tx_query)
-    max_tx_row = max_tx_result.first()
-    
-    max_transaction = max_tx_row[0] if max_tx_row else None
-    max_cat_name = max_tx_row[1] if max_tx_row else None
 
-    # 이상 거래 조회
-    fraud_tx_query = select(Transaction).where(
-        and_(
-            Transaction.transaction_time >= start_of_day,
-            Transaction.transaction_time < end_of_day,
-            Transaction.is_fraudulent == True
-        )
-    ).order_by(Transaction.transaction_time.desc())
-    fraud_tx_result = await db.execute(fraud_tx_query)
-    fraud_transactions = fraud_tx_result.scalars().all()
-
-    # 그저께 거래 데이터 (이상 거래 제외)
-    day_before_query = select(
-        func.sum(Transaction.amount).label("total_amount")
-    ).where(
-        and_(
-            Transaction.transaction_time >= day_before_yesterday_start,
-            Transaction.transaction_time < day_before_yesterday_end,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
+async def generate_daily_report(db: AsyncSession) -> Dict[str, Any]:
+    """
+    일간 리포트 데이터를 생성합니다. (어제 하루, 비교: 그저께)
+    """
+    return await build_period_report(
+        db, ReportPeriod.daily(), "일간 소비", date_format="%H:%M", fraud_date_format="%H:%M"
     )
-    day_before_result = await db.execute(day_before_query)
-    day_before_data = day_before_result.first()
 
-    # 카테고리별 집계 (이상 거래 제외)
-    category_query = select(
-        Category.name,
-        func.sum(Transaction.amount).label("amount"),
-        func.count(Transaction.id).label("count")
-    ).join(
-        Transaction, Transaction.category_id == Category.id
-    ).where(
-        and_(
-            Transaction.transaction_time >= start_of_day,
-            Transaction.transaction_time < end_of_day,
-            Transaction.status == "completed",
-            Transaction.is_fraudulent == False
-        )
-    ).group_by(Category.name).order_by(func.sum(Transaction.amount).desc()).limit(5)
-    
-    category_result = await db.execute(category_query)
-    categories = category_result.all()
 
-    # 전일 대비 증감율 계산
-    yesterday_total = float(yesterday_data.total_amount or 0)
-    day_before_total = float(day_before_data.total_amount or 0)
-    
-    if day_before_total > 0:
-        change_rate = ((yesterday_total - day_before_total) / day_before_total) * 100
-    else:
-        change_rate = 0
-    
-    report_data = {
-        "period_start": start_of_day.strftime("%Y-%m-%d"),
-        "period_end": start_of_day.strftime("%Y-%m-%d"),
-        "total_amount": yesterday_total,
-        "transaction_count": yesterday_data.count or 0,
-        "change_rate": round(change_rate, 1),
-        "top_categories": [],
-        "max_transaction": None,
-        "fraud_transactions": []
-    }
-
-    # 카테고리 데이터 처리
-    if categories and yesterday_total > 0:
-        for cat in categories:
-            cat_amount = float(cat.amount)
-            # 전체 지출액 대비 비중으로 계산
-            percentage = (cat_amount / yesterday_total) * 100
-            report_data["top_categories"].append({
-                "name": cat.name, 
-                "amount": cat_amount, 
-                "count": int(cat.count),
-                "percent": percentage
-            })
-            
-    if max_transaction:
-        report_data["max_transaction"] = {
-            "merchant_name": max_transaction.merchant_name,
-            "amount": float(max_transaction.amount),
-            "date": max_transaction.transaction_time.strftime("%H:%M"),
-            "category": max_cat_name
-        }
-
-    # 이상 거래 데이터 처리
-    for tx in fraud_transactions:
-        report_data["fraud_transactions"].append({
-            "merchant_name": tx.merchant_name,
-            "amount": float(tx.amount),
-            "date": tx.transaction_time.strftime("%H:%M"),
-            "description": tx.description
-        })
-
-    # AI Insight 생성
-    try:
-        # 일간 리포트는 데이터 양이 적으므로 간략한 프롬프트 사용
-        prompt = generate_report_prompt("일간 소비", report_data)
-        ai_insight = await call_gemini_api(prompt)
-        report_data["ai_insight"] = ai_insight
-        logger.info(f"Generated AI Insight (Daily): {ai_insight}")
-    except Exception as e:
-        logger.error(f"Failed to generate AI insight: {e}")
-        report_data["ai_insight"] = "AI 분석을 불러올 수 없습니다."
-
-    return report_data
+async def generate_custom_report(db: AsyncSession, first_day: date, last_day: date) -> Dict[str, Any]:
+    """
+    임의 기간 리포트 데이터를 생성합니다. (first_day ~ last_day, 비교: 바로 앞의 같은 일수)
+    """
+    return await build_period_report(db, ReportPeriod.custom(first_day, last_day), "기간 소비")
 
 
 def format_report_html(report_data: Dict[str, Any]) -> str:
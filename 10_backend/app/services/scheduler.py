@@ -2,15 +2,20 @@
 스케줄러 서비스
 
 APScheduler를 사용하여 주간/월간 리포트를 자동으로 생성하고 발송합니다.
+이상거래 탐지 워커도 주기적으로 실행합니다 (거래 추가 시 trigger_anomaly_detection()으로 즉시 실행).
 """
 
 import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.db.database import get_engine
+from app.core.settings import settings as app_settings
+from app.services.model_registry import get_model_registry
+import asyncio
 from app.services.report_service import (
     generate_weekly_report,
     generate_monthly_report,
@@ -199,6 +204,51 @@ async def send_monthly_report_job():
         await db.close()
 
 
+async def run_anomaly_detection_job():
+    """
+    새 거래에 대한 이상거래 탐지 작업입니다.
+    ANOMALY_DETECTION_INTERVAL_SECONDS 간격으로 실행되며, 거래 추가 시 즉시 실행되기도 합니다.
+    """
+    # pandas / 사기 탐지 모델은 첫 실행 시 로드 (서버 시작 시간 단축)
+    from app.services.anomaly_detection import run_anomaly_detection
+
+    db = await get_db_session()
+    try:
+        scanned = await run_anomaly_detection(db)
+        if scanned:
+            logger.info(f"Anomaly detection finished: {scanned} transactions scanned")
+    except Exception as e:
+        logger.error(f"Anomaly detection failed: {str(e)}", exc_info=True)
+    finally:
+        await db.close()
+
+
+async def refresh_models_job():
+    """
+    모델 레지스트리의 CURRENT 변경을 확인하여 새 버전으로 교체하는 작업입니다.
+    워커 프로세스마다 실행되므로 모든 워커가 같은 버전으로 수렴합니다.
+    """
+    try:
+        swapped = await asyncio.to_thread(get_model_registry().refresh)
+        if swapped:
+            logger.info(f"Models hot-swapped: {swapped}")
+    except Exception as e:
+        logger.error(f"Model refresh failed: {str(e)}", exc_info=True)
+
+
+def trigger_anomaly_detection():
+    """
+    이상거래 탐지 작업을 지금 바로 실행하도록 예약합니다 (거래 추가 API에서 호출).
+    이미 실행 중이면 max_instances=1 설정에 따라 겹쳐 실행되지 않습니다.
+    """
+    if scheduler is None:
+        return
+    try:
+        scheduler.modify_job("anomaly_detection", next_run_time=datetime.now(scheduler.timezone))
+    except Exception as e:
+        logger.warning(f"Failed to trigger anomaly detection: {str(e)}")
+
+
 def start_scheduler():
     """
     스케줄러를 시작합니다.
@@ -240,6 +290,29 @@ def start_scheduler():
         replace_existing=True
     )
     
+    # 이상거래 탐지: 주기 실행 (시작 직후 한 번 실행하여 밀린 거래 처리)
+    scheduler.add_job(
+        run_anomaly_detection_job,
+        trigger=IntervalTrigger(seconds=app_settings.anomaly_detection_interval_seconds),
+        id="anomaly_detection",
+        name="Detect Anomalies",
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
+    
+    # 모델 레지스트리 새 버전 확인
+    scheduler.add_job(
+        refresh_models_job,
+        trigger=IntervalTrigger(seconds=app_settings.model_registry_refresh_seconds),
+        id="model_registry_refresh",
+        name="Refresh ML Models",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True
+    )
+    
     # 스케줄러 시작
     scheduler.start()
     
@@ -248,6 +321,8 @@ def start_scheduler():
     logger.info("  - Daily Report: Every day 07:00")
     logger.info("  - Weekly Report: Every Monday 09:00")
     logger.info("  - Monthly Report: Every 1st day of month 09:00")
+    logger.info(f"  - Anomaly Detection: Every {app_settings.anomaly_detection_interval_seconds}s (and on new transactions)")
+    logger.info(f"  - Model Registry Refresh: Every {app_settings.model_registry_refresh_seconds}s")
     logger.info("=" * 60)
 
 
@@ -0,0 +1,274 @@
+"""
+일별 소비 집계(rollup) 서비스
+
+daily_spend_rollup 테이블(사용자/일/카테고리별 합계·건수)을 관리하고,
+대시보드(analysis) / 일·주·월간 리포트 / 챗봇 소비 요약이 transactions 대신 읽는 조회 함수를 제공합니다.
+기간 집계 비용이 거래 이력 크기와 무관하게 "기간 일수 x 카테고리 수" 행으로 고정됩니다.
+
+- 거래 추가 시 record_spend()로 증분 반영 (unnest + UPSERT 한 번, 거래 INSERT와 같은 트랜잭션)
+- 이상거래 신고/해제 시 apply_fraud_flag()로 정상 <-> 이상거래 합계 이동
+- 대량 삭제/재적재 또는 초기 적재 시 rebuild_spend_rollup()으로 재계산 (scripts/backfill_spend_rollup.py)
+- 앱 시작 시 테이블이 비어 있고 거래가 있으면 spend_rollup_needs_backfill()로 확인해 경고 (db_init)
+  (채우기는 migrations/add_daily_spend_rollup.sql 또는 scripts/backfill_spend_rollup.py, 부팅을 막지 않음)
+- 일자 경계는 DB에서 CAST(transaction_time AS DATE)로 계산하므로 증분/재계산 결과가 항상 같습니다.
+
+집계는 상태(status)와 무관하게 모든 거래를 포함합니다 (등록 경로는 모두 'completed'로 저장).
+"""
+
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Date, cast, delete, func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.model.spend_rollup import DailySpendRollup
+from app.db.model.transaction import Transaction
+from app.db.model.user import User
+
+logger = logging.getLogger(__name__)
+
+# (금액, category_id, 거래 시각)
+SpendRow = Tuple[Any, Optional[int], datetime]
+# 기간 경계 (datetime은 날짜만 사용, 시작 포함 / 끝 미포함)
+DayBound = Union[date, datetime, None]
+
+# 새 거래를 (일, 카테고리)별로 합쳐 한 번에 UPSERT
+RECORD_SPEND_SQL = text("""
+    INSERT INTO daily_spend_rollup (user_id, day, category_key, total, count, fraud_total, fraud_count)
+    SELECT CAST(:user_id AS BIGINT), CAST(r.tx_time AS DATE), r.category_key, SUM(r.amount), COUNT(*), 0, 0
+    FROM unnest(
+        CAST(:amounts AS NUMERIC[]), CAST(:category_keys AS BIGINT[]), CAST(:times AS TIMESTAMPTZ[])
+    ) AS r(amount, category_key, tx_time)
+    GROUP BY 2, 3
+    ON CONFLICT (user_id, day, category_key) DO UPDATE SET
+        total = daily_spend_rollup.total + EXCLUDED.total,
+        count = daily_spend_rollup.count + EXCLUDED.count,
+        updated_at = CURRENT_TIMESTAMP
+""")
+
+# 거래의 이상거래 플래그 변경분을 정상/이상거래 합계 사이에서 이동 (:sign = 1 신고, -1 해제)
+APPLY_FRAUD_FLAG_SQL = text("""
+    UPDATE daily_spend_rollup r SET
+        total = r.total - d.amount,
+        count = r.count - d.cnt,
+        fraud_total = r.fraud_total + d.amount,
+        fraud_count = r.fraud_count + d.cnt,
+        updated_at = CURRENT_TIMESTAMP
+    FROM (
+        SELECT user_id, CAST(transaction_time AS DATE) AS day, COALESCE(category_id, 0) AS category_key,
+               SUM(amount) * CAST(:sign AS INTEGER) AS amount, COUNT(*) * CAST(:sign AS INTEGER) AS cnt
+        FROM transactions
+        WHERE id = ANY(CAST(:ids AS BIGINT[]))
+        GROUP BY 1, 2, 3
+    ) d
+    WHERE r.user_id = d.user_id AND r.day = d.day AND r.category_key = d.category_key
+""")
+
+
+
+def _to_day(value: DayBound) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+# ============================================================
+# 갱신
+# ============================================================
+
+async def record_spend(db: AsyncSession, user_id: int, rows: Iterable[SpendRow]) -> None:
+    """
+    새로 추가된 (정상) 거래를 일별 집계에 증분 반영
+
+    호출 측 트랜잭션 안에서 실행되므로 거래 INSERT와 함께 커밋/롤백됩니다.
+    """
+    amounts, category_keys, times = [], [], []
+    for amount, category_id, tx_time in rows:
+        amounts.append(amount if isinstance(amount, Decimal) else Decimal(str(amount)))
+        category_keys.append(category_id or 0)
+        times.append(tx_time)
+    if not amounts:
+        return
+    await db.execute(RECORD_SPEND_SQL, {
+        "user_id": user_id, "amounts": amounts, "category_keys": category_keys, "times": times
+    })
+
+
+async def apply_fraud_flag(db: AsyncSession, transaction_ids: Sequence[int], fraudulent: bool = True) -> None:
+    """
+    is_fraudulent가 바뀌는 거래의 금액을 정상 <-> 이상거래 합계로 이동
+
+    플래그가 실제로 바뀌는 거래만 넘겨야 합니다 (이미 신고된 거래를 다시 넘기면 두 번 이동).
+    """
+    if not transaction_ids:
+        return
+    await db.execute(APPLY_FRAUD_FLAG_SQL, {"ids": list(transaction_ids), "sign": 1 if fraudulent else -1})
+
+
+async def rebuild_spend_rollup(
+    db: AsyncSession,
+    user_id: Optional[int] = None,
+    start: DayBound = None,
+    end: DayBound = None,
+) -> int:
+    """
+    transactions에서 일별 집계를 다시 계산 (초기 적재, 대량 삭제/재적재 후)
+
+    user_id / [start, end) 범위의 집계 행을 지우고 GROUP BY 결과로 다시 채웁니다.
+    Returns: 저장한 집계 행 수
+    """
+    start_day, end_day = _to_day(start), _to_day(end)
+    day = cast(Transaction.transaction_time, Date)
+    # GROUP BY에 바인드 파라미터가 들어가지 않도록 상수는 literal_column 사용
+    category_key = func.coalesce(Transaction.category_id, literal_column("0"))
+    normal = Transaction.is_fraudulent == False
+    fraud = Transaction.is_fraudulent == True
+
+    rollup_conditions, tx_conditions = [], []
+    if user_id is not None:
+        rollup_conditions.append(DailySpendRollup.user_id == user_id)
+        tx_conditions.append(Transaction.user_id == user_id)
+    if start_day is not None:
+        rollup_conditions.append(DailySpendRollup.day >= start_day)
+        tx_conditions.append(day >= start_day)
+    if end_day is not None:
+        rollup_conditions.append(DailySpendRollup.day < end_day)
+        tx_conditions.append(day < end_day)
+
+    await db.execute(delete(DailySpendRollup).where(*rollup_conditions))
+
+    grouped = (
+        select(
+            Transaction.user_id,
+            day,
+            category_key,
+            func.coalesce(func.sum(Transaction.amount).filter(normal), literal_column("0")),
+            func.count().filter(normal),
+            func.coalesce(func.sum(Transaction.amount).filter(fraud), literal_column("0")),
+            func.count().filter(fraud),
+        )
+        .where(*tx_conditions)
+        .group_by(Transaction.user_id, day, category_key)
+    )
+    result = await db.execute(
+        insert(DailySpendRollup).from_select(
+            ["user_id", "day", "category_key", "total", "count", "fraud_total", "fraud_count"],
+            grouped,
+        )
+    )
+    return result.rowcount or 0
+
+
+async def spend_rollup_needs_backfill(db: AsyncSession) -> bool:
+    """
+    집계 테이블이 비어 있는데 거래가 있는지 확인 (앱 시작 시)
+
+    기존 배포에서 create_all이 daily_spend_rollup을 빈 테이블로 만든 경우 대시보드/리포트가
+    과거 소비를 0으로 보게 됩니다. 전체 재계산은 거래 수에 비례해 오래 걸리고 실행 중인 증분 갱신과
+    겹치면 안 되므로 시작 과정에서 하지 않고, 마이그레이션이나 backfill 스크립트로 채웁니다.
+    """
+    return bool((await db.execute(text(
+        "SELECT NOT EXISTS (SELECT 1 FROM daily_spend_rollup) AND EXISTS (SELECT 1 FROM transactions)"
+    ))).scalar())
+
+
+async def reset_user_spend_rollup(db: AsyncSession, user_id: int) -> None:
+    """사용자 거래 전체 삭제 시 일별 집계도 비움"""
+    await db.execute(delete(DailySpendRollup).where(DailySpendRollup.user_id == user_id))
+
+
+# ============================================================
+# 조회
+# ============================================================
+
+def _rollup_select(
+    *columns,
+    start: DayBound = None,
+    end: DayBound = None,
+    user_id: Optional[int] = None,
+    exclude_superusers: bool = False,
+):
+    query = select(*columns).select_from(DailySpendRollup)
+    if exclude_superusers:
+        query = query.join(User, User.id == DailySpendRollup.user_id).where(User.is_superuser == False)
+    if user_id is not None:
+        query = query.where(DailySpendRollup.user_id == user_id)
+    if start is not None:
+        query = query.where(DailySpendRollup.day >= _to_day(start))
+    if end is not None:
+        query = query.where(DailySpendRollup.day < _to_day(end))
+    return query
+
+
+def _measures(include_fraud: bool):
+    if include_fraud:
+        return DailySpendRollup.total + DailySpendRollup.fraud_total, DailySpendRollup.count + DailySpendRollup.fraud_count
+    return DailySpendRollup.total, DailySpendRollup.count
+
+
+async def get_spend_totals(
+    db: AsyncSession,
+    start: DayBound = None,
+    end: DayBound = None,
+    user_id: Optional[int] = None,
+    exclude_superusers: bool = False,
+    include_fraud: bool = False,
+) -> Tuple[float, int]:
+    """
+    기간 [start, end) 합계와 건수
+
+    Args:
+        exclude_superusers: 관리자 계정 거래 제외 (관리자용 전체 사용자 통계)
+        include_fraud: 이상거래 포함 (기본은 정상 거래만)
+    """
+    amount, count = _measures(include_fraud)
+    query = _rollup_select(
+        func.coalesce(func.sum(amount), 0), func.coalesce(func.sum(count), 0),
+        start=start, end=end, user_id=user_id, exclude_superusers=exclude_superusers,
+    )
+    total, tx_count = (await db.execute(query)).one()
+    return float(total or 0), int(tx_count or 0)
+
+
+async def get_spend_by_category(
+    db: AsyncSession,
+    start: DayBound = None,
+    end: DayBound = None,
+    user_id: Optional[int] = None,
+    exclude_superusers: bool = False,
+    include_fraud: bool = False,
+) -> List[Tuple[Optional[int], float, int]]:
+    """
+    기간 [start, end) 카테고리별 (category_id, 합계, 건수), 합계 내림차순
+
+    카테고리 없는 거래는 category_id None으로 반환합니다 (이름은 category_registry로 매핑).
+    """
+    amount, count = _measures(include_fraud)
+    query = _rollup_select(
+        DailySpendRollup.category_key, func.sum(amount), func.sum(count),
+        start=start, end=end, user_id=user_id, exclude_superusers=exclude_superusers,
+    ).group_by(DailySpendRollup.category_key).having(func.sum(count) > 0).order_by(func.sum(amount).desc())
+    return [
+        (category_key or None, float(total or 0), int(tx_count or 0))
+        for category_key, total, tx_count in (await db.execute(query)).all()
+    ]
+
+
+async def get_monthly_spend(
+    db: AsyncSession,
+    months: int,
+    user_id: Optional[int] = None,
+    exclude_superusers: bool = False,
+) -> List[Tuple[str, float, int]]:
+    """거래가 있는 최근 months개월의 ('YYYY-MM', 합계, 건수), 최신월 먼저"""
+    month = func.to_char(DailySpendRollup.day, literal_column("'YYYY-MM'"))
+    query = _rollup_select(
+        month, func.sum(DailySpendRollup.total), func.sum(DailySpendRollup.count),
+        user_id=user_id, exclude_superusers=exclude_superusers,
+    ).group_by(month).having(func.sum(DailySpendRollup.count) > 0).order_by(month.desc()).limit(months)
+    return [
+        (label, float(total or 0), int(tx_count or 0))
+        for label, total, tx_count in (await db.execute(query)).all()
+    ]
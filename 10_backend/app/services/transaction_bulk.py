@@ -0,0 +1,274 @@
+"""
+거래 일괄 등록 서비스
+
+POST /api/transactions/bulk (CSV 업로드 결과 저장), POST /api/transactions/test-data 에서 사용합니다.
+모든 행을 먼저 파싱/검증한 뒤, 통과한 행만 한 번에 저장합니다.
+
+- 기본: 배치 단위 multi-row INSERT (asyncpg에서는 insertmanyvalues로 VALUES (...), (...) 묶음 실행)
+- 대량(TRANSACTION_COPY_MIN_ROWS 이상) 또는 use_copy=True: PostgreSQL COPY FROM STDIN (asyncpg copy_records_to_table)
+  세션과 같은 연결/트랜잭션에서 실행되므로 커밋·롤백은 호출자가 그대로 처리합니다.
+- 시연용 시드 CSV(synthetic_transactions_3000_2026.csv)는 처음 한 번만 읽어 메모리에 보관합니다.
+
+검증에 실패한 행은 요청 목록 기준 인덱스와 사유를 반환하며 나머지 행은 저장됩니다.
+"""
+
+import csv
+import logging
+import math
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.db.model.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Numeric(12, 2) / String 길이 제한 (DB 오류로 배치 전체가 실패하지 않도록 미리 검사)
+MAX_AMOUNT = 10 ** 10
+MAX_CURRENCY_LENGTH = 10
+MAX_MERCHANT_LENGTH = 255
+
+# COPY 대상 컬럼 (id/created_at은 DB 기본값, is_fraudulent는 Python 기본값이라 COPY에서는 직접 채움)
+COPY_COLUMNS = (
+    "user_id", "category_id", "amount", "currency", "merchant_name",
+    "description", "status", "transaction_time", "is_fraudulent",
+)
+
+# 시연용 시드 데이터 (날짜,시간,타입,대분류,소분류,내용,금액,화폐,결제수단,메모)
+SEED_CSV_FILENAME = "synthetic_transactions_3000_2026.csv"
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # /10_backend/app
+SEED_CSV_PATHS = (
+    os.path.join(os.path.dirname(_APP_DIR), SEED_CSV_FILENAME),  # 10_backend 기준 (우선)
+    os.path.join("/app", SEED_CSV_FILENAME),  # Docker 컨테이너 경로
+    os.path.join(os.getcwd(), SEED_CSV_FILENAME),  # 현재 디렉토리
+    os.path.join(_APP_DIR, SEED_CSV_FILENAME),  # app 기준
+)
+
+# ':' 개수로 형식을 고르므로 행마다 strptime은 최대 1회
+_TIME_FORMATS = {
+    2: "%Y-%m-%d %H:%M:%S",  # 초는 버림
+    1: "%Y-%m-%d %H:%M",
+    0: "%Y-%m-%d",
+}
+
+
+@dataclass
+class BulkRowError:
+    """검증 실패 행 (index: 요청 transactions 배열 기준)"""
+    index: int
+    error: str
+
+
+@dataclass(frozen=True)
+class SeedTransaction:
+    """시드 CSV 한 행 (transaction_time이 None이면 저장 시각 사용)"""
+    transaction_time: Optional[datetime]
+    category_name: str
+    merchant_name: str
+    amount: float
+    currency: str
+
+
+# 시드 데이터 캐시 (프로세스당 1회 로드)
+_seed_transactions: Optional[List[SeedTransaction]] = None
+
+
+def _read_seed_csv(path: str) -> List[SeedTransaction]:
+    seeds = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            try:
+                amount = float(row.get('금액', 0))
+            except (TypeError, ValueError):
+                logger.warning(f"시드 데이터 금액 오류: {row}")
+                continue
+            try:
+                tx_time = datetime.strptime(f"{row.get('날짜', '')} {row.get('시간', '')}", "%Y-%m-%d %H:%M")
+            except ValueError:
+                tx_time = None
+            seeds.append(SeedTransaction(
+                transaction_time=tx_time,
+                category_name=row.get('대분류', '생활'),
+                merchant_name=row.get('내용', '알수없음'),
+                amount=amount,
+                currency=row.get('화폐', 'KRW'),
+            ))
+    return seeds
+
+
+def get_seed_transactions() -> List[SeedTransaction]:
+    """
+    시드 거래 목록 (첫 호출 시 CSV를 파싱해 캐시)
+
+    Raises:
+        FileNotFoundError: 후보 경로 어디에도 CSV가 없을 때
+    """
+    global _seed_transactions
+    if _seed_transactions is None:
+        csv_path = next((path for path in SEED_CSV_PATHS if os.path.exists(path)), None)
+        if csv_path is None:
+            raise FileNotFoundError(f"테스트 데이터 CSV 파일을 찾을 수 없습니다. 시도한 경로: {list(SEED_CSV_PATHS)}")
+        _seed_transactions = _read_seed_csv(csv_path)
+        logger.info(f"Seed transactions cached: {len(_seed_transactions)} rows ({csv_path})")
+    return _seed_transactions
+
+
+def build_seed_rows(
+    user_id: int,
+    seeds: Sequence[SeedTransaction],
+    categories: Dict[str, int],
+) -> List[dict]:
+    """시드 거래를 INSERT 행으로 변환 (없는 카테고리는 '생활', 그것도 없으면 첫 카테고리)"""
+    default_category_id = categories.get('생활') or next(iter(categories.values()))
+    now = datetime.now()
+    return [
+        {
+            "user_id": user_id,
+            "category_id": categories.get(seed.category_name) or default_category_id,
+            "amount": seed.amount,
+            "currency": seed.currency,
+            "merchant_name": seed.merchant_name,
+            "description": None,
+            "status": "completed",
+            "transaction_time": seed.transaction_time or now,
+            "is_fraudulent": False,
+        }
+        for seed in seeds
+    ]
+
+
+def parse_bulk_transaction_time(value: str) -> datetime:
+    """
+    일괄 등록 거래 시각 파싱
+
+    YYYY-MM-DD HH:MM:SS (초 버림) / YYYY-MM-DD HH:MM / YYYY-MM-DD,
+    어느 형식도 아니면 최근 1년 내 임의 시각 (기존 동작 유지)
+    """
+    fmt = _TIME_FORMATS.get(value.count(":"))
+    if fmt is not None:
+        try:
+            return datetime.strptime(value, fmt).replace(second=0, microsecond=0)
+        except ValueError:
+            pass
+    days_ago = random.randint(0, 365)
+    return (datetime.now() - timedelta(days=days_ago)).replace(second=0, microsecond=0)
+
+
+def prepare_bulk_rows(
+    user_id: int,
+    transactions: Sequence,
+    categories: Dict[str, int],
+) -> Tuple[List[dict], List[Tuple[float, Optional[str], datetime]], List[BulkRowError]]:
+    """
+    요청 행을 INSERT 파라미터로 변환
+
+    Args:
+        transactions: TransactionCreate 목록 (amount, category, merchant, description, transaction_date, currency)
+        categories: {카테고리명: id}
+    Returns:
+        (INSERT 행 목록, 피처 스토어 반영용 (금액, 카테고리명, 거래 시각) 목록, 실패 행 목록)
+    """
+    category_names = {cat_id: name for name, cat_id in categories.items()}
+    default_category_id = categories.get('기타') or (next(iter(categories.values())) if categories else None)
+
+    rows, feature_rows, errors = [], [], []
+    for index, tx in enumerate(transactions):
+        if tx.transaction_date is None:
+            errors.append(BulkRowError(index, "transaction_date 누락"))
+            continue
+        amount = tx.amount
+        if not math.isfinite(amount) or abs(amount) >= MAX_AMOUNT:
+            errors.append(BulkRowError(index, f"허용 범위를 벗어난 금액: {amount}"))
+            continue
+        currency = tx.currency or "KRW"
+        if len(currency) > MAX_CURRENCY_LENGTH:
+            errors.append(BulkRowError(index, f"통화 코드는 {MAX_CURRENCY_LENGTH}자 이하여야 합니다"))
+            continue
+        if tx.merchant and len(tx.merchant) > MAX_MERCHANT_LENGTH:
+            errors.append(BulkRowError(index, f"가맹점명은 {MAX_MERCHANT_LENGTH}자 이하여야 합니다"))
+            continue
+
+        category_id = categories.get(tx.category) or default_category_id
+        tx_time = parse_bulk_transaction_time(tx.transaction_date)
+        rows.append({
+            "user_id": user_id,
+            "category_id": category_id,
+            "amount": amount,
+            "currency": currency,
+            "merchant_name": tx.merchant,
+            "description": tx.description,
+            "status": "completed",
+            "transaction_time": tx_time,
+        })
+        feature_rows.append((amount, category_names.get(category_id), tx_time))
+    return rows, feature_rows, errors
+
+
+def _supports_copy(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.driver == "asyncpg"
+
+
+async def copy_transaction_rows(db: AsyncSession, rows: List[dict]) -> int:
+    """
+    COPY FROM STDIN (binary)으로 거래 행 저장 - 세션 트랜잭션 안에서 실행 (커밋은 호출자가 담당)
+
+    Returns: 저장한 행 수
+    """
+    if not rows:
+        return 0
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection  # asyncpg.Connection
+
+    if not driver_connection.is_in_transaction():
+        # SQLAlchemy asyncpg 어댑터는 첫 쿼리 때 트랜잭션을 시작하므로, COPY가 세션 트랜잭션에 포함되도록 먼저 시작
+        await db.execute(text("SELECT 1"))
+
+    records = [
+        (
+            row["user_id"],
+            row["category_id"],
+            Decimal(str(row["amount"])),
+            row.get("currency") or "KRW",
+            row.get("merchant_name"),
+            row.get("description"),
+            row.get("status", "completed"),
+            row["transaction_time"],
+            row.get("is_fraudulent", False),
+        )
+        for row in rows
+    ]
+    await driver_connection.copy_records_to_table(
+        Transaction.__tablename__, records=records, columns=COPY_COLUMNS
+    )
+    return len(records)
+
+
+async def insert_transaction_rows(
+    db: AsyncSession,
+    rows: List[dict],
+    batch_size: Optional[int] = None,
+    use_copy: Optional[bool] = None,
+) -> int:
+    """
+    거래 행 저장 (커밋은 호출자가 담당)
+
+    use_copy: None이면 TRANSACTION_COPY_MIN_ROWS 이상일 때 COPY 사용 (asyncpg가 아니면 항상 INSERT)
+    Returns: 저장한 행 수
+    """
+    if use_copy is None:
+        use_copy = len(rows) >= settings.transaction_copy_min_rows
+    if use_copy and _supports_copy(db):
+        return await copy_transaction_rows(db, rows)
+
+    batch_size = batch_size or settings.transaction_bulk_batch_size
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(Transaction), rows[start:start + batch_size])
+    return len(rows)
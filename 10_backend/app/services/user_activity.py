@@ -0,0 +1,87 @@
+"""
+사용자 활동(이탈) 판정 서비스
+
+최근 N일 내 거래가 없는 사용자를 이탈(churned)로 봅니다.
+사용자마다 거래를 조회하지 않고(N+1) 사용자 목록/집계 쿼리 하나에
+EXISTS 상관 서브쿼리를 붙여 모든 사용자를 한 번에 판정합니다.
+(PostgreSQL은 semi-join으로 실행하며 idx_transactions_user_time 인덱스로 사용자당 1건만 확인)
+
+GET /api/admin/users/, /new-signups, /churned, /stats/churn-rate 에서 사용합니다.
+벤치마크: python scripts/bench_churn.py
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.model.transaction import Transaction
+from app.db.model.user import User
+
+# 이탈 판정 기본 기간 (일)
+DEFAULT_CHURN_DAYS = 30
+
+
+def activity_cutoff(days: int) -> datetime:
+    return datetime.now() - timedelta(days=days)
+
+
+def has_recent_activity(days: int = DEFAULT_CHURN_DAYS) -> ColumnElement:
+    """users 행마다 최근 N일 내 거래 존재 여부 (EXISTS 상관 서브쿼리, User 쿼리에 사용)"""
+    return exists().where(
+        and_(
+            Transaction.user_id == User.id,
+            Transaction.transaction_time >= activity_cutoff(days),
+        )
+    )
+
+
+async def list_users_with_activity(
+    db: AsyncSession,
+    *conditions,
+    order_by=None,
+    days: int = DEFAULT_CHURN_DAYS,
+    churned_only: bool = False,
+) -> List[Tuple[User, bool]]:
+    """
+    사용자 목록과 최근 활동 여부를 쿼리 1회로 조회
+
+    Args:
+        conditions: User 필터 조건
+        churned_only: True면 이탈 사용자만 (최근 N일 거래 없음)
+    Returns:
+        [(User, has_recent_activity), ...]
+    """
+    activity = has_recent_activity(days)
+    query = select(User, activity.label("has_recent_activity")).where(*conditions)
+    if churned_only:
+        query = query.where(~activity)
+    if order_by is not None:
+        query = query.order_by(order_by)
+    result = await db.execute(query)
+    return [(user, bool(active)) for user, active in result.all()]
+
+
+async def get_churn_counts(
+    db: AsyncSession,
+    churn_days: int = DEFAULT_CHURN_DAYS,
+    signup_days: Optional[int] = None,
+) -> Tuple[int, int, int]:
+    """
+    일반 사용자(슈퍼유저 제외) 수 / 이탈 사용자 수 / 신규 가입자 수를 집계 쿼리 1회로 계산
+
+    Returns:
+        (total_users, total_churned, new_signups) - signup_days가 None이면 new_signups는 0
+    """
+    columns = [
+        func.count(User.id),
+        func.count(User.id).filter(~has_recent_activity(churn_days)),
+    ]
+    if signup_days is not None:
+        columns.append(func.count(User.id).filter(User.created_at >= activity_cutoff(signup_days)))
+    row = (await db.execute(select(*columns).where(User.is_superuser == False))).one()
+    total_users, total_churned = row[0] or 0, row[1] or 0
+    new_signups = (row[2] or 0) if signup_days is not None else 0
+    return total_users, total_churned, new_signups
@@ -0,0 +1,8 @@
+-- 이상거래 탐지 워커 도입에 따른 인덱스 추가
+-- GET /api/anomalies는 저장된 anomalies만 조회하므로 조회 조건(미처리 여부/사용자 + 최신순)에 맞춘 인덱스를 둡니다.
+-- 탐지 워커의 하이워터마크는 admin_settings(key = 'anomaly_detection.last_transaction_id')에 저장되며
+-- 처음 실행될 때 자동으로 생성됩니다.
+
+CREATE INDEX IF NOT EXISTS idx_anomalies_resolved_created ON anomalies (is_resolved, created_at);
+CREATE INDEX IF NOT EXISTS idx_anomalies_user_created ON anomalies (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_anomalies_transaction_id ON anomalies (transaction_id);
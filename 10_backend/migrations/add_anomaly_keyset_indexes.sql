@@ -0,0 +1,9 @@
+-- GET /api/anomalies 키셋 페이지네이션 ((created_at, id) 내림차순) 지원 인덱스
+-- add_anomaly_detection_indexes.sql의 (is_resolved, created_at) / (user_id, created_at) 인덱스를
+-- 정렬 키 전체를 포함하도록 교체합니다.
+
+DROP INDEX IF EXISTS idx_anomalies_resolved_created;
+DROP INDEX IF EXISTS idx_anomalies_user_created;
+
+CREATE INDEX IF NOT EXISTS idx_anomalies_resolved_created ON anomalies (is_resolved, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_anomalies_user_created ON anomalies (user_id, created_at DESC, id DESC);
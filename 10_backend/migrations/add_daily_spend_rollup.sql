@@ -0,0 +1,39 @@
+-- 일별 소비 집계(rollup) 테이블 생성
+-- 대시보드(분석), 일/주/월간 리포트, 챗봇 소비 요약이 transactions 전체를 SUM/COUNT 하지 않고
+-- 사용자/일/카테고리별 집계 행만 읽도록 합니다. (거래 등록/이상거래 신고 시 증분 갱신)
+-- 재계산: python scripts/backfill_spend_rollup.py [--user-id N] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+
+CREATE TABLE IF NOT EXISTS daily_spend_rollup (
+    user_id BIGINT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,  -- transaction_time::date (DB 세션 타임존)
+    category_key BIGINT NOT NULL,  -- COALESCE(category_id, 0)
+    total NUMERIC(14, 2) NOT NULL DEFAULT 0,  -- 정상 거래 합계
+    count BIGINT NOT NULL DEFAULT 0,
+    fraud_total NUMERIC(14, 2) NOT NULL DEFAULT 0,  -- 이상거래(is_fraudulent) 합계
+    fraud_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, day, category_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_spend_rollup_day ON daily_spend_rollup (day);
+
+-- 기존 거래 내역으로 초기값 채우기 (다시 실행해도 같은 결과)
+INSERT INTO daily_spend_rollup (user_id, day, category_key, total, count, fraud_total, fraud_count)
+SELECT
+    t.user_id,
+    CAST(t.transaction_time AS DATE),
+    COALESCE(t.category_id, 0),
+    COALESCE(SUM(t.amount) FILTER (WHERE NOT t.is_fraudulent), 0),
+    COUNT(*) FILTER (WHERE NOT t.is_fraudulent),
+    COALESCE(SUM(t.amount) FILTER (WHERE t.is_fraudulent), 0),
+    COUNT(*) FILTER (WHERE t.is_fraudulent)
+FROM transactions t
+GROUP BY 1, 2, 3
+ON CONFLICT (user_id, day, category_key) DO UPDATE SET
+    total = EXCLUDED.total,
+    count = EXCLUDED.count,
+    fraud_total = EXCLUDED.fraud_total,
+    fraud_count = EXCLUDED.fraud_count,
+    updated_at = CURRENT_TIMESTAMP;
+
+ANALYZE daily_spend_rollup;
@@ -0,0 +1,11 @@
+-- GET /api/transactions 키셋 페이지네이션 ((transaction_time, id) 내림차순) 지원 인덱스
+-- add_user_category_recent_amounts.sql의 (user_id, transaction_time) 인덱스를
+-- 정렬 키 전체를 포함하도록 교체합니다. (기간 조회 / 이전 N건 조회도 같은 인덱스 사용)
+
+DROP INDEX IF EXISTS idx_transactions_user_time;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_user_time
+    ON transactions (user_id, transaction_time DESC, id DESC);
+
+-- total_mode=estimate가 최신 통계를 쓰도록 갱신
+ANALYZE transactions;
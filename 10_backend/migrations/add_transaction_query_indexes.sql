@@ -0,0 +1,20 @@
+-- 거래 검색 조회 패턴에 맞춘 인덱스
+-- 가맹점/메모 ILIKE '%...%' 검색은 pg_trgm GIN 인덱스를 사용합니다.
+-- 목록·기간 조회는 idx_transactions_user_time / ix_transactions_transaction_time,
+-- 기간 합계는 daily_spend_rollup을 사용하므로 거래 테이블 부분 인덱스는 두지 않습니다
+-- (이전 버전으로 만든 인덱스는 drop_redundant_transaction_indexes.sql로 정리).
+-- anomalies(transaction_id), anomalies(is_resolved, created_at DESC, id DESC)는
+-- add_anomaly_detection_indexes.sql / add_anomaly_keyset_indexes.sql에 이미 있습니다.
+--
+-- 운영 테이블 잠금을 피하기 위해 CONCURRENTLY로 생성합니다 (트랜잭션 블록 밖에서 실행: psql -f).
+-- 적용 후 확인: python scripts/check_query_plans.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 가맹점/메모 부분 검색
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_merchant_trgm
+    ON transactions USING gin (merchant_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_description_trgm
+    ON transactions USING gin (description gin_trgm_ops);
+
+ANALYZE transactions;
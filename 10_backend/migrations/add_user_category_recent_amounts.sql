@@ -0,0 +1,25 @@
+-- 이상거래 탐지용 사용자/카테고리별 최근 거래 조회 최적화
+-- "카테고리별 최근 30건 평균 (Leave-One-Out)" 계산 시 사용자 전체 이력을 가져오지 않도록
+-- (1) 사용자/카테고리/시각 복합 인덱스로 LATERAL ... LIMIT 31 조회를 지원하고
+-- (2) 최근 31건을 캐시하는 user_category_recent_amounts 테이블을 추가합니다.
+
+-- 사용자/카테고리별 최근 N건 조회 (카테고리 없는 거래는 0으로 묶음)
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category_time
+    ON transactions (user_id, COALESCE(category_id, 0), transaction_time DESC, id DESC);
+
+-- 사용자별 기간 조회 (버스트 판정)
+CREATE INDEX IF NOT EXISTS idx_transactions_user_time
+    ON transactions (user_id, transaction_time);
+
+CREATE TABLE IF NOT EXISTS user_category_recent_amounts (
+    user_id BIGINT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    category_key BIGINT NOT NULL,  -- COALESCE(category_id, 0)
+    recent_ids BIGINT[] NOT NULL,  -- 최신순, 최대 31건
+    recent_amounts NUMERIC[] NOT NULL,
+    recent_times TIMESTAMP WITH TIME ZONE[] NOT NULL,
+    recent_avg NUMERIC,  -- 최근 30건 평균
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, category_key)
+);
+
+-- 캐시는 탐지 워커가 처음 보는 (사용자, 카테고리)에 대해 자동으로 채우므로 별도 초기 적재는 필요 없습니다.
@@ -0,0 +1,67 @@
+-- 사용자 피처 스토어 테이블 생성
+-- user_feature_stats 테이블은 다음 소비 카테고리 예측용 사용자별 누적 통계를 저장합니다.
+-- (거래 추가 시 증분 갱신, /api/ml/predict-next?user_id= 에서 사용)
+
+CREATE TABLE IF NOT EXISTS user_feature_stats (
+    user_id BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    tx_count BIGINT NOT NULL DEFAULT 0,
+    amount_mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+    amount_m2 DOUBLE PRECISION NOT NULL DEFAULT 0,  -- 평균 편차 제곱합 (RunningStats 상태)
+    amount_min DOUBLE PRECISION,
+    amount_max DOUBLE PRECISION,
+    category_0_count BIGINT NOT NULL DEFAULT 0,  -- 교통
+    category_1_count BIGINT NOT NULL DEFAULT 0,  -- 생활
+    category_2_count BIGINT NOT NULL DEFAULT 0,  -- 쇼핑
+    category_3_count BIGINT NOT NULL DEFAULT 0,  -- 식료품
+    category_4_count BIGINT NOT NULL DEFAULT 0,  -- 외식
+    category_5_count BIGINT NOT NULL DEFAULT 0,  -- 주유
+    category_6_count BIGINT NOT NULL DEFAULT 0,  -- 기타
+    last_transaction_time TIMESTAMP WITH TIME ZONE,
+    last_category_name VARCHAR(100),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 기존 거래 내역으로 채우기 (이미 있는 행도 재계산 값으로 덮어씀 - 앱이 먼저 만든 불완전한 행 보정)
+INSERT INTO user_feature_stats (
+    user_id, tx_count, amount_mean, amount_m2, amount_min, amount_max,
+    category_0_count, category_1_count, category_2_count, category_3_count,
+    category_4_count, category_5_count, category_6_count,
+    last_transaction_time, last_category_name
+)
+SELECT
+    t.user_id,
+    COUNT(*),
+    AVG(t.amount),
+    VAR_POP(t.amount) * COUNT(*),
+    MIN(t.amount),
+    MAX(t.amount),
+    COUNT(*) FILTER (WHERE c.name = '교통'),
+    COUNT(*) FILTER (WHERE c.name = '생활'),
+    COUNT(*) FILTER (WHERE c.name = '쇼핑'),
+    COUNT(*) FILTER (WHERE c.name IN ('식료품', '간식', '마트', '편의점')),
+    COUNT(*) FILTER (WHERE c.name IN ('외식', '식비', '카페', '카페/간식')),
+    COUNT(*) FILTER (WHERE c.name = '주유'),
+    COUNT(*) FILTER (WHERE c.name IS NULL OR c.name NOT IN (
+        '교통', '생활', '쇼핑', '식료품', '간식', '마트', '편의점', '외식', '식비', '카페', '카페/간식', '주유'
+    )),
+    MAX(t.transaction_time),
+    (ARRAY_AGG(c.name ORDER BY t.transaction_time DESC, t.id DESC))[1]
+FROM transactions t
+LEFT JOIN categories c ON c.id = t.category_id
+GROUP BY t.user_id
+ON CONFLICT (user_id) DO UPDATE SET
+    tx_count = EXCLUDED.tx_count,
+    amount_mean = EXCLUDED.amount_mean,
+    amount_m2 = EXCLUDED.amount_m2,
+    amount_min = EXCLUDED.amount_min,
+    amount_max = EXCLUDED.amount_max,
+    category_0_count = EXCLUDED.category_0_count,
+    category_1_count = EXCLUDED.category_1_count,
+    category_2_count = EXCLUDED.category_2_count,
+    category_3_count = EXCLUDED.category_3_count,
+    category_4_count = EXCLUDED.category_4_count,
+    category_5_count = EXCLUDED.category_5_count,
+    category_6_count = EXCLUDED.category_6_count,
+    last_transaction_time = EXCLUDED.last_transaction_time,
+    last_category_name = EXCLUDED.last_category_name,
+    updated_at = CURRENT_TIMESTAMP;
@@ -0,0 +1,33 @@
+-- 사용자 피처 스토어 금액 통계를 RunningStats 상태로 전환
+-- amount_sum/amount_sq_sum(합계/제곱합) 대신 개수/평균/편차제곱합/최소/최대를 저장하고
+-- 거래 추가 시 새 거래의 배치 통계를 Chan 병합으로 합칩니다 (app/services/feature_store.py)
+-- (이전 버전 add_user_feature_stats_table.sql로 테이블을 만든 DB용, 새로 만드는 DB는 불필요)
+
+ALTER TABLE user_feature_stats
+    ADD COLUMN IF NOT EXISTS amount_mean DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS amount_m2 DOUBLE PRECISION NOT NULL DEFAULT 0,  -- 평균 편차 제곱합
+    ADD COLUMN IF NOT EXISTS amount_min DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS amount_max DOUBLE PRECISION;
+
+-- 기존 행 변환: 평균/편차제곱합은 저장된 합계/제곱합에서 NUMERIC으로 정확히 계산, 최소/최대는 거래 내역에서
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'user_feature_stats' AND column_name = 'amount_sq_sum'
+    ) THEN
+        UPDATE user_feature_stats s SET
+            amount_mean = s.amount_sum / s.tx_count,
+            amount_m2 = GREATEST(s.amount_sq_sum - s.amount_sum * s.amount_sum / s.tx_count, 0),
+            amount_min = a.min_amount,
+            amount_max = a.max_amount
+        FROM (
+            SELECT user_id, MIN(amount) AS min_amount, MAX(amount) AS max_amount
+            FROM transactions
+            GROUP BY user_id
+        ) a
+        WHERE a.user_id = s.user_id AND s.tx_count > 0;
+
+        ALTER TABLE user_feature_stats DROP COLUMN amount_sum, DROP COLUMN amount_sq_sum;
+    END IF;
+END $$;
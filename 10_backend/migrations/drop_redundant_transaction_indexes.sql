@@ -0,0 +1,13 @@
+-- 중복 거래 인덱스 정리 (쓰기 비용/디스크 절감)
+-- - ix_transactions_user_id: idx_transactions_user_time 등 복합 인덱스의 선두 컬럼(user_id)과 중복
+-- - idx_transactions_user_time_active: idx_transactions_user_time과 키가 같고, 기간 합계가
+--   daily_spend_rollup으로 옮겨가 INCLUDE (amount, category_id)의 index-only scan도 더 이상 쓰이지 않음
+-- - idx_transactions_time_active: ix_transactions_transaction_time과 중복
+--   (리포트 이상거래 목록/관리자 목록은 is_fraudulent = true 행도 읽으므로 부분 인덱스를 쓸 수 없음)
+--
+-- 운영 테이블 잠금을 피하기 위해 CONCURRENTLY로 삭제합니다 (트랜잭션 블록 밖에서 실행: psql -f).
+-- 적용 후 확인: python scripts/check_query_plans.py
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_user_time_active;
+DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_time_active;
@@ -0,0 +1,49 @@
+"""
+일별 소비 집계(daily_spend_rollup) 재계산 (backfill)
+
+transactions에서 사용자/일/카테고리별 합계를 다시 계산해 저장합니다.
+테이블 최초 생성 후, 또는 SQL로 거래를 직접 수정/삭제한 뒤 실행합니다.
+범위를 주면 해당 사용자/기간의 집계 행만 지우고 다시 채웁니다. (end는 미포함)
+
+실행:
+    python scripts/backfill_spend_rollup.py                                   # 전체
+    python scripts/backfill_spend_rollup.py --user-id 1
+    python scripts/backfill_spend_rollup.py --start 2026-01-01 --end 2026-02-01
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.settings import settings
+from app.services.spend_rollup import rebuild_spend_rollup
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="일별 소비 집계 재계산")
+    parser.add_argument("--user-id", type=int, default=None, help="대상 사용자 (기본: 전체)")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="시작일 YYYY-MM-DD (포함)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="종료일 YYYY-MM-DD (미포함)")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url, echo=False)
+    try:
+        async with AsyncSession(engine) as db:
+            t0 = time.perf_counter()
+            rows = await rebuild_spend_rollup(db, user_id=args.user_id, start=args.start, end=args.end)
+            await db.commit()
+            print(f"daily_spend_rollup: {rows:,} rows rebuilt in {time.perf_counter() - t0:.2f}s")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
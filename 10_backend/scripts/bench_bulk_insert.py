@@ -0,0 +1,176 @@
+"""
+거래 일괄 등록 벤치마크: 행마다 strptime 최대 3회 + INSERT 1회 vs 사전 검증 + 배치 multi-row INSERT / COPY
+
+- 파싱: 기존 try/except strptime 체인 vs parse_bulk_transaction_time (결과 일치 확인)
+- 시드 CSV: 매 요청 csv.DictReader 재파싱 vs get_seed_transactions() 캐시
+- 저장 (DB 필요, 트랜잭션은 롤백하므로 데이터가 남지 않음, rows/sec 출력):
+  행마다 insert().values() vs multi-row INSERT (insert_transaction_rows) vs COPY FROM STDIN (use_copy=True)
+
+실행:
+    python scripts/bench_bulk_insert.py [행 수 ...]            # 기본값: 1000 10000 100000
+    python scripts/bench_bulk_insert.py --no-db                 # 파싱만 측정
+    python scripts/bench_bulk_insert.py --user-id 1 --legacy-max 10000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.settings import settings
+from app.db.model.transaction import Category, Transaction
+from app.db.model.user import User
+from app.services.transaction_bulk import (
+    SEED_CSV_PATHS, _read_seed_csv, get_seed_transactions,
+    insert_transaction_rows, parse_bulk_transaction_time, prepare_bulk_rows,
+)
+
+CATEGORIES = ["외식", "교통", "쇼핑", "식료품", "생활", "주유"]
+
+
+def make_transactions(n: int, seed: int = 0):
+    """실제 업로드처럼 세 가지 날짜 형식을 섞은 요청 행"""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    formats = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"]
+    return [
+        SimpleNamespace(
+            amount=float(rng.randint(1_000, 300_000)),
+            category=rng.choice(CATEGORIES),
+            merchant=f"가맹점{rng.randint(1, 500)}",
+            description=None,
+            transaction_date=(base + timedelta(minutes=rng.randint(0, 525_600))).strftime(rng.choice(formats)),
+            currency="KRW",
+        )
+        for _ in range(n)
+    ]
+
+
+def legacy_parse(value: str) -> datetime:
+    """기존 방식: 형식 3개를 차례로 시도"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(second=0, microsecond=0)
+    except ValueError:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M")
+        except ValueError:
+            return datetime.strptime(value, "%Y-%m-%d")
+
+
+def bench_parse(txs):
+    values = [tx.transaction_date for tx in txs]
+
+    t0 = time.perf_counter()
+    legacy = [legacy_parse(v) for v in values]
+    legacy_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    current = [parse_bulk_transaction_time(v) for v in values]
+    current_sec = time.perf_counter() - t0
+
+    assert legacy == current, "거래 시각 파싱 결과가 기존 방식과 다릅니다"
+    return legacy_sec, current_sec
+
+
+def bench_seed_cache(repeat: int = 20):
+    """시드 CSV: 매번 파싱 vs 캐시 (요청 1회 평균)"""
+    csv_path = next((path for path in SEED_CSV_PATHS if os.path.exists(path)), None)
+    if csv_path is None:
+        print("seed csv: 파일 없음 (건너뜀)")
+        return
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        seeds = _read_seed_csv(csv_path)
+    reread_ms = (time.perf_counter() - t0) / repeat * 1000
+
+    get_seed_transactions()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        get_seed_transactions()
+    cached_ms = (time.perf_counter() - t0) / repeat * 1000
+    print(f"seed csv ({len(seeds):,} rows): re-read {reread_ms:7.2f} ms/request | cached {cached_ms:.4f} ms/request")
+
+
+def rate(n: int, sec: float) -> str:
+    return f"{sec * 1000:9.1f} ms ({n / sec:>10,.0f} rows/s)"
+
+
+async def bench_insert(engine, user_id: int, txs, run_legacy: bool):
+    """같은 행을 세 방식으로 저장 (각각 롤백)"""
+    results = {}
+    async with AsyncSession(engine) as db:
+        categories = {c.name: c.id for c in (await db.execute(select(Category))).scalars().all()}
+        rows, _, errors = prepare_bulk_rows(user_id, txs, categories)
+        assert not errors, errors[:3]
+
+        if run_legacy:
+            t0 = time.perf_counter()
+            for row in rows:
+                await db.execute(insert(Transaction).values(**row))
+            results["legacy"] = time.perf_counter() - t0
+            await db.rollback()
+
+        t0 = time.perf_counter()
+        await insert_transaction_rows(db, rows, use_copy=False)
+        results["insert"] = time.perf_counter() - t0
+        await db.rollback()
+
+        t0 = time.perf_counter()
+        await insert_transaction_rows(db, rows, use_copy=True)
+        results["copy"] = time.perf_counter() - t0
+        await db.rollback()
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="거래 일괄 등록 벤치마크")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--no-db", action="store_true", help="DB 저장은 측정하지 않음")
+    parser.add_argument("--user-id", type=int, default=None, help="거래를 넣을 사용자 (기본: 첫 번째 사용자)")
+    parser.add_argument("--legacy-max", type=int, default=10_000, help="행별 INSERT를 측정할 최대 행 수")
+    args = parser.parse_args()
+
+    engine = None
+    user_id = args.user_id
+    if not args.no_db:
+        engine = create_async_engine(settings.database_url, echo=False)
+        if user_id is None:
+            async with AsyncSession(engine) as db:
+                user_id = (await db.execute(select(User.id).order_by(User.id).limit(1))).scalar()
+            if user_id is None:
+                raise SystemExit("users 테이블이 비어 있습니다. --user-id를 지정하세요.")
+        print(f"batch size: {settings.transaction_bulk_batch_size:,} rows / INSERT, user_id={user_id}")
+
+    bench_seed_cache()
+    try:
+        for n in args.sizes:
+            txs = make_transactions(n)
+            legacy_parse_sec, parse_sec = bench_parse(txs)
+            line = (
+                f"rows {n:>7,}: parse legacy {legacy_parse_sec * 1000:8.1f} ms | "
+                f"current {parse_sec * 1000:8.1f} ms"
+            )
+            print(line)
+            if engine is not None:
+                timing = await bench_insert(engine, user_id, txs, run_legacy=n <= args.legacy_max)
+                legacy = rate(n, timing["legacy"]) if "legacy" in timing else "(skipped)"
+                print(f"    per-row INSERT  : {legacy}")
+                print(f"    multi-row INSERT: {rate(n, timing['insert'])}")
+                print(f"    COPY FROM STDIN : {rate(n, timing['copy'])}")
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+이상거래 스캔 피처 계산 벤치마크: 후보마다 사용자 거래 목록 재구성 + 전체 순회(O(n²)) vs 사용자별 정렬 인덱스 + 이분 탐색
+
+두 방식의 burst_count가 같은지 확인한 뒤 거래 수별 소요 시간을 출력합니다.
+
+실행: python scripts/bench_burst_detection.py [거래 수 ...]
+(기본값: 1000 5000 10000)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.anomaly_detection import build_user_time_index, calculate_features
+
+
+def make_transactions(n: int, n_users: int = 20, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1)
+    return [
+        SimpleNamespace(
+            id=i,
+            user_id=int(rng.integers(1, n_users + 1)),
+            amount=float(rng.lognormal(9.5, 1.0)),
+            # 하루 안에 몰아서 버스트가 충분히 생기도록
+            transaction_time=base + timedelta(seconds=int(rng.integers(0, 60 * 60 * 24))),
+            merchant_name="가맹점",
+            currency="KRW",
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_burst_counts(txs):
+    """기존 방식: 후보마다 사용자 거래 목록을 다시 만들고 전부 비교"""
+    counts = []
+    for tx in txs:
+        user_txs = [t for t in txs if t.user_id == tx.user_id]
+        burst_count = 0
+        for other in user_txs:
+            if other.id == tx.id:
+                continue
+            if abs((tx.transaction_time - other.transaction_time).total_seconds()) < 600:
+                burst_count += 1
+        counts.append(burst_count)
+    return counts
+
+
+def indexed_burst_counts(txs):
+    """현재 방식: 사용자별 정렬 인덱스를 한 번 만들고 calculate_features 사용"""
+    index = build_user_time_index(txs)
+    return [calculate_features(tx, 1.0, index[tx.user_id])['burst_count'] for tx in txs]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 5_000, 10_000]
+    for n in sizes:
+        txs = make_transactions(n)
+
+        t0 = time.perf_counter()
+        legacy = legacy_burst_counts(txs)
+        legacy_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        indexed = indexed_burst_counts(txs)
+        indexed_sec = time.perf_counter() - t0
+
+        assert legacy == indexed, "인덱스 기반 burst_count가 기존 결과와 다릅니다"
+        print(
+            f"transactions {n:>6,}: legacy {legacy_sec * 1000:9.1f} ms | "
+            f"indexed {indexed_sec * 1000:7.1f} ms | speedup {legacy_sec / indexed_sec:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
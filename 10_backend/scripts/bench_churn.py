@@ -0,0 +1,132 @@
+"""
+사용자 이탈 판정 벤치마크: 사용자마다 거래 조회(N+1) vs EXISTS 상관 서브쿼리 1회
+
+임시 사용자 N명과 거래(약 절반은 최근 30일, 나머지는 그 이전)를 넣고
+관리자 사용자 목록(has_recent_activity) / 이탈률 집계를 두 방식으로 측정합니다.
+(DB 필요, 트랜잭션은 롤백하므로 데이터가 남지 않음. 기존 사용자도 함께 집계됨)
+
+실행:
+    python scripts/bench_churn.py [사용자 수 ...]        # 기본값: 1000 10000 100000
+    python scripts/bench_churn.py --legacy-max 10000     # N+1 방식을 측정할 최대 사용자 수
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.settings import settings
+from app.db.model.transaction import Transaction
+from app.db.model.user import User
+from app.services.transaction_bulk import insert_transaction_rows
+from app.services.user_activity import get_churn_counts, list_users_with_activity
+
+CHURN_DAYS = 30
+
+
+async def legacy_is_user_churned(db: AsyncSession, user_id: int, days: int = CHURN_DAYS) -> bool:
+    """기존 방식: 사용자 1명당 쿼리 1회"""
+    cutoff_date = datetime.now() - timedelta(days=days)
+    result = await db.execute(
+        select(Transaction)
+        .where(and_(Transaction.user_id == user_id, Transaction.transaction_time >= cutoff_date))
+        .limit(1)
+    )
+    return result.scalar_one_or_none() is None
+
+
+async def seed_users(db: AsyncSession, n: int, seed: int = 0):
+    """임시 사용자 n명 + 사용자당 거래 3건 (절반은 최근 거래 없음)"""
+    rng = random.Random(seed)
+    tag = f"{time.time_ns()}"
+    await db.execute(insert(User), [
+        {"email": f"bench-churn-{tag}-{i}@example.com", "password_hash": "x", "name": f"bench{i}"}
+        for i in range(n)
+    ])
+    user_ids = (await db.execute(
+        select(User.id).where(User.email.like(f"bench-churn-{tag}-%"))
+    )).scalars().all()
+
+    now = datetime.now()
+    rows = []
+    for user_id in user_ids:
+        active = rng.random() < 0.5
+        for _ in range(3):
+            days_ago = rng.randint(0, CHURN_DAYS - 1) if active else rng.randint(CHURN_DAYS + 1, 365)
+            rows.append({
+                "user_id": user_id,
+                "category_id": None,
+                "amount": float(rng.randint(1_000, 100_000)),
+                "currency": "KRW",
+                "merchant_name": "bench",
+                "description": None,
+                "status": "completed",
+                "transaction_time": now - timedelta(days=days_ago, minutes=rng.randint(0, 1_439)),
+                "is_fraudulent": False,
+            })
+    await insert_transaction_rows(db, rows, use_copy=True)
+
+
+async def bench(engine, n: int, run_legacy: bool):
+    results = {}
+    async with AsyncSession(engine) as db:
+        await seed_users(db, n)
+        await db.flush()
+
+        t0 = time.perf_counter()
+        rows = await list_users_with_activity(db, User.is_superuser == False, order_by=User.id.asc())
+        results["list_set"] = time.perf_counter() - t0
+        active_set = sum(active for _, active in rows)
+
+        t0 = time.perf_counter()
+        total_users, total_churned, _ = await get_churn_counts(db, churn_days=CHURN_DAYS)
+        results["count_set"] = time.perf_counter() - t0
+        assert total_users - total_churned == active_set, "목록과 집계의 활동 사용자 수가 다릅니다"
+
+        if run_legacy:
+            users = (await db.execute(
+                select(User).where(User.is_superuser == False).order_by(User.id.asc())
+            )).scalars().all()
+            t0 = time.perf_counter()
+            active_legacy = 0
+            for user in users:
+                active_legacy += not await legacy_is_user_churned(db, user.id)
+            results["legacy"] = time.perf_counter() - t0
+            assert active_legacy == active_set, "N+1 방식과 판정 결과가 다릅니다"
+
+        await db.rollback()
+    results["users"] = total_users
+    results["churned"] = total_churned
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="사용자 이탈 판정 벤치마크")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-max", type=int, default=10_000, help="N+1 방식을 측정할 최대 사용자 수")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url, echo=False)
+    try:
+        for n in args.sizes:
+            r = await bench(engine, n, run_legacy=n <= args.legacy_max)
+            legacy = f"{r['legacy'] * 1000:10.1f} ms" if "legacy" in r else "  (skipped)"
+            print(f"users +{n:>7,} (total {r['users']:,}, churned {r['churned']:,})")
+            print(f"    N+1 is_user_churned : {legacy}")
+            print(f"    list (EXISTS)       : {r['list_set'] * 1000:10.1f} ms")
+            print(f"    churn-rate aggregate: {r['count_set'] * 1000:10.1f} ms")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+DataPreprocessor._feature_engineering 벤치마크 + 기존 구현과의 일치 검증
+
+실행: python scripts/bench_feature_engineering.py [행 수 ...]
+(기본값: 1,000 / 10,000 / 100,000 행)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 추가 (backend 폴더)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.services.preprocessing import DataPreprocessor
+
+SEED_CSV = os.path.join(BACKEND_DIR, "synthetic_transactions_3000_2026.csv")
+
+
+def make_sample_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """시드 CSV를 재표본추출하고 날짜/시간을 무작위로 흩뜨려 n_rows 크기의 업로드 데이터를 만듭니다."""
+    base = pd.read_csv(SEED_CSV, encoding="utf-8")
+    rng = np.random.default_rng(seed)
+    df = base.sample(n=n_rows, replace=True, random_state=seed).reset_index(drop=True)
+
+    start = pd.Timestamp("2025-01-01")
+    minutes = rng.integers(0, 365 * 24 * 60, size=n_rows)
+    stamps = start + pd.to_timedelta(minutes, unit="m")
+    df["날짜"] = stamps.strftime("%Y-%m-%d")
+    df["시간"] = stamps.strftime("%H:%M")
+    return df
+
+
+def legacy_time_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """벡터화 이전의 apply 기반 구현 (일치 검증용)"""
+    out = pd.DataFrame(index=df.index)
+    out["IsWeekend"] = df["DayOfWeek"].apply(lambda x: 1 if x >= 5 else 0)
+    out["IsLunchTime"] = df["Hour"].apply(lambda x: 1 if 11 <= x <= 13 else 0)
+    out["IsEvening"] = df["Hour"].apply(lambda x: 1 if 18 <= x <= 20 else 0)
+    out["IsMorningRush"] = df["Hour"].apply(lambda x: 1 if 7 <= x <= 9 else 0)
+    out["IsNight"] = df["Hour"].apply(lambda x: 1 if x >= 22 or x <= 4 else 0)
+    tmp = df[["Hour"]].assign(IsWeekend=out["IsWeekend"])
+    out["IsBusinessHour"] = tmp.apply(
+        lambda row: 1 if (9 <= row["Hour"] <= 17) and (row["IsWeekend"] == 0) else 0, axis=1
+    )
+    return out
+
+
+def check_parity(preprocessor: DataPreprocessor, df_clean: pd.DataFrame) -> None:
+    """벡터화 결과가 기존 구현과 값/dtype 모두 동일한지 확인"""
+    engineered = preprocessor._feature_engineering(df_clean)
+    expected = legacy_time_flags(engineered)
+    for col in expected.columns:
+        pd.testing.assert_series_equal(engineered[col], expected[col], check_names=False)
+
+    # 모델 입력 24개 피처가 모두 생성되는지 확인
+    missing = [f for f in preprocessor.feature_names if f not in engineered.columns]
+    assert not missing, f"누락된 피처: {missing}"
+
+
+def bench(preprocessor: DataPreprocessor, df_clean: pd.DataFrame, repeat: int = 3) -> float:
+    """최소 소요 시간(초) 반환"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        preprocessor._feature_engineering(df_clean)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    preprocessor = DataPreprocessor()
+
+    print(f"{'rows':>10} | {'seconds':>10} | {'rows/sec':>14}")
+    print("-" * 42)
+    for n in sizes:
+        df_clean = preprocessor._clean_data(make_sample_frame(n))
+        check_parity(preprocessor, df_clean)
+        elapsed = bench(preprocessor, df_clean)
+        print(f"{n:>10,} | {elapsed:>10.4f} | {n / elapsed:>14,.0f}")
+
+    print("✅ 기존 apply 구현과 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+이상거래 스캔 모델 점수 계산 벤치마크: 거래마다 predict_proba vs 후보 전체 배치 1회
+
+실제 모델 파일이 없어도 실행되도록 22개 피처로 작은 이진 XGBoost 모델을 학습해 사용합니다.
+두 방식의 (위험도, 사유) 결과가 같은지 확인한 뒤 후보 수별 소요 시간을 출력합니다.
+
+실행: python scripts/bench_fraud_batch.py [후보 수 ...]
+(기본값: 100 1000 10000)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xgboost import XGBClassifier
+
+import app.services.anomaly_detection as anomalies
+from app.services.online_stats import RunningStats
+
+
+def train_dummy_fraud_model(feature_names: list) -> XGBClassifier:
+    """금액이 클수록 사기일 확률이 높은 이진 분류 모델 (위험/주의 구간이 모두 나오도록)"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(5000, len(feature_names))), columns=feature_names)
+    X['amount_log'] = rng.normal(9.5, 1.0, size=len(X))
+    y = (X['amount_log'] + 0.5 * rng.normal(size=len(X)) > 11).astype(int)
+    model = XGBClassifier(n_estimators=100, max_depth=4, n_jobs=1)
+    model.fit(X, y)
+    return model
+
+
+def make_candidates(n: int, n_users: int = 50, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1)
+    txs = [
+        SimpleNamespace(
+            id=i,
+            user_id=int(rng.integers(1, n_users + 1)),
+            amount=float(rng.lognormal(9.5, 1.0)),
+            transaction_time=base + timedelta(minutes=int(rng.integers(0, 60 * 24 * 30))),
+        )
+        for i in range(n)
+    ]
+    stats = {}
+    for tx in txs:
+        stats.setdefault(tx.user_id, RunningStats()).update(tx.amount)
+    return txs, [stats[tx.user_id] for tx in txs]
+
+
+def run_per_transaction(txs, amount_stats):
+    """기존 방식: 후보 거래마다 피처 DataFrame 생성 + predict_proba"""
+    return [anomalies.detect_fraud_with_model(tx, [], stats) for tx, stats in zip(txs, amount_stats)]
+
+
+def run_batch(txs, amount_stats):
+    """현재 방식: 후보 전체를 한 번에 전처리 + predict_proba 1회"""
+    return anomalies.detect_fraud_batch(txs, amount_stats)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1_000, 10_000]
+    # 전처리 결과와 같은 컬럼 순서로 학습 (XGBoost는 피처 이름 순서까지 검사)
+    sample_txs, sample_stats = make_candidates(1)
+    feature_names = list(anomalies.fraud_preprocessor.preprocess_transactions(sample_txs, sample_stats).columns)
+    anomalies.fraud_model = train_dummy_fraud_model(feature_names)
+
+    for n in sizes:
+        txs, amount_stats = make_candidates(n)
+
+        t0 = time.perf_counter()
+        single = run_per_transaction(txs, amount_stats)
+        single_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = run_batch(txs, amount_stats)
+        batch_sec = time.perf_counter() - t0
+
+        assert single == batch, "배치 점수 결과가 거래별 결과와 다릅니다"
+        flagged = sum(1 for risk, _ in batch if risk != "정상")
+        print(
+            f"candidates {n:>6,}: per-tx {single_sec * 1000:9.1f} ms | "
+            f"batch {batch_sec * 1000:7.1f} ms | speedup {single_sec / batch_sec:6.1f}x | flagged {flagged}"
+        )
+
+
+if __name__ == "__main__":
+    main()
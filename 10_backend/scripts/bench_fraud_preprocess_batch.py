@@ -0,0 +1,89 @@
+"""
+FraudPreprocessor.preprocess_batch 검증/벤치마크
+
+- 정합성: 거래마다 pandas rolling / quantile / rank(pct=True)로 계산한 기준값과 비교
+- 속도: 거래마다 preprocess_transaction 호출 vs preprocess_batch 한 번
+
+실행: python scripts/bench_fraud_preprocess_batch.py [거래 수]
+(기본값: 10,000)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.fraud_preprocessing import FraudPreprocessor, HISTORY_WINDOW, ROLLING_WINDOWS
+
+
+def make_batch(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = datetime(2026, 1, 1)
+    txs, histories = [], []
+    for i in range(n):
+        txs.append(SimpleNamespace(
+            id=i,
+            amount=float(rng.lognormal(9.5, 1.0)),
+            transaction_time=base + timedelta(minutes=int(rng.integers(0, 60 * 24 * 30))),
+        ))
+        # 이력 길이 0~20 (윈도우보다 짧은/긴 경우 모두 포함), 동일 금액(동점)도 섞음
+        hist = np.round(rng.lognormal(9.5, 1.0, size=int(rng.integers(0, 21))), -3)
+        histories.append([SimpleNamespace(amount=float(a)) for a in hist])
+    return txs, histories
+
+
+def reference_row(tx, history):
+    """pandas로 계산한 기준 피처 (rolling std ddof=1, quantile linear, rank average)"""
+    amount = float(tx.amount)
+    amount_log = np.log1p(abs(amount))
+    amounts = pd.Series([h.amount for h in history[-HISTORY_WINDOW:]], dtype=float)
+    logs = np.log1p(amounts.abs())
+
+    row = {}
+    for w in ROLLING_WINDOWS:
+        window = logs.iloc[-w:]
+        std = window.std()
+        ok = len(window) >= 2 and std > 1e-9
+        row[f'amount_log_z{w}'] = (amount_log - window.mean()) / std if ok else 0.0
+
+    iqr = logs.quantile(0.75) - logs.quantile(0.25) if len(logs) >= 2 else 0.0
+    row['amount_log_iqr_z'] = (amount_log - logs.median()) / iqr if len(logs) >= 2 and iqr > 1e-9 else 0.0
+    row['amount_rank_pct'] = pd.concat([amounts, pd.Series([amount])], ignore_index=True).rank(pct=True).iloc[-1]
+    return row
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    preprocessor = FraudPreprocessor()
+    txs, histories = make_batch(n)
+
+    t0 = time.perf_counter()
+    batch = preprocessor.preprocess_batch(txs, histories)
+    batch_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    single = pd.concat([preprocessor.preprocess_transaction(tx, h) for tx, h in zip(txs, histories)], ignore_index=True)
+    single_sec = time.perf_counter() - t0
+
+    assert list(batch.columns) == list(single.columns), "컬럼 구성이 preprocess_transaction과 다릅니다"
+
+    check = min(n, 2_000)
+    expected = pd.DataFrame([reference_row(tx, h) for tx, h in zip(txs[:check], histories[:check])])
+    for col in expected.columns:
+        np.testing.assert_allclose(batch[col].iloc[:check].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-9, err_msg=col)
+
+    print(f"transactions   : {n:,} (pandas 기준값 비교 {check:,}건 일치)")
+    print(f"per-transaction: {single_sec * 1000:8.1f} ms")
+    print(f"preprocess_batch: {batch_sec * 1000:7.1f} ms")
+    print(f"speedup        : {single_sec / batch_sec:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+백엔드 콜드 스타트 import 시간 측정 (python -X importtime)
+
+새 프로세스에서 `import app.main`을 실행해 전체 import 시간과 오래 걸린 모듈을 출력하고,
+지연 로딩 대상 모듈(pandas, numpy, xgboost, matplotlib, reportlab 등)이 시작 시 로드되지 않았는지 확인합니다.
+--prewarm을 주면 app.core.lazy_imports.prewarm_modules() 소요 시간(첫 ML/리포트 요청이 부담할 비용)도 측정합니다.
+
+실행: python scripts/bench_import_time.py [--runs 3] [--top 15] [--budget-ms 3000] [--prewarm]
+(지연 로딩 대상이 로드되었거나 budget을 넘으면 종료 코드 1)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시 import 되면 안 되는 모듈 (ML / 리포트 경로에서만 사용)
+LAZY_MODULES = ("pandas", "numpy", "joblib", "xgboost", "sklearn", "matplotlib", "reportlab")
+
+PREWARM_SNIPPET = (
+    "import time; import app.main; from app.core.lazy_imports import prewarm_modules; "
+    "t = time.perf_counter(); prewarm_modules(); print(f'PREWARM {time.perf_counter() - t:.6f}')"
+)
+
+
+def run_importtime():
+    """새 프로세스에서 import app.main 실행 -> [(모듈, self_us, cumulative_us, depth)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import app.main 실패:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self | cumulative | <들여쓰기>module"
+        self_part, cumulative_part, raw_name = line.split("|", 2)
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        rows.append((raw_name.strip(), int(self_part.split(":")[1]), int(cumulative_part), depth))
+    return rows
+
+
+def run_prewarm() -> float:
+    proc = subprocess.run(
+        [sys.executable, "-c", PREWARM_SNIPPET],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("PREWARM "):
+            return float(line.split()[1])
+    raise RuntimeError(f"프리웜 측정 실패:\n{proc.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import app.main 시간 측정")
+    parser.add_argument("--runs", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 최상위 모듈 수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="전체 import 시간 상한 (ms)")
+    parser.add_argument("--prewarm", action="store_true", help="prewarm_modules() 소요 시간도 측정")
+    args = parser.parse_args()
+
+    runs = [run_importtime() for _ in range(args.runs)]
+    totals = [next(cum for name, _, cum, _ in rows if name == "app.main") / 1000 for rows in runs]
+    total_ms = statistics.median(totals)
+
+    rows = runs[totals.index(min(totals, key=lambda t: abs(t - total_ms)))]
+    loaded = {name for name, *_ in rows}
+    lazy_loaded = [m for m in LAZY_MODULES if m in loaded]
+
+    # 최상위(또는 app.*) 모듈 기준 누적 시간 상위
+    top = sorted(
+        (r for r in rows if r[3] <= 1 or r[0].startswith("app.")),
+        key=lambda r: r[2],
+        reverse=True,
+    )[:args.top]
+
+    print(f"import app.main: {total_ms:8.1f} ms (median of {args.runs}: {', '.join(f'{t:.0f}' for t in totals)})")
+    print(f"modules loaded : {len(loaded):,}")
+    print("\ncumulative [ms]  module")
+    for name, _, cumulative_us, depth in top:
+        print(f"{cumulative_us / 1000:14.1f}  {'  ' * depth}{name}")
+
+    if args.prewarm:
+        print(f"\nprewarm_modules: {run_prewarm() * 1000:8.1f} ms (첫 ML/리포트 요청 또는 백그라운드 프리웜 비용)")
+
+    failed = False
+    if lazy_loaded:
+        print(f"\nFAIL: 시작 시 지연 로딩 대상 모듈이 로드됨: {', '.join(lazy_loaded)}")
+        failed = True
+    else:
+        print(f"\nOK: 지연 로딩 대상 모듈 미로드 ({', '.join(LAZY_MODULES)})")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: import 시간 {total_ms:.1f} ms > budget {args.budget_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+단건 예측 동시 요청 처리량 벤치마크: 요청마다 model.predict vs InferenceExecutor 마이크로 배칭
+
+실제 모델 파일이 없어도 실행되도록 24개 피처로 작은 XGBoost 모델을 학습해 사용합니다.
+
+실행: python scripts/bench_inference_batching.py [동시 요청 수]
+(기본값: 2,000)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from xgboost import XGBClassifier
+
+from app.services.inference import InferenceExecutor
+from app.services.preprocessing import DataPreprocessor
+
+
+def train_dummy_model(feature_names: list) -> XGBClassifier:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(5000, len(feature_names))), columns=feature_names)
+    y = rng.integers(0, 6, size=len(X))
+    model = XGBClassifier(n_estimators=200, max_depth=6, n_jobs=1)
+    model.fit(X, y)
+    return model
+
+
+async def run_direct(model, rows: list) -> float:
+    """기존 방식: async 핸들러 안에서 요청마다 model.predict (이벤트 루프 차단)"""
+    async def handle(row):
+        return model.predict(row)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(handle(row) for row in rows))
+    return time.perf_counter() - t0
+
+
+async def run_batched(executor: InferenceExecutor, rows: list) -> float:
+    t0 = time.perf_counter()
+    await asyncio.gather(*(executor.predict_batched(row) for row in rows))
+    return time.perf_counter() - t0
+
+
+async def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    feature_names = DataPreprocessor().feature_names
+    model = train_dummy_model(feature_names)
+
+    rng = np.random.default_rng(1)
+    rows = [
+        pd.DataFrame(rng.normal(size=(1, len(feature_names))), columns=feature_names)
+        for _ in range(n_requests)
+    ]
+
+    executor = InferenceExecutor(max_workers=2, max_batch_size=64, max_latency_ms=5.0)
+    executor.set_model(model)
+
+    # 결과 일치 확인
+    expected = np.concatenate([model.predict(row) for row in rows[:200]])
+    got = np.concatenate(await asyncio.gather(*(executor.predict_batched(row) for row in rows[:200])))
+    assert np.array_equal(expected, got), "배칭 결과가 단건 예측과 다릅니다"
+
+    direct_sec = await run_direct(model, rows)
+    batched_sec = await run_batched(executor, rows)
+    executor.shutdown()
+
+    print(f"concurrent requests: {n_requests:,}")
+    print(f"direct  : {direct_sec:8.3f}s ({n_requests / direct_sec:>10,.0f} req/sec)")
+    print(f"batched : {batched_sec:8.3f}s ({n_requests / batched_sec:>10,.0f} req/sec)")
+    print(f"speedup : {direct_sec / batched_sec:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
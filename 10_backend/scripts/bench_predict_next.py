@@ -0,0 +1,90 @@
+"""
+/ml/predict-next 파이프라인 벤치마크: 기존(정제 2회 + predict_proba/predict 2회) vs 단일 패스
+
+실제 모델 파일이 없어도 실행되도록 24개 피처로 작은 XGBoost 모델을 학습해 사용합니다.
+
+실행: python scripts/bench_predict_next.py [히스토리 행 수]
+(기본값: 10,000 행)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.routers.ml import CATEGORY_MAP
+from app.services.preprocessing import DataPreprocessor
+from bench_feature_engineering import make_sample_frame
+from bench_inference_batching import train_dummy_model
+
+
+def legacy_pipeline(preprocessor, model, df_original, prediction_time):
+    """단일 패스 적용 이전의 엔드포인트 처리 순서"""
+    df_next_features = preprocessor.preprocess_for_next_prediction(df_original, prediction_time)
+    prediction_proba = model.predict_proba(df_next_features)
+    prediction = model.predict(df_next_features)
+    code = int(prediction[0])
+
+    df_clean = preprocessor._clean_data(df_original.copy())
+    last_transaction = df_clean.iloc[-1]
+    df_clean['category_encoded'] = df_clean['대분류'].map(preprocessor.NEXT_CATEGORY_MAP).fillna(6)
+    most_frequent = df_clean['category_encoded'].mode()[0]
+    return code, prediction_proba[0], {
+        "last_transaction_date": last_transaction['CreateDate'].strftime('%Y-%m-%d %H:%M'),
+        "user_avg_amount": float(df_clean['Amount'].mean()),
+        "most_frequent_category": CATEGORY_MAP.get(int(most_frequent), '외식'),
+    }
+
+
+def single_pass_pipeline(preprocessor, model, df_original, prediction_time):
+    """현재 엔드포인트 처리 순서 (정제 1회, predict_proba 1회)"""
+    features, last_transaction, user_stats = preprocessor.prepare_next_prediction(df_original, prediction_time)
+    proba = model.predict_proba(features)[0]
+    code = int(model.classes_[int(np.argmax(proba))])
+    return code, proba, {
+        "last_transaction_date": last_transaction['CreateDate'].strftime('%Y-%m-%d %H:%M'),
+        "user_avg_amount": float(user_stats['avg_amount']),
+        "most_frequent_category": CATEGORY_MAP.get(int(user_stats['fav_category']), '외식'),
+    }
+
+
+def best_of(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    preprocessor = DataPreprocessor()
+    model = train_dummy_model(preprocessor.feature_names)
+    df_original = make_sample_frame(n_rows)
+    prediction_time = datetime(2026, 1, 1, 12, 0)
+    args = (preprocessor, model, df_original, prediction_time)
+
+    legacy = legacy_pipeline(*args)
+    single = single_pass_pipeline(*args)
+    assert legacy[0] == single[0] and np.allclose(legacy[1], single[1]) and legacy[2] == single[2], \
+        "단일 패스 결과가 기존 파이프라인과 다릅니다"
+
+    legacy_sec = best_of(legacy_pipeline, *args)
+    single_sec = best_of(single_pass_pipeline, *args)
+
+    print(f"history rows: {n_rows:,}")
+    print(f"legacy      : {legacy_sec * 1000:8.1f} ms")
+    print(f"single pass : {single_sec * 1000:8.1f} ms")
+    print(f"speedup     : {legacy_sec / single_sec:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+리포트 집계 벤치마크: transactions 직접 조회 5회 vs 일별 집계 조회 5회 vs CTE 1회
+
+임시 사용자 1명과 합성 거래 N건(최근 400일에 고르게 분포, 약 0.1%는 이상거래)을
+generate_series로 DB 안에서 생성하고, 해당 사용자 일별 집계를 재계산한 뒤
+일간/주간/월간 리포트 집계를 세 방식으로 측정합니다.
+(DB 필요, 트랜잭션은 롤백하므로 데이터가 남지 않음. 기존 거래도 함께 집계됨)
+
+실행:
+    python scripts/bench_report_aggregation.py [거래 수 ...]      # 기본값: 10000000
+    python scripts/bench_report_aggregation.py 1000000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.settings import settings
+from app.db.model.transaction import Transaction
+from app.db.model.user import User
+from app.services.report_aggregation import ReportPeriod, aggregate_report
+from app.services.spend_rollup import get_spend_by_category, get_spend_totals, rebuild_spend_rollup
+
+SEED_TRANSACTIONS_SQL = text("""
+    INSERT INTO transactions (user_id, category_id, amount, currency, merchant_name, description,
+                              status, transaction_time, is_fraudulent)
+    SELECT :user_id,
+           c.ids[1 + g % GREATEST(cardinality(c.ids), 1)],
+           1000 + (g * 7919) % 99000,
+           'KRW', 'bench-' || (g % 500), NULL, 'completed',
+           now() - (g % (400 * 1440)) * interval '1 minute',
+           g % 1000 = 0
+    FROM generate_series(1, :n) AS g
+    CROSS JOIN (SELECT array_agg(id ORDER BY id) AS ids FROM categories) AS c
+""")
+
+
+async def legacy_aggregate(db: AsyncSession, period: ReportPeriod):
+    """기존 방식: transactions에서 5회 조회"""
+    in_period = and_(Transaction.transaction_time >= period.start, Transaction.transaction_time < period.end)
+    normal = and_(in_period, Transaction.is_fraudulent == False)
+    total, count = (await db.execute(
+        select(func.coalesce(func.sum(Transaction.amount), 0), func.count(Transaction.id)).where(normal)
+    )).one()
+    await legacy_max_and_fraud(db, period)
+    await db.execute(
+        select(func.coalesce(func.sum(Transaction.amount), 0)).where(
+            Transaction.transaction_time >= period.previous_start,
+            Transaction.transaction_time < period.start,
+            Transaction.is_fraudulent == False,
+        )
+    )
+    await db.execute(
+        select(Transaction.category_id, func.sum(Transaction.amount), func.count(Transaction.id))
+        .where(normal, Transaction.category_id.isnot(None))
+        .group_by(Transaction.category_id)
+        .order_by(func.sum(Transaction.amount).desc())
+    )
+    return float(total), int(count)
+
+
+async def rollup_aggregate(db: AsyncSession, period: ReportPeriod):
+    """일별 집계 5회 조회 (집계 테이블 도입 직후 방식)"""
+    total, count = await get_spend_totals(db, start=period.start, end=period.end)
+    await legacy_max_and_fraud(db, period)
+    await get_spend_totals(db, start=period.previous_start, end=period.start)
+    await get_spend_by_category(db, start=period.start, end=period.end)
+    return total, count
+
+
+async def legacy_max_and_fraud(db: AsyncSession, period: ReportPeriod):
+    """최대 지출 거래 / 이상거래 목록 (transactions 직접 조회)"""
+    in_period = and_(Transaction.transaction_time >= period.start, Transaction.transaction_time < period.end)
+    await db.execute(
+        select(Transaction)
+        .where(in_period, Transaction.is_fraudulent == False, Transaction.category_id.isnot(None),
+               Transaction.status == "completed")
+        .order_by(Transaction.amount.desc()).limit(1)
+    )
+    await db.execute(
+        select(Transaction)
+        .where(in_period, Transaction.is_fraudulent == True)
+        .order_by(Transaction.transaction_time.desc())
+    )
+
+
+async def cte_aggregate(db: AsyncSession, period: ReportPeriod):
+    aggregates = await aggregate_report(db, period)
+    return aggregates.total, aggregates.count
+
+
+async def timed(fn, db, period, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = await fn(db, period)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+async def bench(engine, n: int, repeat: int):
+    async with AsyncSession(engine) as db:
+        tag = f"{time.time_ns()}"
+        user_id = (await db.execute(
+            insert(User).values(email=f"bench-report-{tag}@example.com", password_hash="x", name="bench")
+            .returning(User.id)
+        )).scalar_one()
+
+        t0 = time.perf_counter()
+        await db.execute(SEED_TRANSACTIONS_SQL, {"user_id": user_id, "n": n})
+        await rebuild_spend_rollup(db, user_id=user_id)
+        await db.execute(text("ANALYZE transactions"))
+        await db.execute(text("ANALYZE daily_spend_rollup"))
+        print(f"transactions +{n:,} (seed + rollup {time.perf_counter() - t0:.1f}s)")
+
+        for name, period in (("daily", ReportPeriod.daily()), ("weekly", ReportPeriod.weekly()),
+                             ("monthly", ReportPeriod.monthly())):
+            legacy_s, legacy = await timed(legacy_aggregate, db, period, repeat)
+            rollup_s, _ = await timed(rollup_aggregate, db, period, repeat)
+            cte_s, cte = await timed(cte_aggregate, db, period, repeat)
+            print(f"  {name:<8} transactions x5: {legacy_s * 1000:9.1f} ms   rollup x5: {rollup_s * 1000:9.1f} ms"
+                  f"   CTE x1: {cte_s * 1000:9.1f} ms   (count {legacy[1]:,} / {cte[1]:,})")
+
+        await db.rollback()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="리포트 집계 벤치마크")
+    parser.add_argument("sizes", nargs="*", type=int, default=[10_000_000])
+    parser.add_argument("--repeat", type=int, default=3, help="방식별 반복 횟수 (최솟값 출력)")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url, echo=False)
+    try:
+        for n in args.sizes:
+            await bench(engine, n, args.repeat)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
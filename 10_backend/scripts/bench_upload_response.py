@@ -0,0 +1,74 @@
+"""
+/ml/upload 응답 변환 벤치마크: 기존 iterrows() 방식 vs 컬럼 단위 변환(_format_transactions)
+
+실행: python scripts/bench_upload_response.py [행 수]
+(기본값: 100,000 행)
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.routers.ml import _format_transactions
+from bench_feature_engineering import make_sample_frame
+
+
+def legacy_format_transactions(df: pd.DataFrame) -> list:
+    """컬럼 단위 변환 이전의 iterrows() 구현 (일치 검증용)"""
+    transactions = []
+    for idx, row in df.iterrows():
+        amount = abs(int(row.get('금액', 0))) if pd.notna(row.get('금액')) else 0
+        date_str = str(row.get('날짜', '')).strip()
+        time_str = str(row.get('시간', '')).strip()
+        datetime_str = f"{date_str} {time_str}".strip()
+        payment_method = str(row.get('결제수단', ''))
+        card_type = '체크' if '체크' in payment_method else '신용'
+        transactions.append({
+            "id": str(idx + 1),
+            "merchant": str(row.get('내용', '알 수 없음')),
+            "businessName": str(row.get('내용', '알 수 없음')),
+            "amount": amount,
+            "category": row.get('AI예측카테고리', '기타'),
+            "date": datetime_str,
+            "notes": str(row.get('메모', '')) if pd.notna(row.get('메모')) else '',
+            "cardType": card_type,
+            "originalCategory": str(row.get('대분류', '')) if pd.notna(row.get('대분류')) else '',
+            "aiPredicted": True
+        })
+    return transactions
+
+
+def timed(fn, *args) -> tuple:
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    df = make_sample_frame(n_rows)
+    rng = np.random.default_rng(0)
+    df['AI예측카테고리'] = rng.choice(['교통', '생활', '쇼핑', '식료품', '외식', '주유'], size=n_rows)
+
+    legacy, legacy_sec = timed(legacy_format_transactions, df)
+    columnar, columnar_sec = timed(_format_transactions, df)
+
+    assert legacy == columnar, "컬럼 단위 변환 결과가 기존 구현과 다릅니다"
+
+    print(f"rows: {n_rows:,}")
+    print(f"iterrows : {legacy_sec:8.3f}s ({n_rows / legacy_sec:>12,.0f} rows/sec)")
+    print(f"columnar : {columnar_sec:8.3f}s ({n_rows / columnar_sec:>12,.0f} rows/sec)")
+    print(f"speedup  : {legacy_sec / columnar_sec:8.1f}x")
+    print("✅ 기존 iterrows 구현과 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
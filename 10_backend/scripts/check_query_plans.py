@@ -0,0 +1,222 @@
+"""
+주요 조회 쿼리 실행 계획 회귀 검사 (EXPLAIN)
+
+거래 목록/검색, 관리자 거래 목록, 분석·리포트 집계(daily_spend_rollup), 이탈 판정, 이상거래 목록,
+탐지 워커 이력 조회가 의도한 인덱스를 사용하는지 확인합니다.
+SQL을 따로 옮겨 적지 않고 앱 코드(라우터/서비스 함수)를 그대로 실행하면서 커서로 나가는 SQL과
+바인딩 값을 가로채 같은 값으로 EXPLAIN 합니다. (쿼리가 바뀌면 검사도 자동으로 따라감)
+데이터가 적은 개발 DB에서는 플래너가 순차 스캔을 고르므로 기본적으로 트랜잭션 안에서
+SET LOCAL enable_seqscan = off로 "인덱스를 쓸 수 있는지"를 검사합니다. (--natural: 실제 플래너 선택 그대로)
+검사용 트랜잭션은 모두 롤백하므로 데이터가 남지 않습니다.
+
+실행: python scripts/check_query_plans.py [--natural] [--verbose]
+(의도한 인덱스를 쓰지 않는 쿼리가 있으면 종료 코드 1)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.pagination import encode_cursor
+from app.core.settings import settings
+from app.db.model.transaction import Anomaly, Transaction
+from app.db.model.user import User
+from app.routers.anomalies import ANOMALY_PAGE_MAX, _anomaly_list_query
+from app.routers.transactions import get_transactions
+from app.services.admin_transactions import get_all_transactions
+from app.services.anomaly_detection import _load_user_history
+from app.services.feature_store import fetch_recent_category_history
+from app.services.report_aggregation import ReportPeriod, aggregate_report
+from app.services.spend_rollup import get_spend_totals
+from app.services.user_activity import list_users_with_activity
+
+NOW = datetime.now().astimezone()
+MONTH_START = NOW.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+ADMIN = User(id=0, is_superuser=True)
+BATCH = [
+    Transaction(id=2 ** 62 - i, user_id=user_id, category_id=None, amount=10000, transaction_time=NOW)
+    for i, user_id in enumerate((1, 2))
+]
+
+
+def list_transactions(**filters):
+    """거래 목록 API 핸들러 직접 호출 (Query 기본값은 함수 호출 시 채워지지 않으므로 모두 지정)"""
+    params = dict(
+        user_id=None, category=None, start_date=None, end_date=None, min_amount=None, max_amount=None,
+        search=None, page=1, page_size=20, cursor=None, total_mode="none",
+    )
+    params.update(filters)
+    return lambda db: get_transactions(db=db, **params)
+
+
+# (이름, 앱 코드 실행 함수, 검사할 SQL에 포함된 문자열, 필수 인덱스 그룹 - 그룹마다 하나 이상 사용해야 통과)
+CHECKS = [
+    (
+        "transactions list (user, keyset)",
+        list_transactions(user_id=1, cursor=encode_cursor(NOW, 2 ** 62)),
+        "FROM transactions",
+        [{"idx_transactions_user_time"}],
+    ),
+    (
+        "merchant/description search (ILIKE)",
+        list_transactions(search="스타벅스", total_mode="exact"),
+        "count(transactions.id)",
+        [{"idx_transactions_merchant_trgm", "idx_transactions_description_trgm"}],
+    ),
+    (
+        "admin transactions list (all users)",
+        lambda db: get_all_transactions(db, start_date=(NOW - timedelta(days=7)).strftime("%Y-%m-%d")),
+        "ORDER BY t.transaction_time DESC",
+        [{"ix_transactions_transaction_time"}],
+    ),
+    (
+        "analysis monthly summary (user, rollup)",
+        lambda db: get_spend_totals(db, start=MONTH_START, user_id=1),
+        "FROM daily_spend_rollup",
+        [{"daily_spend_rollup_pkey"}],
+    ),
+    (
+        "weekly report (all users, rollup + transactions)",
+        lambda db: aggregate_report(db, ReportPeriod.weekly()),
+        "FROM daily_spend_rollup",
+        [{"idx_daily_spend_rollup_day"}, {"ix_transactions_transaction_time"}],
+    ),
+    (
+        "churned users (recent activity EXISTS)",
+        lambda db: list_users_with_activity(db, churned_only=True),
+        "FROM transactions",
+        [{"idx_transactions_user_time", "idx_transactions_user_category_time"}],
+    ),
+    (
+        "pending anomalies (keyset)",
+        lambda db: db.execute(_anomaly_list_query(ADMIN, "pending", None).limit(ANOMALY_PAGE_MAX + 1)),
+        "FROM anomalies",
+        [{"idx_anomalies_resolved_created"}],
+    ),
+    (
+        "worker: anomalies by transaction",
+        # process_new_transactions의 기등록 거래 제외 조회와 같은 식
+        lambda db: db.execute(select(Anomaly.transaction_id).where(Anomaly.transaction_id.in_([1, 2, 3]))),
+        "FROM anomalies",
+        [{"idx_anomalies_transaction_id"}],
+    ),
+    (
+        "worker: recent history per user/category (LATERAL)",
+        lambda db: fetch_recent_category_history(db, [(1, 1), (2, 0)]),
+        "CROSS JOIN LATERAL",
+        [{"idx_transactions_user_category_time"}],
+    ),
+    (
+        "worker: burst window per user",
+        lambda db: _load_user_history(db, BATCH),
+        "transactions.user_id IN",
+        [{"idx_transactions_user_time"}],
+    ),
+    (
+        "worker: prior transactions per user (LATERAL)",
+        lambda db: _load_user_history(db, BATCH),
+        "t.transaction_time < k.before",
+        [{"idx_transactions_user_time"}],
+    ),
+]
+
+
+async def capture_statement(conn, run, marker: str):
+    """앱 코드를 실행하며 marker가 포함된 첫 SQL과 바인딩 값을 가로챔"""
+    captured = []
+
+    def on_execute(_conn, _cursor, statement, parameters, _context, _executemany):
+        if marker in statement and not captured:
+            captured.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", on_execute)
+    try:
+        async with AsyncSession(bind=conn) as db:
+            await run(db)
+    except Exception as e:
+        # 빈 DB 등으로 결과 처리에서 실패해도 SQL이 이미 나갔으면 계획은 검사 가능
+        if not captured:
+            print(f"       app code failed before issuing the query: {e}")
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", on_execute)
+    return captured[0] if captured else None
+
+
+def collect_indexes(plan: dict) -> set:
+    """실행 계획 트리에서 사용된 인덱스 이름 수집"""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= collect_indexes(child)
+    return names
+
+
+def summarize(plan: dict, depth: int = 0) -> list:
+    line = f"{'  ' * depth}{plan['Node Type']}"
+    if "Index Name" in plan:
+        line += f" using {plan['Index Name']}"
+    if "Relation Name" in plan:
+        line += f" on {plan['Relation Name']}"
+    lines = [line]
+    for child in plan.get("Plans", []):
+        lines += summarize(child, depth + 1)
+    return lines
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="주요 쿼리 실행 계획 검사")
+    parser.add_argument("--natural", action="store_true", help="enable_seqscan을 끄지 않고 실제 플래너 선택으로 검사")
+    parser.add_argument("--verbose", action="store_true", help="통과한 쿼리의 실행 계획도 출력")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url, echo=False)
+    failed = 0
+    try:
+        async with engine.connect() as conn:
+            for name, run, marker, expected in CHECKS:
+                trans = await conn.begin()
+                try:
+                    if not args.natural:
+                        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+                    captured = await capture_statement(conn, run, marker)
+                    plan = None
+                    if captured:
+                        statement, parameters = captured
+                        plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                finally:
+                    await trans.rollback()
+
+                if plan is None:
+                    failed += 1
+                    print(f"[FAIL] {name}: no query containing {marker!r} was issued")
+                    continue
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                root = plan[0]["Plan"]
+                used = collect_indexes(root)
+                ok = all(used & group for group in expected)
+                failed += not ok
+                print(f"[{'PASS' if ok else 'FAIL'}] {name}: {', '.join(sorted(used)) or 'no index'}")
+                if not ok or args.verbose:
+                    if not ok:
+                        for group in expected:
+                            print(f"       expected one of: {', '.join(sorted(group))}")
+                    for line in summarize(root):
+                        print(f"       {line}")
+    finally:
+        await engine.dispose()
+
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} queries use the expected indexes")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
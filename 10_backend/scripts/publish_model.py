@@ -0,0 +1,54 @@
+"""
+모델 레지스트리에 새 버전 등록 (무중단 배포)
+
+버전 디렉토리를 만들고 CURRENT를 원자적으로 교체합니다.
+실행 중인 각 워커는 MODEL_REGISTRY_REFRESH_SECONDS 주기로 변경을 감지해 새 모델로 교체합니다.
+(즉시 반영: POST /ml/models/reload)
+
+실행:
+    python scripts/publish_model.py fraud app/models/paysim_generic_no_flag_featplus.joblib \\
+        --metadata app/models/model_metadata_fraud.json
+    python scripts/publish_model.py category new_model.joblib --version 20260101
+    python scripts/publish_model.py fraud --activate 20251201   # 롤백
+"""
+
+import argparse
+import os
+import sys
+
+# 상위 디렉토리 추가 (backend 폴더)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_registry import MODEL_SPECS, get_model_registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 레지스트리 버전 등록/활성화")
+    parser.add_argument("name", choices=sorted(MODEL_SPECS))
+    parser.add_argument("model_path", nargs="?", help="joblib / ubj / json 모델 파일")
+    parser.add_argument("--metadata", help="메타데이터 JSON 파일")
+    parser.add_argument("--version", help="버전 이름 (기본: 현재 시각)")
+    parser.add_argument("--no-native", action="store_true", help="joblib 그대로 저장 (네이티브 부스터 변환 안 함)")
+    parser.add_argument("--activate", metavar="VERSION", help="이미 등록된 버전으로 CURRENT 변경")
+    args = parser.parse_args()
+
+    registry = get_model_registry()
+    if args.activate:
+        registry.activate(args.name, args.activate)
+        print(f"{args.name}: CURRENT -> {args.activate}")
+        return
+    if not args.model_path:
+        parser.error("model_path 또는 --activate가 필요합니다.")
+
+    version = registry.publish(
+        args.name,
+        args.model_path,
+        metadata_path=args.metadata,
+        version=args.version,
+        native=not args.no_native,
+    )
+    print(f"{args.name}: published {version} ({os.path.join(registry.root, args.name, version)})")
+
+
+if __name__ == "__main__":
+    main()
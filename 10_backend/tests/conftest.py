@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 상위 디렉토리 추가 (backend 폴더) - scripts/*.py와 같은 방식
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
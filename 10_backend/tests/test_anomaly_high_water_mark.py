@@ -0,0 +1,41 @@
+"""이상거래 탐지 하이워터마크 값/ID 빈칸 판정, 최근 거래 캐시 병합 키 검증"""
+
+from datetime import datetime
+
+import pytest
+
+from app.db.model.transaction import Transaction
+from app.services.anomaly_detection import _dump_mark, _first_gap, _load_mark, _recent_entries
+
+
+@pytest.mark.parametrize("last_id, tx_ids, expected", [
+    (10, [11, 12, 13], None),
+    (10, [12, 13], 10),          # 11이 아직 커밋 전 (또는 롤백)
+    (10, [11, 12, 15, 16], 12),  # 13, 14 빈칸
+    (0, [1], None),
+])
+def test_first_gap(last_id, tx_ids, expected):
+    assert _first_gap(last_id, tx_ids) == expected
+
+
+def test_mark_round_trip():
+    gaps = [[10, 20, 12345], [30, 40, 12400]]
+    assert _load_mark(_dump_mark(20, gaps)) == (20, gaps)
+
+
+@pytest.mark.parametrize("value, expected", [("42", (42, [])), (None, (0, [])), ("", (0, []))])
+def test_load_legacy_integer_mark(value, expected):
+    assert _load_mark(value) == expected
+
+
+def test_recent_entries_group_by_user_and_category():
+    now = datetime(2026, 1, 1, 12, 0)
+    txs = [
+        Transaction(id=1, user_id=7, category_id=3, amount=1000, transaction_time=now),
+        Transaction(id=2, user_id=7, category_id=None, amount=2500, transaction_time=now),
+        Transaction(id=3, user_id=7, category_id=3, amount=4000, transaction_time=now),
+    ]
+    assert _recent_entries(txs) == {
+        (7, 3): [(1, 1000.0, now), (3, 4000.0, now)],
+        (7, 0): [(2, 2500.0, now)],
+    }
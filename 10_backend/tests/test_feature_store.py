@@ -0,0 +1,72 @@
+"""사용자 피처 스토어 금액 통계 상태 저장/병합 검증"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.feature_store import (
+    CATEGORY_COUNT_COLUMNS, _aggregate_rows, _amount_state, amount_stats, to_user_stats
+)
+from app.services.online_stats import RunningStats
+
+START = datetime(2026, 1, 1, 9, 0)
+CATEGORIES = ['교통', '외식', '쇼핑', None]
+
+
+def _rows(amounts):
+    return [
+        (amount, CATEGORIES[i % len(CATEGORIES)], START + timedelta(hours=i))
+        for i, amount in enumerate(amounts)
+    ]
+
+
+def _stats_row(amount_state, counts):
+    # record_transactions()/rebuild_user_feature_stats()가 저장하는 컬럼과 같은 형태
+    return SimpleNamespace(**amount_state, **counts)
+
+
+def test_incremental_merge_matches_full_history():
+    rng = np.random.default_rng(3)
+    amounts = np.round(rng.lognormal(9, 1, size=300))
+
+    # 첫 적재 후 여러 번에 나눠 거래 추가: 저장된 상태 + 배치 통계 병합
+    first = _aggregate_rows(_rows(amounts[:100]))
+    state = _amount_state(first["amount_stats"])
+    for start in range(100, 300, 37):
+        batch = _aggregate_rows(_rows(amounts[start:start + 37]))
+        state = _amount_state(amount_stats(SimpleNamespace(**state)).merge(batch["amount_stats"]))
+
+    assert state["tx_count"] == amounts.size
+    assert state["amount_mean"] == pytest.approx(amounts.mean(), rel=1e-12)
+    assert state["amount_m2"] == pytest.approx(((amounts - amounts.mean()) ** 2).sum(), rel=1e-9)
+    assert state["amount_min"] == amounts.min()
+    assert state["amount_max"] == amounts.max()
+
+
+def test_to_user_stats_uses_saved_state():
+    amounts = [12000, 4500, 30000, 8000, 8000]
+    values = _aggregate_rows(_rows(amounts))
+    counts = {col: values[col] for col in CATEGORY_COUNT_COLUMNS}
+    user_stats = to_user_stats(_stats_row(_amount_state(values["amount_stats"]), counts))
+
+    # DataPreprocessor._calculate_user_stats()와 같은 값 (표본 표준편차)
+    assert user_stats["avg_amount"] == pytest.approx(np.mean(amounts))
+    assert user_stats["std_amount"] == pytest.approx(np.std(amounts, ddof=1))
+    assert user_stats["tx_count"] == len(amounts)
+    assert user_stats["category_ratios"]["교통"] == pytest.approx(2 / 5)
+
+
+def test_single_transaction_has_zero_std():
+    values = _aggregate_rows(_rows([5000]))
+    counts = {col: values[col] for col in CATEGORY_COUNT_COLUMNS}
+    assert to_user_stats(_stats_row(_amount_state(values["amount_stats"]), counts))["std_amount"] == 0
+
+
+def test_aggregate_rows_keeps_latest_transaction():
+    values = _aggregate_rows(_rows([1000, 2000, 3000]))
+    assert values["last_transaction_time"] == START + timedelta(hours=2)
+    assert values["last_category_name"] == '쇼핑'
+    assert isinstance(values["amount_stats"], RunningStats)
+    assert _aggregate_rows([]) is None
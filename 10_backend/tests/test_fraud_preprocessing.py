@@ -0,0 +1,53 @@
+"""FraudPreprocessor.preprocess_batch 롤링 윈도우 특징 검증"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.db.model.transaction import Transaction
+from app.services.fraud_preprocessing import FraudPreprocessor, ROLLING_WINDOWS
+
+Z_COLUMNS = [f"amount_log_z{w}" for w in ROLLING_WINDOWS]
+
+
+def _tx(amount):
+    return Transaction(amount=amount, transaction_time=datetime(2026, 1, 15, 12, 30))
+
+
+def _reference_z(history, amount, window):
+    """윈도우별 np.std(ddof=1) 기준값 (pandas rolling().std()와 같은 정의, 분산 0이면 0)"""
+    values = np.log1p(np.abs(np.asarray(history[-window:], dtype=float)))
+    if len(values) < 2 or np.ptp(values) == 0:
+        return 0.0
+    return (np.log1p(abs(amount)) - values.mean()) / np.std(values, ddof=1)
+
+
+@pytest.mark.parametrize("history, amount", [
+    ([15000] * 3, 22500),
+    ([1234567] * 10, 1234567),
+    ([1234567] * 10, 2000000),
+    ([9900] * 25, 10),
+])
+def test_constant_history_gives_zero_z_scores(history, amount):
+    # 같은 금액이 반복되면 표준편차가 0 -> z-score 0 (반올림 잔차로 수백만이 나오면 안 됨)
+    df = FraudPreprocessor().preprocess_batch([_tx(amount)], [history])
+    for column in Z_COLUMNS:
+        assert df[column].iloc[0] == 0.0
+    assert df["amount_log_iqr_z"].iloc[0] == 0.0
+
+
+def test_z_scores_match_reference():
+    histories = [
+        [1000, 2000, 3000, 4000, 9000, 100, 7000],
+        [15000, 15000, 15000, 15001],
+        [50000, 52000],
+        [123456.78] * 4 + [123456.79] * 8,
+        [],
+    ]
+    amounts = [5000, 22500, 51000, 123456.78, 3000]
+    df = FraudPreprocessor().preprocess_batch([_tx(a) for a in amounts], histories)
+    for i, (history, amount) in enumerate(zip(histories, amounts)):
+        for w in ROLLING_WINDOWS:
+            expected = _reference_z(history, amount, w)
+            assert df[f"amount_log_z{w}"].iloc[i] == pytest.approx(expected, rel=1e-6, abs=1e-9)
@@ -0,0 +1,30 @@
+"""ModelRegistry 버전 이름 검증 (CURRENT 포인터가 레지스트리 밖을 가리키지 않도록)"""
+
+import pytest
+
+from app.services.model_registry import CURRENT_FILENAME, ModelRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "category" / "20260101000000").mkdir(parents=True)
+    (tmp_path / "category" / ".20260102000000.tmp").mkdir()
+    (tmp_path / "outside").mkdir()
+    return ModelRegistry(str(tmp_path))
+
+
+def test_activate_registered_version(registry, tmp_path):
+    registry.activate("category", "20260101000000")
+    assert registry.current_version("category") == "20260101000000"
+
+
+@pytest.mark.parametrize("version", ["../outside", "..", ".", ".20260102000000.tmp", "missing", ""])
+def test_activate_rejects_unregistered_version(registry, tmp_path, version):
+    with pytest.raises(FileNotFoundError):
+        registry.activate("category", version)
+    assert not (tmp_path / "category" / CURRENT_FILENAME).exists()
+
+
+@pytest.mark.parametrize("version", ["../x", "a/b", ".hidden", ""])
+def test_invalid_version_names(version):
+    assert not ModelRegistry.is_valid_version_name(version)
@@ -0,0 +1,65 @@
+"""RunningStats 증분/병합 통계 검증 (numpy 기준값과 비교)"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.services.online_stats import RunningStats
+
+
+@pytest.fixture
+def amounts():
+    rng = np.random.default_rng(7)
+    # 큰 금액 + 작은 분산: sum / sum of squares 방식이면 상쇄 오차가 커지는 구간
+    return 1e9 + rng.normal(0, 250, size=5000)
+
+
+def _assert_matches(stats, values):
+    assert stats.count == values.size
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.variance(ddof=1) == pytest.approx(values.var(ddof=1), rel=1e-9)
+    assert stats.std(ddof=0) == pytest.approx(values.std(ddof=0), rel=1e-9)
+    assert stats.min == values.min()
+    assert stats.max == values.max()
+
+
+def test_from_values_matches_numpy(amounts):
+    _assert_matches(RunningStats.from_values(amounts), amounts)
+
+
+def test_update_matches_numpy(amounts):
+    stats = RunningStats()
+    for value in amounts[:500]:
+        stats.update(value)
+    _assert_matches(stats, amounts[:500])
+
+
+@pytest.mark.parametrize("splits", [[1], [2500], [1, 2, 3, 4000], [4999]])
+def test_merge_partitions_matches_numpy(amounts, splits):
+    merged = RunningStats()
+    for part in np.split(amounts, splits):
+        merged.merge(RunningStats.from_values(part))
+    _assert_matches(merged, amounts)
+
+
+def test_merge_with_empty_partition(amounts):
+    stats = RunningStats.from_values(amounts[:10])
+    stats.merge(RunningStats())
+    _assert_matches(stats, amounts[:10])
+    _assert_matches(RunningStats().merge(RunningStats.from_values(amounts[:10])), amounts[:10])
+
+
+def test_not_enough_samples():
+    stats = RunningStats.from_values([42.0])
+    assert math.isnan(stats.variance(ddof=1))
+    assert stats.variance(ddof=0) == 0.0
+    assert math.isnan(RunningStats().std())
+
+
+def test_from_state_round_trip_then_merge(amounts):
+    # 저장된 상태로 복원한 뒤 새 배치를 병합해도 전체 계산과 같음 (피처 스토어 증분 갱신)
+    saved = RunningStats.from_values(amounts[:4000])
+    restored = RunningStats.from_state(saved.count, saved.mean, saved.m2, saved.min, saved.max)
+    restored.merge(RunningStats.from_values(amounts[4000:]))
+    _assert_matches(restored, amounts)
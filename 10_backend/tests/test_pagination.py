@@ -0,0 +1,29 @@
+"""키셋 커서 인코딩/디코딩 검증"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("sort_time, row_id", [
+    (datetime(2026, 1, 31, 23, 59, 59, 999999), 1),
+    (datetime(2026, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=9))), 2 ** 62),
+    (datetime(2025, 12, 31, 15, 0, tzinfo=timezone.utc), 0),
+])
+def test_cursor_round_trip(sort_time, row_id):
+    cursor = encode_cursor(sort_time, row_id)
+    assert "/" not in cursor and "+" not in cursor  # URL-safe
+    decoded_time, decoded_id = decode_cursor(cursor)
+    assert decoded_time == sort_time
+    assert decoded_time.tzinfo == sort_time.tzinfo
+    assert decoded_id == row_id
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "MjAyNi0wMS0wMQ==", encode_cursor(datetime(2026, 1, 1), 1)[:-4]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
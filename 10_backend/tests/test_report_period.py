@@ -0,0 +1,56 @@
+"""ReportPeriod 기간 경계 검증 (월/주 경계, 연도 넘김)"""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.services.report_aggregation import ReportPeriod
+
+
+@pytest.mark.parametrize("now, start, end, previous_start", [
+    # 1월 -> 지난달 12월, 비교 11월 (연도 넘김)
+    (datetime(2026, 1, 15, 10, 30), datetime(2025, 12, 1), datetime(2026, 1, 1), datetime(2025, 11, 1)),
+    # 2월 -> 1월, 비교 12월
+    (datetime(2026, 2, 1, 0, 0), datetime(2026, 1, 1), datetime(2026, 2, 1), datetime(2025, 12, 1)),
+    # 3월 말일 -> 2월 (28일)
+    (datetime(2026, 3, 31, 23, 59), datetime(2026, 2, 1), datetime(2026, 3, 1), datetime(2026, 1, 1)),
+])
+def test_monthly_boundaries(now, start, end, previous_start):
+    period = ReportPeriod.monthly(now)
+    assert (period.start, period.end, period.previous_start) == (start, end, previous_start)
+    assert period.last_day.month == start.month
+
+
+def test_monthly_leap_february():
+    period = ReportPeriod.monthly(datetime(2028, 3, 5))
+    assert period.last_day == datetime(2028, 2, 29)
+
+
+@pytest.mark.parametrize("now", [
+    datetime(2026, 1, 5, 0, 0),     # 월요일 0시
+    datetime(2026, 1, 8, 13, 0),    # 목요일
+    datetime(2026, 1, 11, 23, 59),  # 일요일 밤
+])
+def test_weekly_is_previous_monday_to_sunday(now):
+    period = ReportPeriod.weekly(now)
+    assert period.start == datetime(2025, 12, 29)  # 연도를 넘는 지난주 월요일
+    assert period.end == datetime(2026, 1, 5)
+    assert period.start.weekday() == 0
+    assert period.last_day.weekday() == 6
+    assert period.previous_start == datetime(2025, 12, 22)
+
+
+def test_daily_is_yesterday():
+    period = ReportPeriod.daily(datetime(2026, 1, 1, 8, 0))
+    assert (period.start, period.end, period.previous_start) == (
+        datetime(2025, 12, 31), datetime(2026, 1, 1), datetime(2025, 12, 30)
+    )
+
+
+def test_custom_period_and_comparison():
+    period = ReportPeriod.custom(date(2026, 2, 27), date(2026, 3, 2))
+    assert period.start == datetime(2026, 2, 27)
+    assert period.end == datetime(2026, 3, 3)
+    assert period.previous_start == datetime(2026, 2, 23)
+    with pytest.raises(ValueError):
+        ReportPeriod.custom(date(2026, 3, 2), date(2026, 3, 1))